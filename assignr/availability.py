@@ -1,27 +1,132 @@
 from sys import (argv, exit, stdout)
-import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import (Lock, RLock)
 import logging
-import pandas as pd
+import sqlite3
+from requests import RequestException
 from dotenv import load_dotenv
 from getopt import (getopt, GetoptError)
-from datetime import (date, datetime)
+from datetime import (date, datetime, timedelta)
 from sys import (exit, stdout)
 from os import environ, getcwd
 
+if __package__:
+    from .helpers.client import (AssignrClient, AssignrError)
+    from .helpers.rate_limiter import RateLimiter
+    from .helpers.token_cache import (TokenCache, get_token_key,
+                                      DEFAULT_TOKEN_CACHE)
+    from .helpers.availability_cache import (AvailabilityCache,
+                                             DEFAULT_AVAILABILITY_CACHE)
+    from .helpers.sync_store import (SyncStore, DEFAULT_SYNC_STORE)
+    from .helpers.writers import (get_writer, OUTPUT_FORMATS)
+    from .helpers.roster import read_roster
+    from .helpers.metrics import (Metrics, set_metrics, timed)
+else:
+    from helpers.client import (AssignrClient, AssignrError)
+    from helpers.rate_limiter import RateLimiter
+    from helpers.token_cache import (TokenCache, get_token_key,
+                                     DEFAULT_TOKEN_CACHE)
+    from helpers.availability_cache import (AvailabilityCache,
+                                            DEFAULT_AVAILABILITY_CACHE)
+    from helpers.sync_store import (SyncStore, DEFAULT_SYNC_STORE)
+    from helpers.writers import (get_writer, OUTPUT_FORMATS)
+    from helpers.roster import read_roster
+    from helpers.metrics import (Metrics, set_metrics, timed)
+
 load_dotenv()
 
+# Threads fetching one referee's pages, and its date shards with --shard.
+PAGE_WORKERS = 4
+SHARD_WORKERS = 4
+
+_client = None
+_client_lock = Lock()
+
+def get_client():
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            _client = AssignrClient()
+    return _client
+
+def set_client(client):
+    global _client
+
+    with _client_lock:
+        _client = client
+
+_auth_lock = RLock()
+# Maps tokens rejected with a 401 to their replacement, so callers still
+# holding the old token don't each pay for a failed request.
+_refreshed_tokens = {}
+
+# Assignr publishes no rate limit, RATE_LIMIT starts at a conservative 10
+# req/s and healthy responses may ramp it up to twice that. The default
+# concurrency (workers x shard x page threads) can be far above 20, so this
+# cap, not the thread count, is what bounds the run's request fan-out: extra
+# threads wait on the token bucket rather than hitting the API together.
+MAX_RATE_FACTOR = 2
+
+def get_concurrency(args):
+    """Most calls in flight at once, each referee worker runs a page pool,
+    inside a shard pool with --shard."""
+    shard_workers = SHARD_WORKERS if args['shard'] is not None else 1
+    return args['workers'] * shard_workers * PAGE_WORKERS
+
+def get_rate_limiter(args):
+    """The RateLimiter shared by every call and the exit code. RATE_LIMIT is
+    the starting rate, healthy responses ramp it up to MAX_RATE_LIMIT.
+    MAX_CONCURRENCY caps the calls in flight, by default enough for every
+    page and shard pool."""
+    limits = {}
+    for name, convert, default in (
+            ('RATE_LIMIT', float, 10.0),
+            ('MAX_RATE_LIMIT', float, None),
+            ('MAX_CONCURRENCY', int, get_concurrency(args))):
+        try:
+            limits[name] = convert(environ[name]) if name in environ else default
+        except ValueError:
+            limits[name] = 0
+        if limits[name] is not None and limits[name] <= 0:
+            logging.error(f"{name} value, {environ[name]} is invalid")
+            return None, 88
+
+    max_rate = limits['MAX_RATE_LIMIT'] or MAX_RATE_FACTOR * limits['RATE_LIMIT']
+    return RateLimiter(rate=limits['RATE_LIMIT'],
+                       max_rate=max(max_rate, limits['RATE_LIMIT']),
+                       concurrency=limits['MAX_CONCURRENCY']), 0
+
+def get_token_cache():
+    # TOKEN_CACHE set to an empty value turns token caching off.
+    file_name = environ.get('TOKEN_CACHE', DEFAULT_TOKEN_CACHE)
+    if not file_name:
+        return None
+    return TokenCache(file_name)
+
 def get_arguments(args):
     arguments = {
-        'start_date': None, 'end_date': None
+        'start_date': None, 'end_date': None, 'workers': 1,
+        'page_size': None, 'cache': True, 'refresh': False, 'sync': False,
+        'output_format': 'text', 'output_file': None, 'shard': None,
+        'referee_ids': None, 'name_pattern': None, 'metrics': False,
+        'metrics_file': None
     }
 
     rc = 0
     USAGE='USAGE: availability.py -s <start-date> -e <end-date>' \
-    ' FORMAT=MM/DD/YYYY'
+    ' [-w <workers>] [-p <page-size>] [--no-cache] [--refresh] [--sync]' \
+    ' [-f text|jsonl|csv|parquet] [-o <output-file>]' \
+    ' [--shard week|month|<days>] [-r <id>,<id>] [-n <name-pattern>]' \
+    ' [--metrics] [--metrics-file <file.json|file.prom>] FORMAT=MM/DD/YYYY'
 
     try:
-        opts, args = getopt(args,"hs:e:",
-                            ["start-date=","end-date="])
+        opts, args = getopt(args,"hs:e:w:p:f:o:r:n:",
+                            ["start-date=","end-date=","workers=",
+                             "page-size=","no-cache","refresh","sync",
+                             "format=","output=","shard=","referee=",
+                             "name=","metrics","metrics-file="])
     except GetoptError:
         logging.error(USAGE)
         return 77, arguments
@@ -34,6 +139,33 @@ def get_arguments(args):
             arguments['start_date'] = arg
         elif opt in ("-e", "--end-date"):
             arguments['end_date'] = arg
+        elif opt in ("-w", "--workers"):
+            arguments['workers'] = arg
+        elif opt in ("-p", "--page-size"):
+            arguments['page_size'] = arg
+        elif opt == "--no-cache":
+            arguments['cache'] = False
+        elif opt == "--refresh":
+            arguments['refresh'] = True
+        elif opt == "--sync":
+            arguments['sync'] = True
+        elif opt in ("-f", "--format"):
+            arguments['output_format'] = arg.lower()
+        elif opt in ("-o", "--output"):
+            arguments['output_file'] = arg
+        elif opt == "--shard":
+            arguments['shard'] = arg.lower()
+        elif opt in ("-r", "--referee"):
+            arguments['referee_ids'] = [referee_id.strip()
+                                        for referee_id in arg.split(',')
+                                        if referee_id.strip()]
+        elif opt in ("-n", "--name"):
+            arguments['name_pattern'] = arg
+        elif opt == "--metrics":
+            arguments['metrics'] = True
+        elif opt == "--metrics-file":
+            arguments['metrics'] = True
+            arguments['metrics_file'] = arg
 
     if arguments['start_date'] is None or arguments['end_date'] is None:
         logging.error(USAGE)
@@ -49,92 +181,399 @@ def get_arguments(args):
     except ValueError:
         logging.error(f"End Date value, {arguments['end_date']} is invalid")
         rc = 88
+    try:
+        arguments['workers'] = int(arguments['workers'])
+        if arguments['workers'] < 1:
+            raise ValueError
+    except ValueError:
+        logging.error(f"Workers value, {arguments['workers']} is invalid")
+        rc = 88
+    if arguments['page_size'] is not None:
+        try:
+            arguments['page_size'] = int(arguments['page_size'])
+            if arguments['page_size'] < 1:
+                raise ValueError
+        except ValueError:
+            logging.error(f"Page Size value, {arguments['page_size']} is invalid")
+            rc = 88
+    if arguments['shard'] is not None and \
+       arguments['shard'] not in ('week', 'month'):
+        try:
+            arguments['shard'] = int(arguments['shard'])
+            if arguments['shard'] < 1:
+                raise ValueError
+        except ValueError:
+            logging.error(f"Shard value, {arguments['shard']} is invalid")
+            rc = 88
+    if arguments['output_format'] not in OUTPUT_FORMATS:
+        logging.error(f"Format value, {arguments['output_format']} is invalid")
+        rc = 88
 
     return rc, arguments
 
-def authenticate():
+@timed('authenticate')
+def authenticate(client=None, refresh=False):
+    client = client or get_client()
     form_data = {
         'client_secret': environ['CLIENT_SECRET'],
         'client_id': environ['CLIENT_ID'],
         'scope': environ['CLIENT_SCOPE'],
         'grant_type': 'client_credentials'
     }
+    token_cache = get_token_cache()
+    token_key = get_token_key(environ['AUTH_URL'], form_data['client_id'],
+                              form_data['scope'])
+
+    with _auth_lock:
+        if token_cache is not None:
+            if refresh:
+                token_cache.invalidate(token_key)
+            else:
+                token = token_cache.get(token_key)
+                if token is not None:
+                    return token
 
-    authenticate = requests.post(environ['AUTH_URL'], data=form_data)
+        authenticate = client.post(environ['AUTH_URL'], data=form_data,
+                                   endpoint='oauth/token')
 
-    try:
-        token = authenticate.json()['access_token']
-    except (KeyError, TypeError):
-        logging.error('Token not found')
-        token = None
+        try:
+            token = authenticate.json()['access_token']
+        except (KeyError, TypeError, ValueError):
+            logging.error('Token not found')
+            return None
+
+        expires_in = authenticate.json().get('expires_in')
+        if token_cache is not None and expires_in:
+            token_cache.set(token_key, token, expires_in)
 
     return token
 
-def get_requests(token, end_point, params=None):
+def get_current_token(token):
+    # Follows the token's refreshes to the latest, so a token refreshed twice
+    # in a run (A to B to C) goes straight to C.
+    seen = {token}
+    while token in _refreshed_tokens:
+        token = _refreshed_tokens[token]
+        if token in seen:
+            break
+        seen.add(token)
+    return token
+
+def refresh_token(token, client=None):
+    with _auth_lock:
+        current = get_current_token(token)
+        if current != token:
+            # Another call refreshed it while this one waited.
+            return current
+        logging.info('Access token rejected, re-authenticating')
+        new_token = authenticate(client, refresh=True)
+        if new_token is None:
+            return None
+        if new_token != token:
+            _refreshed_tokens[token] = new_token
+        return new_token
+
+def get_requests(token, end_point, params=None, client=None, endpoint=None):
+    # endpoint labels the request in the metrics, e.g. with the user id
+    # replaced so every referee's calls are counted together.
+    client = client or get_client()
+    endpoint = endpoint or end_point
+    token = get_current_token(token)
     headers = {
         'accept': 'application/json',
         'authorization': f'Bearer {token}'
     }
 
-    response = requests.get(f"{environ['BASE_URL']}{end_point}", headers=headers, params=params)
-    return response.status_code, response.json()
+    response = client.get(f"{environ['BASE_URL']}{end_point}", headers=headers,
+                          params=params, endpoint=endpoint)
+    if response.status_code == 401:
+        new_token = refresh_token(token, client)
+        if new_token is not None:
+            headers['authorization'] = f'Bearer {new_token}'
+            response = client.get(f"{environ['BASE_URL']}{end_point}",
+                                  headers=headers, params=params,
+                                  endpoint=endpoint)
+
+    try:
+        return response.status_code, response.json()
+    except ValueError:
+        return response.status_code, None
+
+def get_availability_page(token, user_id, params, page, client=None):
+    status_code, response = get_requests(token, f'users/{user_id}/availability',
+                                         params={**params, 'page': page},
+                                         client=client,
+                                         endpoint='users/{id}/availability')
+    if status_code != 200:
+        raise AssignrError(f'Failed return code: {status_code} for user: '
+                           f'{user_id}, page: {page}')
+    return response['_embedded']['availability']
+
+def get_shards(start, end, shard):
+    # Splits start to end into calendar weeks (Monday to Sunday), calendar
+    # months or runs of a fixed number of days.
+    shards = []
+    while start <= end:
+        if shard == 'week':
+            stop = start + timedelta(days=6 - start.weekday())
+        elif shard == 'month':
+            next_month = start.replace(day=28) + timedelta(days=4)
+            stop = next_month - timedelta(days=next_month.day)
+        else:
+            stop = start + timedelta(days=shard - 1)
+        stop = min(stop, end)
+        shards.append((start, stop))
+        start = stop + timedelta(days=1)
+    return shards
+
+def get_shard_records(token, user_id, start, end, retries=2, **options):
+    attempt = 0
+    while True:
+        try:
+            return get_availability_records(token, user_id,
+                                            start.strftime("%m/%d/%Y"),
+                                            end.strftime("%m/%d/%Y"), **options)
+        except (AssignrError, RequestException) as error:
+            if attempt >= retries:
+                raise
+            attempt += 1
+            logging.warning(f"Shard {start} - {end} for user: {user_id} "
+                            f"failed: {error}, retrying")
+
+def get_sharded_availability_records(token, user_id, start_dt, end_dt, shard,
+                                     shard_workers=SHARD_WORKERS, **options):
+    start = datetime.strptime(start_dt, "%m/%d/%Y").date()
+    end = datetime.strptime(end_dt, "%m/%d/%Y").date()
+    shards = get_shards(start, end, shard)
+
+    records = []
+    seen = set()
+    with ThreadPoolExecutor(max_workers=min(shard_workers, len(shards))) as executor:
+        for shard_records in executor.map(
+                lambda dates: get_shard_records(token, user_id, *dates, **options),
+                shards):
+            for record in shard_records:
+                # Records straddling a shard boundary can come back twice.
+                record_id = record.get('id')
+                if record_id is not None:
+                    if record_id in seen:
+                        continue
+                    seen.add(record_id)
+                records.append(record)
+
+    records.sort(key=lambda record: record.get('date', ''))
+    return records
+
+def get_availability_records(token, user_id, start_dt, end_dt, client=None,
+                             page_size=None, page_workers=PAGE_WORKERS, shard=None):
+    if shard is not None:
+        return get_sharded_availability_records(
+            token, user_id, start_dt, end_dt, shard, client=client,
+            page_size=page_size, page_workers=page_workers)
 
-def get_availability(token, user_id, start_dt, end_dt):
-    availability = []
     params = {
         'user_id': user_id,
         'search[start_date]': start_dt,
         'search[end_date]': end_dt
     }
+    if page_size is not None:
+        params['limit'] = page_size
 
-    status_code, response = get_requests(token, f'users/{user_id}/availability', params=params)
-
-#    if status_code != 200:
-#        logging.error(f'Failed return code: {status_code} for user: {user_id}')
-#        return availability
+    status_code, response = get_requests(token, f'users/{user_id}/availability',
+                                         params=params, client=client,
+                                         endpoint='users/{id}/availability')
 
     if status_code == 404:
         logging.warning(f'User: {user_id} has no availability')
-        return availability
-    
+        return []
+    if status_code != 200:
+        raise AssignrError(f'Failed return code: {status_code} for user: {user_id}')
+
+    records = list(response['_embedded']['availability'])
     try:
-        availabilities = response['_embedded']['availability']
+        pages = int(response['page']['pages'])
+    except (KeyError, TypeError, ValueError):
+        pages = 1
+
+    # The first page tells us how many follow; the rest are fetched
+    # concurrently and appended in page order.
+    if pages > 1:
+        with ThreadPoolExecutor(max_workers=min(page_workers, pages - 1)) as executor:
+            for page in executor.map(
+                    lambda page: get_availability_page(token, user_id, params,
+                                                       page, client),
+                    range(2, pages + 1)):
+                records += page
+
+    return records
+
+def get_availability_cache():
+    try:
+        return AvailabilityCache(
+            environ.get('AVAILABILITY_CACHE', DEFAULT_AVAILABILITY_CACHE),
+            ttl=int(environ.get('AVAILABILITY_CACHE_TTL', 86400)),
+            max_entries=int(environ.get('AVAILABILITY_CACHE_SIZE', 100000)))
+    except (OSError, ValueError, sqlite3.Error) as error:
+        logging.warning(f"Availability cache unavailable: {error}")
+        return None
+
+def get_missing_ranges(dates, cached):
+    # Groups the uncached dates into contiguous (start, end) ranges so each
+    # gap costs one request.
+    ranges = []
+    for day in dates:
+        if day.isoformat() in cached:
+            continue
+        if ranges and ranges[-1][1] + timedelta(days=1) == day:
+            ranges[-1][1] = day
+        else:
+            ranges.append([day, day])
+    return ranges
+
+def get_cached_availability_records(token, user_id, start_dt, end_dt, cache,
+                                    refresh=False, **options):
+    start = datetime.strptime(start_dt, "%m/%d/%Y").date()
+    end = datetime.strptime(end_dt, "%m/%d/%Y").date()
+    dates = [start + timedelta(days=day) for day in range((end - start).days + 1)]
+
+    cached = {} if refresh else cache.get(user_id, [day.isoformat() for day in dates])
+
+    for range_start, range_end in get_missing_ranges(dates, cached):
+        fetched = {
+            (range_start + timedelta(days=day)).isoformat(): []
+            for day in range((range_end - range_start).days + 1)
+        }
+        for record in get_availability_records(
+                token, user_id, range_start.strftime("%m/%d/%Y"),
+                range_end.strftime("%m/%d/%Y"), **options):
+            if record['date'] in fetched:
+                fetched[record['date']].append(record)
+        cache.set(user_id, fetched)
+        cached.update(fetched)
+
+    records = []
+    for day in dates:
+        records += cached.get(day.isoformat(), [])
+    return records
+
+def format_availability(avail):
+    if avail['all_day']:
+        return {
+            'date': avail['date'],
+            'avail': 'ALL DAY'
+        }
+    return {
+        'date': avail['date'],
+        'avail': f"{avail['start_time']} - {avail['end_time']}"
+    }
+
+@timed('get_availability')
+def get_availability(token, user_id, start_dt, end_dt, client=None,
+                     page_size=None, cache=None, refresh=False, shard=None):
+    availability = []
+
+    try:
+        if cache is None:
+            availabilities = get_availability_records(
+                token, user_id, start_dt, end_dt, client=client,
+                page_size=page_size, shard=shard)
+        else:
+            availabilities = get_cached_availability_records(
+                token, user_id, start_dt, end_dt, cache, refresh=refresh,
+                client=client, page_size=page_size, shard=shard)
         for avail in availabilities:
-            if avail['all_day']:
-                availability.append({
-                    'date': avail['date'],
-                    'avail': 'ALL DAY'                 
-                })
-            else:
-                availability.append({
-                    'date': avail['date'],
-                    'avail': f"{avail['start_time']} - {avail['end_time']}"                 
-                })
+            availability.append(format_availability(avail))
 
     except KeyError as ke:
         logging.error(f"Key: {ke}, missing from Availability response")
 
     return availability
 
-def get_referees():
-    referees = []
-
+def fetch_referee_availability(token, referee, start_dt, end_dt,
+                               lookup=None, **options):
+    lookup = lookup or get_availability
+    try:
+        availability = lookup(token, referee['id'], start_dt, end_dt, **options)
+    except Exception as error:
+        logging.error(f"Availability lookup failed for {referee['referee']}: {error}")
+        availability = None
+
+    return referee, availability
+
+def get_all_availability(token, referees, start_dt, end_dt, workers=1,
+                         **options):
+    # Results are yielded in roster order. With more than one worker the
+    # lookups run in a thread pool, keeping at most two per worker in flight
+    # so a large roster isn't submitted all at once.
+    if workers <= 1:
+        for referee in referees:
+            yield fetch_referee_availability(token, referee, start_dt, end_dt,
+                                             **options)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for referee in referees:
+            pending.append(executor.submit(fetch_referee_availability,
+                                           token, referee, start_dt, end_dt,
+                                           **options))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def iter_referees(ids=None, name_pattern=None):
+    # Streams the roster so lookups can start before the file is read.
     try:
-        df = pd.read_csv(environ['FILE_NAME'])
+        yield from read_roster(environ['FILE_NAME'], ids=ids,
+                               name_pattern=name_pattern)
     except KeyError:
         logging.error("FILE_NAME environment variable not found")
-        return referees
     except FileNotFoundError:
         logging.error(f"{environ['FILE_NAME']} Not Found!")
-        return referees
-
-    for row in df.to_numpy():
-        referees.append({
-            'referee': f"{row[0]} {row[1]}",
-            'id': row[2]
-        })
 
-    return referees
+def get_referees(ids=None, name_pattern=None):
+    return list(iter_referees(ids=ids, name_pattern=name_pattern))
+
+def sync_availability(token, args):
+    # A sync always reads the API, never the availability cache, and reports
+    # what changed since the previous sync of the same dates.
+    store = SyncStore(environ.get('SYNC_STORE', DEFAULT_SYNC_STORE))
+    start_date = datetime.strptime(args['start_date'], "%m/%d/%Y").date().isoformat()
+    end_date = datetime.strptime(args['end_date'], "%m/%d/%Y").date().isoformat()
+    totals = {'added': 0, 'changed': 0, 'removed': 0}
+
+    for referee, records in get_all_availability(
+            token, iter_referees(args['referee_ids'], args['name_pattern']),
+            args['start_date'], args['end_date'], args['workers'],
+            lookup=get_availability_records,
+            page_size=args['page_size'], shard=args['shard']):
+        if records is None:
+            print(f"{referee['referee']} availability could not be retrieved")
+            continue
+
+        try:
+            changes = store.apply(referee['id'], records, start_date, end_date)
+            for change, changed_records in changes.items():
+                totals[change] += len(changed_records)
+                for record in changed_records:
+                    avail = format_availability(record)
+                    print(f"{referee['referee']} - {change} - {avail['date']} - {avail['avail']}")
+        except KeyError as ke:
+            logging.error(f"Key: {ke}, missing from Availability response")
+
+    store.close()
+    logging.info(f"Sync: {totals['added']} added, {totals['changed']} changed, "
+                 f"{totals['removed']} removed")
+
+def report_metrics(metrics, file_name=None):
+    for line in metrics.summary():
+        logging.info(f"Metrics: {line}")
+    if file_name is not None:
+        try:
+            metrics.write(file_name)
+        except OSError as error:
+            logging.error(f"Metrics file, {file_name} could not be written: {error}")
 
 def main():
     try:
@@ -150,26 +589,52 @@ def main():
     if rc:
         exit(rc)
 
+    # One pooled session for the whole run, large enough that every call in
+    # flight keeps its own warm connection, with every call through one
+    # limiter.
+    rate_limiter, rc = get_rate_limiter(args)
+    if rc:
+        exit(rc)
+    # Instrumentation is off unless asked for, leaving only no-op calls.
+    metrics = Metrics() if args['metrics'] else None
+    set_metrics(metrics)
+    set_client(AssignrClient(pool_size=max(10, rate_limiter.max_concurrency),
+                             rate_limiter=rate_limiter, metrics=metrics))
+
     token = authenticate()
     if token is None:
         exit(88)
 
-    referee_availability = []
-    for referee in get_referees():
-        response = get_availability(token, referee['id'], args['start_date'],
-                                    args['end_date'])
-        if response:
-            for resp in response:
-                print(f"{referee['referee']} - {resp['date']} - {resp['avail']}")
-        else:
-            print(f"{referee['referee']} isn't Available")
+    if args['sync']:
+        sync_availability(token, args)
+        if metrics is not None:
+            report_metrics(metrics, args['metrics_file'])
+        return
 
-        referee_availability.append({
-            'referee': referee['referee'],
-            'availability': response
-        })
+    try:
+        writer = get_writer(args['output_format'], args['output_file'])
+    except (ImportError, ValueError, OSError) as error:
+        logging.error(error)
+        exit(88)
 
-    print(referee_availability)
+    cache = get_availability_cache() if args['cache'] else None
+
+    # Each referee is written as soon as its lookup completes, so nothing
+    # accumulates for the whole roster.
+    with writer:
+        for referee, response in get_all_availability(
+                token, iter_referees(args['referee_ids'], args['name_pattern']),
+                args['start_date'], args['end_date'], args['workers'],
+                page_size=args['page_size'], cache=cache,
+                refresh=args['refresh'], shard=args['shard']):
+            writer.write(referee, response)
+
+    if cache is not None:
+        logging.info(f"Availability cache: {cache.hits} hits, {cache.misses} misses")
+        cache.close()
+    logging.info(f"Rate limit: {rate_limiter}")
+    if metrics is not None:
+        report_metrics(metrics, args['metrics_file'])
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,93 @@
+"""On-disk cache of Assignr availability records keyed by referee and date"""
+from os import makedirs
+from os.path import (dirname, exists, expanduser)
+from threading import Lock
+from time import time
+import json
+import logging
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AVAILABILITY_CACHE = '~/.cache/assignr/availability.db'
+
+
+class AvailabilityCache():
+    def __init__(self, file_name, ttl=86400, max_entries=100000) -> None:
+        self.file_name = expanduser(file_name)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+
+        directory = dirname(self.file_name)
+        if directory and not exists(directory):
+            makedirs(directory, mode=0o700)
+
+        # One connection shared by the worker threads, serialized by the lock.
+        self.connection = sqlite3.connect(self.file_name,
+                                          check_same_thread=False)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS availability ('
+            'user_id TEXT NOT NULL, date TEXT NOT NULL, records TEXT NOT NULL, '
+            'fetched_at REAL NOT NULL, accessed_at REAL NOT NULL, '
+            'PRIMARY KEY (user_id, date))')
+        self.connection.execute(
+            'CREATE INDEX IF NOT EXISTS availability_accessed '
+            'ON availability (accessed_at)')
+        self.connection.commit()
+
+    def get(self, user_id, dates):
+        """Fresh cached records for the requested ISO dates, keyed by date."""
+        now = time()
+        found = {}
+
+        with self.lock:
+            for date in dates:
+                row = self.connection.execute(
+                    'SELECT records FROM availability '
+                    'WHERE user_id = ? AND date = ? AND fetched_at > ?',
+                    (str(user_id), date, now - self.ttl)).fetchone()
+                if row is not None:
+                    found[date] = json.loads(row[0])
+            if found:
+                self.connection.executemany(
+                    'UPDATE availability SET accessed_at = ? '
+                    'WHERE user_id = ? AND date = ?',
+                    [(now, str(user_id), date) for date in found])
+                self.connection.commit()
+            self.hits += len(found)
+            self.misses += len(dates) - len(found)
+
+        return found
+
+    def set(self, user_id, records_by_date) -> None:
+        """Store records per ISO date. Dates without availability are stored
+        as an empty list so they are cache hits as well."""
+        now = time()
+
+        with self.lock:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO availability '
+                '(user_id, date, records, fetched_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                [(str(user_id), date, json.dumps(records), now, now)
+                 for date, records in records_by_date.items()])
+            self.evict()
+            self.connection.commit()
+
+    def evict(self) -> None:
+        # Least recently used entries go first once the cap is exceeded.
+        count = self.connection.execute(
+            'SELECT COUNT(*) FROM availability').fetchone()[0]
+        if count > self.max_entries:
+            self.connection.execute(
+                'DELETE FROM availability WHERE rowid IN ('
+                'SELECT rowid FROM availability '
+                'ORDER BY accessed_at LIMIT ?)', (count - self.max_entries,))
+            logger.debug(f"Evicted {count - self.max_entries} availability cache entries")
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,132 @@
+"""Pooled, retrying HTTP client for the Assignr API"""
+from email.utils import parsedate_to_datetime
+from datetime import (datetime, timezone)
+from time import (perf_counter, sleep)
+from urllib.parse import urlsplit
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class AssignrError(Exception):
+    pass
+
+
+def get_retry_after(response):
+    """Seconds to wait from a Retry-After header, None when absent."""
+    value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class AssignrClient():
+    def __init__(self, pool_size=10, timeout=(5, 30), retries=3,
+                 backoff=0.5, max_backoff=30, rate_limiter=None,
+                 metrics=None) -> None:
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size,
+                              pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get_backoff(self, attempt):
+        return min(self.max_backoff, self.backoff * 2 ** attempt)
+
+    def request(self, method, url, **kwargs):
+        # Connection errors and RETRY_STATUSES responses are retried with
+        # exponential backoff, or after the server's Retry-After when given.
+        # Once retries are exhausted the last response is returned, or the
+        # last connection error raised. endpoint labels the call in the
+        # metrics, defaulting to the URL path.
+        kwargs.setdefault('timeout', self.timeout)
+        endpoint = kwargs.pop('endpoint', None) or urlsplit(url).path
+        attempt = 0
+
+        while True:
+            try:
+                response = self.send(method, url, endpoint, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                if attempt >= self.retries:
+                    raise
+                delay = self.get_backoff(attempt)
+                logger.warning(f"{method.upper()} {url} failed: {error}, "
+                               f"retrying in {delay:.1f}s")
+            else:
+                if response.status_code not in RETRY_STATUSES or \
+                   attempt >= self.retries:
+                    return response
+                delay = get_retry_after(response)
+                if delay is None:
+                    delay = self.get_backoff(attempt)
+                logger.warning(f"{method.upper()} {url} returned "
+                               f"{response.status_code}, retrying in {delay:.1f}s")
+
+            if self.metrics is not None:
+                self.metrics.retry(endpoint)
+            sleep(delay)
+            attempt += 1
+
+    def send(self, method, url, endpoint=None, **kwargs):
+        status_code = None
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        try:
+            response = self.fetch(method, url, endpoint, **kwargs)
+            status_code = response.status_code
+            return response
+        finally:
+            if self.rate_limiter is not None:
+                self.rate_limiter.release(status_code)
+
+    def fetch(self, method, url, endpoint=None, **kwargs):
+        # Latency is measured after the rate limiter lets the call through.
+        if self.metrics is None:
+            return getattr(self.session, method)(url, **kwargs)
+
+        started = perf_counter()
+        try:
+            response = getattr(self.session, method)(url, **kwargs)
+        except requests.RequestException as error:
+            self.metrics.observe(endpoint, perf_counter() - started,
+                                 status=type(error).__name__)
+            raise
+        self.metrics.observe(endpoint, perf_counter() - started,
+                             status=response.status_code,
+                             size=len(response.content or b''))
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('get', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('post', url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
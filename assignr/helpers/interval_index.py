@@ -0,0 +1,142 @@
+"""Interval index answering which referees are available at a time"""
+from array import array
+from bisect import bisect_right
+from datetime import (date, datetime, time)
+from numbers import Integral
+import logging
+
+logger = logging.getLogger(__name__)
+
+ALL_DAY = 'ALL DAY'
+DAY_MINUTES = 24 * 60
+
+
+def to_minutes(value):
+    """Minutes after midnight for '10:30 AM', a time or a minute count."""
+    if isinstance(value, Integral):
+        return int(value)
+    if isinstance(value, datetime):
+        value = value.time()
+    if isinstance(value, time):
+        return value.hour * 60 + value.minute
+    parsed = datetime.strptime(value.strip(), "%I:%M %p")
+    return parsed.hour * 60 + parsed.minute
+
+
+def to_date_key(value):
+    """ISO date key for a date, an ISO string or a MM/DD/YYYY string."""
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return value.isoformat()
+    if '/' in value:
+        return datetime.strptime(value, "%m/%d/%Y").date().isoformat()
+    return value
+
+
+def parse_interval(avail):
+    """(start, end) minutes for a get_availability 'avail' string."""
+    if avail == ALL_DAY:
+        return 0, DAY_MINUTES
+    start, end = avail.split(' - ')
+    return to_minutes(start), to_minutes(end)
+
+
+class DateIntervals():
+    # The day is cut into elementary segments at every interval endpoint.
+    # Each segment lists the intervals covering it, so a point lookup is a
+    # bisect over the boundaries plus the size of the answer.
+    def __init__(self, intervals) -> None:
+        intervals = sorted(intervals, key=lambda interval: interval[1])
+        self.referees = [interval[0] for interval in intervals]
+        self.starts = array('H', [interval[1] for interval in intervals])
+        self.ends = array('H', [interval[2] for interval in intervals])
+        self.boundaries = sorted(set(self.starts) | set(self.ends))
+        self.segments = []
+
+        active = set()
+        position = 0
+        for boundary in self.boundaries[:-1]:
+            active = {index for index in active if self.ends[index] > boundary}
+            while position < len(self.starts) and self.starts[position] <= boundary:
+                if self.ends[position] > boundary:
+                    active.add(position)
+                position += 1
+            self.segments.append(tuple(sorted(active)))
+
+    def segment(self, minute):
+        position = bisect_right(self.boundaries, minute) - 1
+        if 0 <= position < len(self.segments):
+            return position
+        return None
+
+    def covering(self, minute):
+        position = self.segment(minute)
+        return () if position is None else self.segments[position]
+
+    def covering_range(self, start, end):
+        return tuple(index for index in self.covering(start)
+                     if self.ends[index] >= end)
+
+    def overlapping(self, start, end):
+        first = self.segment(start)
+        if first is None:
+            first = 0 if start < self.boundaries[0] else len(self.segments)
+        found = set()
+        for position in range(first, len(self.segments)):
+            if self.boundaries[position] >= end:
+                break
+            found.update(self.segments[position])
+        return tuple(sorted(found))
+
+
+class IntervalIndex():
+    def __init__(self, intervals=()) -> None:
+        by_date = {}
+        for referee, day, start, end in intervals:
+            if start < end:
+                by_date.setdefault(to_date_key(day), []).append((referee, start, end))
+        self.dates = {day: DateIntervals(values) for day, values in by_date.items()}
+
+    def get_referees(self, day, lookup):
+        intervals = self.dates.get(to_date_key(day))
+        if intervals is None:
+            return []
+        return list(dict.fromkeys(intervals.referees[index]
+                                  for index in lookup(intervals)))
+
+    def available_at(self, day, at):
+        """Referees available at a point in time, e.g. a game start."""
+        minute = to_minutes(at)
+        return self.get_referees(day, lambda intervals: intervals.covering(minute))
+
+    def available_between(self, day, start, end):
+        """Referees with one availability window covering start to end."""
+        start, end = to_minutes(start), to_minutes(end)
+        return self.get_referees(
+            day, lambda intervals: intervals.covering_range(start, end))
+
+    def overlapping(self, day, start, end):
+        """Referees available for any part of start to end."""
+        start, end = to_minutes(start), to_minutes(end)
+        return self.get_referees(
+            day, lambda intervals: intervals.overlapping(start, end))
+
+
+def build_interval_index(results):
+    """Bulk build from get_all_availability results, or the older list of
+    {'referee', 'availability'} dicts."""
+    intervals = []
+    for result in results:
+        if isinstance(result, dict):
+            name, availability = result['referee'], result['availability']
+        else:
+            name, availability = result[0]['referee'], result[1]
+        for avail in availability or []:
+            try:
+                start, end = parse_interval(avail['avail'])
+            except ValueError:
+                logger.warning(f"Skipping unparseable availability {avail['avail']} for {name}")
+                continue
+            intervals.append((name, avail['date'], start, end))
+    return IntervalIndex(intervals)
@@ -0,0 +1,115 @@
+"""Referee by date availability matrix with vectorized queries"""
+import logging
+import numpy as np
+import pandas as pd
+from .interval_index import (to_minutes, ALL_DAY, DAY_MINUTES)
+
+logger = logging.getLogger(__name__)
+
+TIME_RANGE = r'^\s*(\d{1,2}):(\d{2})\s*([AP]M)\s*-\s*(\d{1,2}):(\d{2})\s*([AP]M)\s*$'
+
+
+def get_minutes(hours, minutes, meridiem):
+    hours = pd.to_numeric(hours) % 12 + np.where(meridiem == 'PM', 12, 0)
+    return hours * 60 + pd.to_numeric(minutes)
+
+
+def parse_availability(results):
+    """Long DataFrame of referee, date, start and end minutes from
+    get_all_availability results, or the older list of
+    {'referee', 'availability'} dicts."""
+    referees = []
+    rows = {'referee': [], 'date': [], 'avail': []}
+
+    for result in results:
+        if isinstance(result, dict):
+            name, availability = result['referee'], result['availability']
+        else:
+            name, availability = result[0]['referee'], result[1]
+        referees.append(name)
+        for avail in availability or []:
+            rows['referee'].append(name)
+            rows['date'].append(avail['date'])
+            rows['avail'].append(avail['avail'])
+
+    df = pd.DataFrame(rows, dtype=object)
+    df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d', errors='coerce')
+
+    all_day = df['avail'] == ALL_DAY
+    parts = df['avail'].astype(str).str.extract(TIME_RANGE)
+    df['start'] = get_minutes(parts[0], parts[1], parts[2]).where(~all_day, 0)
+    df['end'] = get_minutes(parts[3], parts[4], parts[5]).where(~all_day, DAY_MINUTES)
+
+    invalid = df[['date', 'start', 'end']].isna().any(axis=1)
+    if invalid.any():
+        logger.warning(f"Skipping {int(invalid.sum())} unparseable availability entries")
+    df = df[~invalid].astype({'start': 'int32', 'end': 'int32'})
+
+    return referees, df[['referee', 'date', 'start', 'end']].reset_index(drop=True)
+
+
+class AvailabilityMatrix():
+    def __init__(self, results, slot_minutes=None) -> None:
+        names, self.intervals = parse_availability(results)
+        self.referees = pd.Index(list(dict.fromkeys(names)), name='referee')
+        self.dates = pd.DatetimeIndex(
+            sorted(self.intervals['date'].unique()), name='date')
+
+        ref_idx = self.referees.get_indexer(self.intervals['referee'])
+        date_idx = self.dates.get_indexer(self.intervals['date'])
+        starts = self.intervals['start'].to_numpy()
+        ends = self.intervals['end'].to_numpy()
+
+        matrix = np.zeros((len(self.referees), len(self.dates)), dtype=bool)
+        matrix[ref_idx, date_idx] = True
+        self.available = pd.DataFrame(matrix, index=self.referees,
+                                      columns=self.dates)
+
+        # Per-date interval arrays, so a query only touches one date.
+        self.by_date = {}
+        order = np.argsort(date_idx, kind='stable')
+        bounds = np.searchsorted(date_idx[order], np.arange(len(self.dates) + 1))
+        for position, day in enumerate(self.dates):
+            rows = order[bounds[position]:bounds[position + 1]]
+            self.by_date[day] = (ref_idx[rows], starts[rows], ends[rows])
+
+        self.slot_minutes = slot_minutes
+        self.slots = None
+        if slot_minutes:
+            # referee x date x slot, a slot is available when one interval
+            # covers all of it.
+            slot_starts = np.arange(0, DAY_MINUTES, slot_minutes)
+            covered = (starts[:, None] <= slot_starts) & \
+                      (ends[:, None] >= slot_starts + slot_minutes)
+            self.slots = np.zeros((len(self.referees), len(self.dates),
+                                   len(slot_starts)), dtype=bool)
+            np.logical_or.at(self.slots, (ref_idx, date_idx), covered)
+
+    def available_between(self, day, start, end):
+        """Referees with one availability window covering start to end."""
+        day = pd.Timestamp(day)
+        if day not in self.by_date:
+            return []
+        ref_idx, starts, ends = self.by_date[day]
+        mask = (starts <= to_minutes(start)) & (ends >= to_minutes(end))
+        return list(self.referees[np.unique(ref_idx[mask])])
+
+    def available_on(self, day):
+        day = pd.Timestamp(day)
+        if day not in self.available.columns:
+            return []
+        return list(self.referees[self.available[day].to_numpy()])
+
+    def available_count_per_day(self):
+        return self.available.sum(axis=0).rename('available')
+
+    def slot_counts(self):
+        """Available referees per date and slot, slots as minute offsets."""
+        if self.slots is None:
+            raise ValueError('Matrix was built without slot_minutes')
+        return pd.DataFrame(self.slots.sum(axis=0), index=self.dates,
+                            columns=np.arange(0, DAY_MINUTES, self.slot_minutes))
+
+
+def build_availability_matrix(results, slot_minutes=None):
+    return AvailabilityMatrix(results, slot_minutes=slot_minutes)
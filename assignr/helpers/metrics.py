@@ -0,0 +1,183 @@
+"""Per-endpoint latency, status, byte and retry counters for Assignr calls"""
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Histogram upper bounds in seconds, the last bucket is +Inf.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class EndpointMetrics():
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.statuses = {}
+        self.bytes = 0
+        self.retries = 0
+
+    def quantile(self, fraction):
+        """Upper bound of the bucket holding the fraction quantile."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for position, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                if position < len(BUCKETS):
+                    return BUCKETS[position]
+                break
+        return self.max_seconds
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'seconds': round(self.seconds, 6),
+            'max_seconds': round(self.max_seconds, 6),
+            'buckets': dict(zip([str(bound) for bound in BUCKETS] + ['+Inf'],
+                                self.buckets)),
+            'statuses': {str(status): count
+                         for status, count in sorted(self.statuses.items(),
+                                                     key=lambda item: str(item[0]))},
+            'bytes': self.bytes,
+            'retries': self.retries
+        }
+
+
+class Metrics():
+    enabled = True
+
+    def __init__(self) -> None:
+        self.endpoints = {}
+        self.lock = Lock()
+
+    def get_endpoint(self, endpoint):
+        if endpoint not in self.endpoints:
+            self.endpoints[endpoint] = EndpointMetrics()
+        return self.endpoints[endpoint]
+
+    def observe(self, endpoint, seconds, status=None, size=0) -> None:
+        with self.lock:
+            metrics = self.get_endpoint(endpoint)
+            metrics.count += 1
+            metrics.seconds += seconds
+            metrics.max_seconds = max(metrics.max_seconds, seconds)
+            metrics.buckets[bisect_left(BUCKETS, seconds)] += 1
+            if status is not None:
+                metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            metrics.bytes += size
+
+    def retry(self, endpoint) -> None:
+        with self.lock:
+            self.get_endpoint(endpoint).retries += 1
+
+    @contextmanager
+    def timer(self, endpoint):
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(endpoint, perf_counter() - started)
+
+    def to_dict(self):
+        with self.lock:
+            return {endpoint: metrics.to_dict()
+                    for endpoint, metrics in sorted(self.endpoints.items())}
+
+    def to_prometheus(self):
+        lines = [
+            '# TYPE assignr_request_seconds histogram',
+            '# TYPE assignr_responses_total counter',
+            '# TYPE assignr_response_bytes_total counter',
+            '# TYPE assignr_retries_total counter'
+        ]
+        for endpoint, metrics in self.to_dict().items():
+            label = f'endpoint="{endpoint}"'
+            cumulative = 0
+            for bound, count in metrics['buckets'].items():
+                cumulative += count
+                lines.append(f'assignr_request_seconds_bucket{{{label},le="{bound}"}} '
+                             f'{cumulative}')
+            lines.append(f'assignr_request_seconds_sum{{{label}}} {metrics["seconds"]}')
+            lines.append(f'assignr_request_seconds_count{{{label}}} {metrics["count"]}')
+            for status, count in metrics['statuses'].items():
+                lines.append(f'assignr_responses_total{{{label},status="{status}"}} '
+                             f'{count}')
+            lines.append(f'assignr_response_bytes_total{{{label}}} {metrics["bytes"]}')
+            lines.append(f'assignr_retries_total{{{label}}} {metrics["retries"]}')
+        return '\n'.join(lines) + '\n'
+
+    def summary(self):
+        lines = []
+        for endpoint, metrics in sorted(self.endpoints.items()):
+            line = (f"{endpoint}: {metrics.count} calls, "
+                    f"mean {metrics.seconds / metrics.count:.3f}s, "
+                    f"p95 <= {metrics.quantile(0.95):.3f}s, "
+                    f"max {metrics.max_seconds:.3f}s")
+            if metrics.statuses:
+                statuses = ', '.join(f"{status}: {count}" for status, count
+                                     in sorted(metrics.statuses.items(),
+                                               key=lambda item: str(item[0])))
+                line += f", statuses {statuses}, {metrics.bytes} bytes"
+            if metrics.retries:
+                line += f", {metrics.retries} retries"
+            lines.append(line)
+        return lines
+
+    def write(self, file_name) -> None:
+        # .prom files get the Prometheus text format, anything else JSON.
+        with open(file_name, 'w') as metrics_file:
+            if file_name.endswith('.prom'):
+                metrics_file.write(self.to_prometheus())
+            else:
+                json.dump(self.to_dict(), metrics_file, indent=2)
+
+
+class NullMetrics():
+    # Stands in for Metrics when instrumentation is off, every call is a
+    # no-op.
+    enabled = False
+
+    def observe(self, endpoint, seconds, status=None, size=0) -> None:
+        pass
+
+    def retry(self, endpoint) -> None:
+        pass
+
+    @contextmanager
+    def timer(self, endpoint):
+        yield
+
+    def summary(self):
+        return []
+
+
+_metrics = NullMetrics()
+
+
+def get_metrics():
+    return _metrics
+
+
+def set_metrics(metrics) -> None:
+    global _metrics
+    _metrics = metrics if metrics is not None else NullMetrics()
+
+
+def timed(name):
+    """Records each call's duration under name in the current metrics."""
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with _metrics.timer(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,96 @@
+"""Adaptive token-bucket rate limiter shared by all Assignr API calls"""
+from threading import Condition
+from time import monotonic
+import logging
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_STATUSES = (429, 503)
+
+
+class RateLimiter():
+    # Every healthy response nudges the rate up by increase or by the ramp
+    # fraction of the rate, whichever is larger, and concurrency follows. A
+    # 429 or 503 halves them. Throttled responses arriving within cooldown
+    # seconds of a decrease belong to the same burst and don't decrease it
+    # again, so a handful of concurrent 503s count as one.
+    def __init__(self, rate=10.0, max_rate=None, min_rate=0.5,
+                 concurrency=10, increase=0.1, decrease=0.5,
+                 cooldown=1.0, ramp=0.05) -> None:
+        self.rate = float(rate)
+        self.max_rate = float(max_rate or rate)
+        self.min_rate = min_rate
+        self.max_concurrency = concurrency
+        self.concurrency = concurrency
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.ramp = ramp
+        self.decreased = None
+        self.tokens = 1.0
+        self.updated = monotonic()
+        self.in_flight = 0
+        self.healthy = 0
+        self.condition = Condition()
+
+    def refill(self, now) -> None:
+        # The bucket holds at most one second's worth of requests.
+        self.tokens = min(max(1.0, self.rate),
+                          self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> None:
+        with self.condition:
+            while True:
+                now = monotonic()
+                self.refill(now)
+                if self.in_flight < self.concurrency and self.tokens >= 1:
+                    self.tokens -= 1
+                    self.in_flight += 1
+                    return
+                if self.in_flight >= self.concurrency:
+                    self.condition.wait()
+                else:
+                    self.condition.wait((1 - self.tokens) / self.rate)
+
+    def release(self, status_code=None) -> None:
+        with self.condition:
+            self.in_flight -= 1
+            if status_code in THROTTLE_STATUSES:
+                self.throttled(status_code)
+            elif status_code is not None and status_code < 500:
+                self.healthy += 1
+                self.ramp_up()
+            self.condition.notify_all()
+
+    def throttled(self, status_code) -> None:
+        now = monotonic()
+        self.healthy = 0
+        if self.decreased is not None and now - self.decreased < self.cooldown:
+            return
+        self.decreased = now
+        self.refill(now)
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self.tokens = min(self.tokens, 0.0)
+        self.concurrency = max(1, int(self.concurrency * self.decrease))
+        logger.warning(f"Assignr returned {status_code}, rate limit reduced to "
+                       f"{self.rate:.2f} req/s, concurrency {self.concurrency}")
+
+    def ramp_up(self) -> None:
+        if self.rate < self.max_rate:
+            self.refill(monotonic())
+            # Proportional at high rates, so recovering from a halving takes
+            # a few dozen responses rather than hundreds.
+            self.rate = min(self.max_rate,
+                            self.rate + max(self.increase, self.rate * self.ramp))
+            if self.rate == self.max_rate:
+                logger.info(f"Rate limit restored to {self.rate:.2f} req/s")
+        # Concurrency grows back by one slot per window of healthy responses.
+        if self.concurrency < self.max_concurrency and \
+           self.healthy >= self.concurrency:
+            self.concurrency += 1
+            self.healthy = 0
+            logger.debug(f"Rate limit concurrency raised to {self.concurrency}")
+
+    def __str__(self):
+        return f"{self.rate:.2f} req/s, concurrency {self.concurrency}"
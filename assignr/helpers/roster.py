@@ -0,0 +1,37 @@
+"""Streaming reader for the referee roster CSV"""
+from fnmatch import fnmatch
+import csv
+
+
+def get_referee_id(value):
+    value = value.strip()
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def read_roster(file_name, ids=None, name_pattern=None):
+    """Yields {'referee', 'id'} per roster row. Only the first three columns,
+    first name, last name and Assignr id, are read. ids limits the roster to
+    those ids and name_pattern to names matching a case-insensitive glob
+    such as '*Simpson'."""
+    ids = None if ids is None else {str(referee_id) for referee_id in ids}
+    pattern = None if name_pattern is None else name_pattern.lower()
+
+    with open(file_name, newline='') as roster:
+        reader = csv.reader(roster, skipinitialspace=True)
+        next(reader, None)
+        for row in reader:
+            if len(row) < 3:
+                continue
+            referee = {
+                'referee': f"{row[0].strip()} {row[1].strip()}",
+                'id': get_referee_id(row[2])
+            }
+            if ids is not None and str(referee['id']) not in ids:
+                continue
+            if pattern is not None and \
+               not fnmatch(referee['referee'].lower(), pattern):
+                continue
+            yield referee
@@ -0,0 +1,80 @@
+"""Last-seen availability per referee, used to report incremental changes"""
+from os import makedirs
+from os.path import (dirname, exists, expanduser)
+from threading import Lock
+import json
+import logging
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYNC_STORE = '~/.cache/assignr/sync.db'
+
+
+class SyncStore():
+    def __init__(self, file_name) -> None:
+        self.file_name = expanduser(file_name)
+        self.lock = Lock()
+
+        directory = dirname(self.file_name)
+        if directory and not exists(directory):
+            makedirs(directory, mode=0o700)
+
+        self.connection = sqlite3.connect(self.file_name,
+                                          check_same_thread=False)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS availability ('
+            'user_id TEXT NOT NULL, id TEXT NOT NULL, date TEXT NOT NULL, '
+            'updated TEXT, record TEXT NOT NULL, PRIMARY KEY (user_id, id))')
+        self.connection.commit()
+
+    def apply(self, user_id, records, start_date, end_date):
+        """Diff a full read of the ISO date window against the stored state,
+        store the new state and return the added, changed and removed
+        records."""
+        changes = {'added': [], 'changed': [], 'removed': []}
+        user_id = str(user_id)
+
+        with self.lock:
+            previous = {
+                record_id: (updated, json.loads(record))
+                for record_id, updated, record in self.connection.execute(
+                    'SELECT id, updated, record FROM availability '
+                    'WHERE user_id = ? AND date BETWEEN ? AND ?',
+                    (user_id, start_date, end_date))
+            }
+
+            current = {str(record['id']): record for record in records}
+            for record_id, record in current.items():
+                if record_id not in previous:
+                    changes['added'].append(record)
+                else:
+                    updated, old_record = previous[record_id]
+                    # Without an updated stamp the record contents decide.
+                    if (record.get('updated') is None and record != old_record) or \
+                       record.get('updated') != updated:
+                        changes['changed'].append(record)
+            for record_id, (_, old_record) in previous.items():
+                if record_id not in current:
+                    changes['removed'].append(old_record)
+
+            stored = [
+                (user_id, str(record['id']), record['date'],
+                 record.get('updated'), json.dumps(record))
+                for record in changes['added'] + changes['changed']
+            ]
+            self.connection.executemany(
+                'DELETE FROM availability WHERE user_id = ? AND id = ?',
+                [(user_id, record_id) for record_id in previous
+                 if record_id not in current])
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO availability '
+                '(user_id, id, date, updated, record) VALUES (?, ?, ?, ?, ?)',
+                stored)
+            self.connection.commit()
+
+        return changes
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,100 @@
+"""Local cache of Assignr OAuth access tokens"""
+from hashlib import sha256
+from os import (makedirs, replace, open as os_open, O_WRONLY, O_CREAT,
+                O_TRUNC, fdopen)
+from os.path import (dirname, exists, expanduser)
+from threading import Lock
+from time import time
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_CACHE = '~/.cache/assignr/token.json'
+
+
+def get_token_key(auth_url, client_id, scope):
+    return sha256(f"{auth_url}|{client_id}|{scope}".encode()).hexdigest()
+
+
+def get_expiry(entry):
+    # None for an entry from a truncated or older format cache file.
+    try:
+        return float(entry['expires_at'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenCache():
+    def __init__(self, file_name, margin=60) -> None:
+        self.file_name = expanduser(file_name)
+        # Tokens are treated as expired this many seconds early so a run
+        # doesn't start with a token that lapses mid-way.
+        self.margin = margin
+        self.lock = Lock()
+
+    def read(self):
+        try:
+            with open(self.file_name, mode='r') as file:
+                contents = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as error:
+            logger.warning(f"Ignoring unreadable token cache {self.file_name}: {error}")
+            return {}
+        if not isinstance(contents, dict):
+            logger.warning(f"Ignoring malformed token cache {self.file_name}")
+            return {}
+        return contents
+
+    def write(self, contents) -> None:
+        directory = dirname(self.file_name)
+        if directory and not exists(directory):
+            makedirs(directory, mode=0o700)
+
+        # Written to a private temporary file and renamed into place so the
+        # token is never readable by other users, even briefly.
+        temp_name = f"{self.file_name}.tmp"
+        with fdopen(os_open(temp_name, O_WRONLY | O_CREAT | O_TRUNC, 0o600),
+                    mode='w') as file:
+            json.dump(contents, file)
+        replace(temp_name, self.file_name)
+
+    def get(self, key):
+        with self.lock:
+            entry = self.read().get(key)
+        if entry is None:
+            return None
+        expires_at = get_expiry(entry)
+        if expires_at is None or not isinstance(entry.get('access_token'), str):
+            logger.warning(f"Ignoring malformed token cache entry in {self.file_name}")
+            return None
+        if expires_at - self.margin <= time():
+            return None
+        return entry['access_token']
+
+    def set(self, key, token, expires_in) -> None:
+        with self.lock:
+            contents = self.read()
+            now = time()
+            contents = {
+                cached_key: entry for cached_key, entry in contents.items()
+                if (get_expiry(entry) or 0) > now
+            }
+            contents[key] = {
+                'access_token': token,
+                'expires_at': now + float(expires_in)
+            }
+            try:
+                self.write(contents)
+            except OSError as error:
+                logger.warning(f"Unable to write token cache {self.file_name}: {error}")
+
+    def invalidate(self, key) -> None:
+        with self.lock:
+            contents = self.read()
+            if contents.pop(key, None) is not None:
+                try:
+                    self.write(contents)
+                except OSError as error:
+                    logger.warning(f"Unable to write token cache {self.file_name}: {error}")
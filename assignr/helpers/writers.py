@@ -0,0 +1,142 @@
+"""Streaming writers for referee availability results"""
+from abc import (ABC, abstractmethod)
+from sys import stdout
+import csv
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = ('text', 'jsonl', 'csv', 'parquet')
+
+
+class AvailabilityWriter(ABC):
+    # Opens the output, stdout for None or '-', and closes it on exit.
+    def __init__(self, file_name=None) -> None:
+        self.file_name = file_name
+        if file_name is None or file_name == '-':
+            self.file = stdout
+        else:
+            self.file = self.open_file(file_name)
+
+    def open_file(self, file_name):
+        return open(file_name, mode='w', newline='')
+
+    @abstractmethod
+    def write(self, referee, availability) -> None:
+        pass
+
+    def close(self) -> None:
+        if self.file is stdout:
+            self.file.flush()
+        else:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class TextWriter(AvailabilityWriter):
+    def write(self, referee, availability) -> None:
+        if availability is None:
+            lines = [f"{referee['referee']} availability could not be retrieved"]
+        elif availability:
+            lines = [f"{referee['referee']} - {avail['date']} - {avail['avail']}"
+                     for avail in availability]
+        else:
+            lines = [f"{referee['referee']} isn't Available"]
+        self.file.write('\n'.join(lines) + '\n')
+        self.file.flush()
+
+
+class JsonLinesWriter(AvailabilityWriter):
+    # One object per referee; availability is null when the lookup failed.
+    def write(self, referee, availability) -> None:
+        self.file.write(json.dumps({
+            'referee': referee['referee'],
+            'id': str(referee['id']),
+            'availability': availability
+        }) + '\n')
+        self.file.flush()
+
+
+def get_rows(referee, availability):
+    # One row per availability entry, or a single row with an empty date
+    # and avail, so referees without availability stay in the output.
+    name, referee_id = referee['referee'], str(referee['id'])
+    if availability is None:
+        return [[name, referee_id, None, None, 'failed']]
+    if not availability:
+        return [[name, referee_id, None, None, 'unavailable']]
+    return [[name, referee_id, avail['date'], avail['avail'], 'available']
+            for avail in availability]
+
+
+class CsvWriter(AvailabilityWriter):
+    COLUMNS = ['referee', 'id', 'date', 'avail', 'status']
+
+    def __init__(self, file_name=None) -> None:
+        super().__init__(file_name)
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.COLUMNS)
+
+    def write(self, referee, availability) -> None:
+        self.writer.writerows(get_rows(referee, availability))
+        self.file.flush()
+
+
+class ParquetWriter(AvailabilityWriter):
+    # Rows are buffered and flushed as row groups, so memory stays bounded
+    # by row_group_size rather than the roster.
+    def __init__(self, file_name, row_group_size=10000) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError('The parquet output format requires pyarrow, '
+                              'pip install pyarrow')
+        if file_name is None or file_name == '-':
+            raise ValueError('The parquet output format requires an output file')
+
+        super().__init__(file_name)
+        self.pa = pa
+        self.schema = pa.schema([(column, pa.string())
+                                 for column in CsvWriter.COLUMNS])
+        self.writer = pq.ParquetWriter(self.file, self.schema)
+        self.row_group_size = row_group_size
+        self.rows = {column: [] for column in CsvWriter.COLUMNS}
+
+    def write(self, referee, availability) -> None:
+        for row in get_rows(referee, availability):
+            for column, value in zip(CsvWriter.COLUMNS, row):
+                self.rows[column].append(value)
+        if len(self.rows['id']) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.rows['id']:
+            self.writer.write_table(
+                self.pa.Table.from_pydict(self.rows, schema=self.schema))
+            self.rows = {column: [] for column in CsvWriter.COLUMNS}
+
+    def open_file(self, file_name):
+        return open(file_name, mode='wb')
+
+    def close(self) -> None:
+        # The footer goes out before the file is closed.
+        self.flush()
+        self.writer.close()
+        super().close()
+
+
+def get_writer(output_format, file_name=None):
+    if output_format == 'parquet':
+        return ParquetWriter(file_name)
+    return {
+        'text': TextWriter,
+        'jsonl': JsonLinesWriter,
+        'csv': CsvWriter
+    }[output_format](file_name)
@@ -0,0 +1,175 @@
+"""End-to-end throughput benchmark of availability.py against a local fake
+Assignr server.
+
+USAGE: python benchmarks/availability_benchmark.py [-r <referees>]
+       [-w <workers>] [-l <latency seconds>] [-x <error rate>]
+       [-n <records per referee>] [-p <page size>] [-R <rate limit>]
+       [-c] [-o <results.json>]
+
+By default availability.py runs with its own defaults, the 10 req/s
+starting rate limit and no cache. -R sets RATE_LIMIT, -R 100000
+effectively removes the limiter, and -c runs with an empty availability
+cache.
+"""
+from datetime import datetime
+from getopt import (getopt, GetoptError)
+from os import environ
+from os.path import (abspath, dirname, join)
+from statistics import quantiles
+from sys import (argv, exit, executable)
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import csv
+import json
+import logging
+import subprocess
+from fake_assignr_server import FakeAssignrServer
+
+ROOT = dirname(dirname(abspath(__file__)))
+AVAILABILITY = join(ROOT, 'assignr', 'availability.py')
+
+# availability.py's starting RATE_LIMIT when none is set.
+DEFAULT_RATE_LIMIT = 10.0
+LIMITER_SETTINGS = ('RATE_LIMIT', 'MAX_RATE_LIMIT', 'MAX_CONCURRENCY')
+
+
+def get_arguments(args):
+    arguments = {
+        'referees': 1000, 'workers': 16, 'latency': 0.02, 'error_rate': 0.0,
+        'records': 10, 'page_size': None, 'rate_limit': None, 'cache': False,
+        'output': 'availability-benchmark.json'
+    }
+    USAGE = 'USAGE: availability_benchmark.py [-r <referees>] [-w <workers>]' \
+        ' [-l <latency>] [-x <error-rate>] [-n <records>] [-p <page-size>]' \
+        ' [-R <rate-limit>] [-c] [-o <output-file>]'
+
+    try:
+        opts, args = getopt(args, "hr:w:l:x:n:p:R:co:",
+                            ["referees=", "workers=", "latency=", "error-rate=",
+                             "records=", "page-size=", "rate-limit=", "cache",
+                             "output="])
+    except GetoptError:
+        logging.error(USAGE)
+        return 77, arguments
+
+    options = {
+        ('-r', '--referees'): ('referees', int),
+        ('-w', '--workers'): ('workers', int),
+        ('-l', '--latency'): ('latency', float),
+        ('-x', '--error-rate'): ('error_rate', float),
+        ('-n', '--records'): ('records', int),
+        ('-p', '--page-size'): ('page_size', int),
+        ('-R', '--rate-limit'): ('rate_limit', float),
+        ('-o', '--output'): ('output', str)
+    }
+    for opt, arg in opts:
+        if opt == '-h':
+            logging.error(USAGE)
+            return 99, arguments
+        if opt in ('-c', '--cache'):
+            arguments['cache'] = True
+        for names, (key, convert) in options.items():
+            if opt in names:
+                try:
+                    arguments[key] = convert(arg)
+                except ValueError:
+                    logging.error(f"{opt} value, {arg} is invalid")
+                    return 88, arguments
+
+    return 0, arguments
+
+
+def write_roster(file_name, referees) -> None:
+    with open(file_name, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['First Name', 'Last Name', 'Id'])
+        for count in range(referees):
+            writer.writerow(['Referee', f'Number{count}', 1000 + count])
+
+
+def get_version():
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'],
+                              cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(args):
+    server = FakeAssignrServer(latency=args['latency'],
+                               error_rate=args['error_rate'],
+                               records=args['records']).start()
+
+    with TemporaryDirectory() as directory:
+        roster = join(directory, 'referees.csv')
+        write_roster(roster, args['referees'])
+        # Limiter settings from the caller's environment would skew the run.
+        env = {name: value for name, value in environ.items()
+               if name not in LIMITER_SETTINGS}
+        env.update({
+            'CLIENT_ID': 'benchmark', 'CLIENT_SECRET': 'benchmark',
+            'CLIENT_SCOPE': 'read', 'AUTH_URL': f"{server.url}/oauth/token",
+            'BASE_URL': f"{server.url}/api/v2/", 'FILE_NAME': roster,
+            'LOG_LEVEL': '30', 'TOKEN_CACHE': '',
+            'AVAILABILITY_CACHE': join(directory, 'availability.db')
+        })
+        if args['rate_limit'] is not None:
+            env['RATE_LIMIT'] = str(args['rate_limit'])
+        command = [executable, AVAILABILITY, '-s', '01/01/2023', '-e',
+                   '12/31/2023', '-w', str(args['workers']),
+                   '-f', 'jsonl', '-o', join(directory, 'availability.jsonl')]
+        if not args['cache']:
+            command.append('--no-cache')
+        if args['page_size']:
+            command += ['-p', str(args['page_size'])]
+
+        started = perf_counter()
+        completed = subprocess.run(command, env=env, cwd=dirname(AVAILABILITY),
+                                   capture_output=True, text=True)
+        wall_time = perf_counter() - started
+
+        with open(join(directory, 'availability.jsonl')) as file:
+            referees = sum(1 for _ in file)
+
+    server.stop()
+    if completed.returncode:
+        logging.error(completed.stdout + completed.stderr)
+
+    timings = sorted(server.timings)
+    percentiles = quantiles(timings, n=100) if len(timings) > 1 else timings * 99
+    return {
+        'version': get_version(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'parameters': args,
+        'rate_limit': args['rate_limit'] or DEFAULT_RATE_LIMIT,
+        'cache': args['cache'],
+        'return_code': completed.returncode,
+        'referees_written': referees,
+        'requests': len(timings),
+        'statuses': {str(status): count for status, count in server.statuses.items()},
+        'wall_time': round(wall_time, 3),
+        'requests_per_second': round(len(timings) / wall_time, 1),
+        'latency': {
+            'p50': round(percentiles[49], 4),
+            'p95': round(percentiles[94], 4),
+            'p99': round(percentiles[98], 4)
+        }
+    }
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    rc, args = get_arguments(argv[1:])
+    if rc:
+        exit(rc)
+
+    results = run_benchmark(args)
+    with open(args['output'], mode='w') as file:
+        json.dump(results, file, indent=2)
+    print(json.dumps(results, indent=2))
+    exit(results['return_code'])
+
+
+if __name__ == "__main__":
+    main()
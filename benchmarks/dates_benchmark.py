@@ -0,0 +1,145 @@
+"""Per-row against memoized and bulk date and time formatting.
+
+USAGE: python benchmarks/dates_benchmark.py [-r <rows>] [-d <distinct dates>]
+       [-t <distinct times>] [-n <repeats>] [-o <results.json>]
+"""
+from datetime import (datetime, time, timedelta)
+from getopt import (getopt, GetoptError)
+from os.path import (abspath, dirname)
+from sys import (argv, exit, path)
+from time import perf_counter
+import json
+import logging
+import subprocess
+
+ROOT = dirname(dirname(abspath(__file__)))
+path.insert(0, ROOT)
+from schedule.helpers.dates import (format_time, map_unique, parse_master_date,
+                                    parse_master_dates)
+
+
+def get_arguments(args):
+    arguments = {
+        'rows': 200000, 'dates': 30, 'times': 12, 'repeats': 5,
+        'output': 'dates-benchmark.json'
+    }
+    USAGE = 'USAGE: dates_benchmark.py [-r <rows>] [-d <dates>] [-t <times>]' \
+        ' [-n <repeats>] [-o <output-file>]'
+
+    try:
+        opts, args = getopt(args, "hr:d:t:n:o:",
+                            ["rows=", "dates=", "times=", "repeats=", "output="])
+    except GetoptError:
+        logging.error(USAGE)
+        return 77, arguments
+
+    options = {
+        ('-r', '--rows'): ('rows', int),
+        ('-d', '--dates'): ('dates', int),
+        ('-t', '--times'): ('times', int),
+        ('-n', '--repeats'): ('repeats', int),
+        ('-o', '--output'): ('output', str)
+    }
+    for opt, arg in opts:
+        if opt == '-h':
+            logging.error(USAGE)
+            return 99, arguments
+        for names, (key, convert) in options.items():
+            if opt in names:
+                try:
+                    arguments[key] = convert(arg)
+                except ValueError:
+                    logging.error(f"{opt} value, {arg} is invalid")
+                    return 88, arguments
+
+    return 0, arguments
+
+
+def per_row_dates(values):
+    # What process_row did before, strptime and strftime on every row.
+    dates = []
+    for value in values:
+        try:
+            dates.append(datetime.strptime(value, "%m/%d/%y").strftime("%m/%d/%Y"))
+        except ValueError:
+            dates.append(None)
+    return dates
+
+
+def per_row_times(values):
+    return [value.strftime("%I:%M %p") for value in values]
+
+
+def best(function, values, repeats, clear=None):
+    timings = []
+    for _ in range(repeats):
+        if clear is not None:
+            clear()
+        started = perf_counter()
+        result = function(values)
+        timings.append(perf_counter() - started)
+    return min(timings), result
+
+
+def run_benchmark(args):
+    first_date = datetime(2023, 4, 1)
+    master_dates = [(first_date + timedelta(weeks=number % args['dates'])).strftime('%-m/%-d/%y')
+                    for number in range(args['rows'])]
+    slots = [time(8 + number % 10, 30 * (number % 2)) for number in range(args['times'])]
+    game_times = [slots[number % len(slots)] for number in range(args['rows'])]
+
+    # The memoized runs start from an empty cache each repeat.
+    timings = {}
+    results = {}
+    for name, function, values, clear in (
+            ('dates_per_row', per_row_dates, master_dates, None),
+            ('dates_memoized', lambda values: [parse_master_date(value)[0] for value in values],
+             master_dates, parse_master_date.cache_clear),
+            ('dates_bulk', lambda values: parse_master_dates(values)[0],
+             master_dates, parse_master_date.cache_clear),
+            ('times_per_row', per_row_times, game_times, None),
+            ('times_memoized', lambda values: [format_time(value) for value in values],
+             game_times, format_time.cache_clear),
+            ('times_bulk', lambda values: map_unique(format_time, values),
+             game_times, format_time.cache_clear)):
+        timings[name], results[name] = best(function, values, args['repeats'], clear)
+
+    per_row = {name: round(seconds / args['rows'] * 1e9, 1)
+               for name, seconds in timings.items()}
+    return {
+        'version': get_version(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'parameters': args,
+        'results_match': results['dates_per_row'] == results['dates_memoized'] ==
+        results['dates_bulk'] and results['times_per_row'] == results['times_memoized'] ==
+        results['times_bulk'],
+        'seconds': {name: round(seconds, 4) for name, seconds in timings.items()},
+        'ns_per_row': per_row,
+        'date_speedup': round(timings['dates_per_row'] / timings['dates_bulk'], 1),
+        'time_speedup': round(timings['times_per_row'] / timings['times_bulk'], 1)
+    }
+
+
+def get_version():
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'],
+                              cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    rc, args = get_arguments(argv[1:])
+    if rc:
+        exit(rc)
+
+    results = run_benchmark(args)
+    with open(args['output'], mode='w') as file:
+        json.dump(results, file, indent=2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Local stand-in for the Assignr API used by the benchmarks"""
+from datetime import (date, timedelta)
+from http.server import (BaseHTTPRequestHandler, ThreadingHTTPServer)
+from threading import (Lock, Thread)
+from time import (perf_counter, sleep)
+from urllib.parse import (urlparse, parse_qs)
+import json
+import random
+import re
+import zlib
+
+AVAILABILITY_PATH = re.compile(r'^/api/v2/users/([^/]+)/availability$')
+
+
+class FakeAssignrServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency=0.02, jitter=0.01, error_rate=0.0,
+                 records=10, seed=0) -> None:
+        super().__init__(('127.0.0.1', 0), FakeAssignrHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.records = records
+        self.random = random.Random(seed)
+        self.lock = Lock()
+        self.timings = []
+        self.statuses = {}
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def record(self, status, elapsed) -> None:
+        with self.lock:
+            self.timings.append(elapsed)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def delay(self):
+        with self.lock:
+            failed = self.random.random() < self.error_rate
+            latency = max(0.0, self.latency +
+                          self.random.uniform(-self.jitter, self.jitter))
+        sleep(latency)
+        return failed
+
+    def handle_error(self, request, client_address) -> None:
+        # Clients closing pooled keep-alive connections aren't errors.
+        pass
+
+    def start(self):
+        self.thread = Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class FakeAssignrHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def send_json(self, status, body, headers=None) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self) -> None:
+        started = perf_counter()
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.server.delay()
+        self.send_json(200, {'access_token': 'benchmark', 'expires_in': 7200})
+        self.server.record(200, perf_counter() - started)
+
+    def do_GET(self) -> None:
+        started = perf_counter()
+        url = urlparse(self.path)
+        match = AVAILABILITY_PATH.match(url.path)
+        if match is None:
+            self.send_json(404, {'error': 'not found'})
+            self.server.record(404, perf_counter() - started)
+            return
+
+        if self.server.delay():
+            self.send_json(503, {'error': 'unavailable'}, {'Retry-After': '0'})
+            self.server.record(503, perf_counter() - started)
+            return
+
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.send_json(200, get_page(match.group(1), params, self.server.records))
+        self.server.record(200, perf_counter() - started)
+
+
+def get_page(user_id, params, records):
+    # Records are spread over the requested window, one per day, and are
+    # identical for every request so repeated runs return the same data.
+    limit = int(params.get('limit', 200))
+    page = int(params.get('page', 1))
+    start = date(2023, 1, 1)
+    available = [
+        {
+            'id': zlib.crc32(user_id.encode()) * 10000 + day,
+            'date': (start + timedelta(days=day)).isoformat(),
+            'all_day': day % 3 == 0,
+            'start_time': '08:00 AM',
+            'end_time': '3:00 PM',
+            'description': '',
+            'created': '2023-10-05T21:24:22.000-04:00',
+            'updated': '2023-10-05T21:24:22.000-04:00'
+        }
+        for day in range(records)
+    ]
+    pages = max(1, -(-len(available) // limit))
+    return {
+        'page': {'records': len(available), 'pages': pages,
+                 'current_page': page, 'limit': limit},
+        '_embedded': {
+            'availability': available[(page - 1) * limit:page * limit]
+        }
+    }
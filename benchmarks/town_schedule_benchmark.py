@@ -0,0 +1,154 @@
+"""Serial against parallel per-sheet parsing of a synthetic town workbook.
+
+USAGE: python benchmarks/town_schedule_benchmark.py [-s <sheets>]
+       [-r <rows per sheet>] [-d <dates per sheet>] [-w <workers>]
+       [-n <repeats>] [-o <results.json>]
+"""
+from datetime import (datetime, time, timedelta)
+from getopt import (getopt, GetoptError)
+from os import cpu_count
+from os.path import (abspath, dirname, join)
+from sys import (argv, exit, path)
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import json
+import logging
+import subprocess
+from openpyxl import Workbook
+
+ROOT = dirname(dirname(abspath(__file__)))
+path.insert(0, ROOT)
+from schedule.helpers.town_schedule import TownSchedule
+
+FIELDS = {
+    f'Field{number}': {'venue': 'Park', 'sub-venue': f'Field {number}'}
+    for number in range(1, 5)
+}
+
+
+def get_arguments(args):
+    arguments = {
+        'sheets': 12, 'rows': 2000, 'dates': 12, 'workers': cpu_count(),
+        'repeats': 3, 'output': 'town-schedule-benchmark.json'
+    }
+    USAGE = 'USAGE: town_schedule_benchmark.py [-s <sheets>] [-r <rows>]' \
+        ' [-d <dates>] [-w <workers>] [-n <repeats>] [-o <output-file>]'
+
+    try:
+        opts, args = getopt(args, "hs:r:d:w:n:o:",
+                            ["sheets=", "rows=", "dates=", "workers=",
+                             "repeats=", "output="])
+    except GetoptError:
+        logging.error(USAGE)
+        return 77, arguments
+
+    options = {
+        ('-s', '--sheets'): ('sheets', int),
+        ('-r', '--rows'): ('rows', int),
+        ('-d', '--dates'): ('dates', int),
+        ('-w', '--workers'): ('workers', int),
+        ('-n', '--repeats'): ('repeats', int),
+        ('-o', '--output'): ('output', str)
+    }
+    for opt, arg in opts:
+        if opt == '-h':
+            logging.error(USAGE)
+            return 99, arguments
+        for names, (key, convert) in options.items():
+            if opt in names:
+                try:
+                    arguments[key] = convert(arg)
+                except ValueError:
+                    logging.error(f"{opt} value, {arg} is invalid")
+                    return 88, arguments
+
+    return 0, arguments
+
+
+def write_workbook(file_name, sheets, rows, dates):
+    """Town workbook with sheets age group sheets of rows games each, plus
+    a hidden archive sheet per age group."""
+    workbook = Workbook(write_only=True)
+    age_groups = {}
+    first_date = datetime(2023, 4, 1)
+    for number in range(sheets):
+        title = f'DIV_{number:02}'
+        age_groups[title.lower()] = f'Division {number}'
+        for archive in (False, True):
+            sheet = workbook.create_sheet(f'{title}_OLD' if archive else title)
+            if archive:
+                sheet.sheet_state = 'hidden'
+            sheet.append([f'SPRING 2023 DIVISION {number}'])
+            sheet.append(['Division', 'Field', 'Time'] +
+                          [first_date + timedelta(weeks=week)
+                           for week in range(dates)])
+            for row in range(rows):
+                sheet.append(
+                    [number, f'Field{row % 4 + 1}', time(8 + row % 10, 0)] +
+                    [f"{'B' if (row + week) % 2 else 'G'} - {row % 9 + 1}"
+                     if (row + week) % 7 else 'BYE' for week in range(dates)])
+    workbook.save(file_name)
+    return age_groups
+
+
+def time_parse(file_name, age_groups, workers, repeats):
+    timings = []
+    for _ in range(repeats):
+        town_schedule = TownSchedule(file_name, FIELDS, 'town', age_groups)
+        started = perf_counter()
+        town_schedule.read_town_spreadsheet(workers=workers)
+        timings.append(perf_counter() - started)
+    return min(timings), len(town_schedule.game_times)
+
+
+def get_version():
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'],
+                              cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(args):
+    with TemporaryDirectory() as directory:
+        file_name = join(directory, 'town.xlsx')
+        age_groups = write_workbook(file_name, args['sheets'], args['rows'],
+                                    args['dates'])
+        serial, serial_games = time_parse(file_name, age_groups, None,
+                                          args['repeats'])
+        parallel, parallel_games = time_parse(file_name, age_groups,
+                                              args['workers'], args['repeats'])
+        # 1 when -w falls back to the serial parse, too few CPUs or a
+        # workbook too small for the pool.
+        sheet_workers = TownSchedule(file_name, FIELDS, 'town', age_groups) \
+            .get_sheet_workers(args['workers'])
+
+    return {
+        'version': get_version(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'parameters': args,
+        'cpus': cpu_count(),
+        'sheet_workers': sheet_workers,
+        'games': serial_games,
+        'games_match': serial_games == parallel_games,
+        'serial_seconds': round(serial, 3),
+        'parallel_seconds': round(parallel, 3),
+        'speedup': round(serial / parallel, 2)
+    }
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    rc, args = get_arguments(argv[1:])
+    if rc:
+        exit(rc)
+
+    results = run_benchmark(args)
+    with open(args['output'], mode='w') as file:
+        json.dump(results, file, indent=2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Assignr upload files for one or several towns from one master schedule"""
+from concurrent.futures import ProcessPoolExecutor
+import json
+import logging
+import pandas as pd
+from .join import join_games
+from .master_schedule import MasterSchedule
+from .town_schedule import TownSchedule
+from .translations import get_translations
+
+logger = logging.getLogger(__name__)
+
+ASSIGNOR_HEADER = [
+    'Game ID', 'Date', 'Start Time', 'Venue', 'Sub-Venue',
+    'Age Group', 'League', 'Gender', 'Game Type',
+    'Home Team', 'Away Team'
+]
+
+ASSIGNOR_COLUMNS = [
+    'game_id', 'date', 'time', 'venue', 'sub_venue', 'age_group', 'league',
+    'gender', 'game_type', 'home_team', 'away_team'
+]
+
+
+def load_manifest(file_name):
+    """Reads a JSON list of {"town", "town_file"} entries."""
+    manifest = []
+    try:
+        with open(file_name, mode='r') as file:
+            contents = json.load(file)
+    except FileNotFoundError as fe:
+        logging.error(f"{fe.strerror}: {fe.filename}")
+        return manifest, 66
+    except ValueError as error:
+        logging.error(f"Manifest {file_name} is not valid JSON: {error}")
+        return manifest, 88
+
+    if not isinstance(contents, list):
+        logging.error(f"Manifest {file_name} must be a list of towns")
+        return manifest, 88
+
+    for entry in contents:
+        try:
+            manifest.append({'town': entry['town'].lower(),
+                             'town_file': entry['town_file']})
+        except (KeyError, TypeError, AttributeError):
+            logging.error(f"Manifest entry {entry} needs a town and town_file")
+            return [], 88
+
+    return manifest, 0
+
+
+def get_town_translations(translations, town):
+    translations = get_translations(translations)
+    fields = translations.get_town(town)
+    if fields is None:
+        logging.error(f"No field translations found for {town}")
+        return None, None, 55
+
+    age_groups = translations.age_groups
+    if age_groups is None:
+        logging.error(f"No Team mappings found for {town}")
+        return None, None, 55
+
+    return fields, age_groups, 0
+
+
+def process_town(town, town_file, values, translations, file_name,
+                 sheet_workers=None, town_cache=None):
+    """Joins the town's master schedule rows with its town schedule and
+    writes the Assignr upload file, returns the exit code. Games that don't
+    join are reported rather than dropped silently. sheet_workers
+    parses the town's sheets in a process pool, town_cache reuses an
+    earlier parse of the same workbook."""
+    translations = get_translations(translations)
+    fields, age_groups, rc = get_town_translations(translations, town)
+    if rc:
+        return rc
+
+    master_schedule = MasterSchedule(None, None)
+    master_schedule.values = values
+    master_schedule.process_master_schedule(town)
+
+    town_schedule = TownSchedule(town_file, fields, town, age_groups)
+    town_schedule.read_town_spreadsheet(workers=sheet_workers,
+                                        cache=town_cache)
+
+    result = join_games(town_schedule.game_times, master_schedule.referee_games,
+                        aliases=translations.get_team_aliases(town))
+    result.report(town)
+
+    panda_referee_schedule = pd.DataFrame(result.matched, columns=ASSIGNOR_COLUMNS)
+    panda_referee_schedule.to_csv(file_name, header=ASSIGNOR_HEADER, index=False)
+    logging.info(f"{town}: {len(panda_referee_schedule)} games written to {file_name}, "
+                 f"{len(result.master_only)} master only, "
+                 f"{len(result.town_only)} town only, "
+                 f"{len(result.duplicates)} duplicate keys")
+    return 0
+
+
+def run_town(job):
+    # Runs in a worker process, so the town's sheets are parsed serially.
+    # One town's failure is reported without stopping the others.
+    try:
+        return job['town'], process_town(**job)
+    except Exception as error:
+        logging.error(f"{job['town']} failed: {error}")
+        return job['town'], 99
+
+
+def run_batch(manifest, master_schedule, translations, output_file_prefix,
+              str_date, workers=None, town_cache=None):
+    """Writes one upload file per manifest town, returns the first non-zero
+    exit code or 0."""
+    # Compiled once here rather than in every worker.
+    translations = get_translations(translations)
+    town_values = master_schedule.group_by_town()
+    jobs = [{
+        'town': entry['town'],
+        'town_file': entry['town_file'],
+        # Each worker is sent only its own town's rows.
+        'values': town_values.get(entry['town'], []),
+        'translations': translations,
+        'file_name': f"{output_file_prefix}-{entry['town']}-{str_date}",
+        'town_cache': town_cache
+    } for entry in manifest]
+
+    if workers == 1:
+        results = [run_town(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run_town, jobs))
+
+    rc = 0
+    for town, town_rc in results:
+        if town_rc and not rc:
+            rc = town_rc
+    return rc
@@ -0,0 +1,47 @@
+"""Memoized parsing and formatting of schedule dates and times"""
+from datetime import datetime
+from functools import lru_cache
+
+MASTER_DATE_FORMAT = "%m/%d/%y"
+DATE_FORMAT = "%m/%d/%Y"
+TIME_FORMAT = "%I:%M %p"
+
+# A season has a few dozen distinct dates and time slots, the bound only
+# keeps a long run over many seasons from growing without limit.
+CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_master_date(value):
+    """The master schedule's MM/DD/YY date as MM/DD/YYYY and None, or None
+    and the error message. The message is cached like a result, so a bad
+    date isn't parsed again for every row it appears on, and unlike the
+    ValueError it keeps no traceback alive."""
+    try:
+        return datetime.strptime(value, MASTER_DATE_FORMAT).strftime(DATE_FORMAT), None
+    except ValueError as error:
+        return None, str(error)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def format_date(value):
+    return value.strftime(DATE_FORMAT)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def format_time(value):
+    return value.strftime(TIME_FORMAT)
+
+
+def map_unique(function, values):
+    """function called once per distinct value of the column. A plain dict
+    beats both the lru_cache lookup per row and pandas' string parsing."""
+    results = {value: function(value) for value in set(values)}
+    return [results[value] for value in values]
+
+
+def parse_master_dates(values):
+    """parse_master_date over a whole column, returns the list of dates and
+    the list of errors, None where the date parsed."""
+    results = map_unique(parse_master_date, values)
+    return [result[0] for result in results], [result[1] for result in results]
@@ -0,0 +1,126 @@
+"""Join of town schedule games with master schedule games on their key"""
+import logging
+from .team_names import (SUGGESTION_THRESHOLD, TeamIndex)
+
+logger = logging.getLogger(__name__)
+
+JOIN_KEYS = ('age_group', 'date', 'gender', 'home_team')
+
+
+def get_key(game, keys=JOIN_KEYS, teams=None):
+    # With a TeamIndex, teams are compared by their normalized, aliased
+    # names.
+    if teams is None:
+        return tuple(game[key] for key in keys)
+    return tuple(teams.get_key(game[key]) if key == 'home_team' else game[key]
+                 for key in keys)
+
+
+class JoinResult():
+    def __init__(self) -> None:
+        # matched rows in town schedule order, each game that found no
+        # partner, and {key: {'town': count, 'master': count}} for keys
+        # found more than once on either side. suggestions pairs a town
+        # only game with the master only game whose team name is closest,
+        # (town game, master game, score), they are never joined.
+        self.matched = []
+        self.master_only = []
+        self.town_only = []
+        self.duplicates = {}
+        self.suggestions = []
+
+    def report(self, town) -> None:
+        """Logs every game that was not written and why."""
+        for game in self.master_only:
+            logging.warning(f"{town}: master schedule game not in the town schedule, "
+                            f"{game['date']} {game['age_group']} {game['gender']} "
+                            f"{game['home_team']} v {game['away_team']}")
+        for game in self.town_only:
+            logging.warning(f"{town}: town schedule game not in the master schedule, "
+                            f"{game['date']} {game['time']} {game['age_group']} "
+                            f"{game['gender']} {game['home_team']}")
+        for key, counts in self.duplicates.items():
+            logging.error(f"{town}: {' '.join(str(part) for part in key)} is in the town schedule "
+                          f"{counts['town']} times and the master schedule "
+                          f"{counts['master']} times, not written")
+        for town_game, master_game, score in self.suggestions:
+            logging.warning(f"{town}: town schedule team {town_game['home_team']} "
+                            f"may be master schedule team {master_game['home_team']}, "
+                            f"{town_game['date']} {town_game['age_group']} "
+                            f"{town_game['gender']}, score {score:.2f}, not applied")
+
+
+def join_games(town_games, master_games, keys=JOIN_KEYS, aliases=None,
+               threshold=SUGGESTION_THRESHOLD):
+    """Inner join of the two lists of game dicts on keys. The master games
+    are indexed once and the town games are looked up in one pass. Team
+    names are compared normalized, with aliases mapping one schedule's
+    name to the other's. Keys found more than once on either side can't
+    be paired, so they are reported in duplicates rather than written."""
+    result = JoinResult()
+    teams = TeamIndex(aliases=aliases)
+
+    index = {}
+    master_counts = {}
+    raw_keys = {}
+    for game in master_games:
+        key = get_key(game, keys, teams)
+        master_counts[key] = master_counts.get(key, 0) + 1
+        index.setdefault(key, game)
+        raw_keys.setdefault(key, get_key(game, keys))
+
+    town_counts = {}
+    pairs = []
+    for game in town_games:
+        key = get_key(game, keys, teams)
+        town_counts[key] = town_counts.get(key, 0) + 1
+        raw_keys.setdefault(key, get_key(game, keys))
+        if key in index:
+            pairs.append((key, game, index[key]))
+        else:
+            result.town_only.append(game)
+
+    duplicates = set()
+    for counts in (town_counts, master_counts):
+        for key, count in counts.items():
+            if count > 1 and key not in duplicates:
+                duplicates.add(key)
+                result.duplicates[raw_keys[key]] = {
+                    'town': town_counts.get(key, 0),
+                    'master': master_counts.get(key, 0)}
+
+    result.matched = [{**town_game, **master_game}
+                      for key, town_game, master_game in pairs
+                      if key not in duplicates]
+    result.master_only = [game for game in master_games
+                          if get_key(game, keys, teams) not in town_counts]
+    if 'home_team' in keys:
+        result.suggestions = get_suggestions(result, keys, aliases, threshold)
+    return result
+
+
+def get_suggestions(result, keys, aliases, threshold):
+    """Closest master only game for each town only game. The master only
+    games are bucketed by the rest of the key, age group, date and gender,
+    and a town only game's team is scored only against the teams in its
+    own bucket."""
+    rest = [key for key in keys if key != 'home_team']
+    buckets = {}
+    for game in result.master_only:
+        bucket_key = tuple(game[key] for key in rest)
+        if bucket_key not in buckets:
+            buckets[bucket_key] = (TeamIndex(aliases=aliases), {})
+        teams, games = buckets[bucket_key]
+        teams.add(game['home_team'])
+        games.setdefault(teams.get_key(game['home_team']), game)
+
+    suggestions = []
+    for game in result.town_only:
+        bucket = buckets.get(tuple(game[key] for key in rest))
+        if bucket is None:
+            continue
+        teams, games = bucket
+        for name, score in teams.suggest(game['home_team'], limit=1,
+                                         threshold=threshold):
+            suggestions.append((game, games[teams.get_key(name)], score))
+    return suggestions
@@ -1,13 +1,29 @@
 import logging
-from datetime import datetime
+import pandas as pd
 from google import auth
+from google.auth.exceptions import GoogleAuthError
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from httplib2 import HttpLib2Error
+from .dates import (parse_master_date, parse_master_dates)
 
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
 
 logger = logging.getLogger(__name__)
 
+def get_revision(credentials, spreadsheet_id):
+    """The spreadsheet's Drive version, None when it can't be read, the
+    Drive API disabled, the scope missing or the request failing."""
+    try:
+        service = build('drive', 'v3', credentials=credentials,
+                        static_discovery=True, cache_discovery=False)
+        result = service.files().get(fileId=spreadsheet_id,
+                                     fields='version,modifiedTime').execute()
+    except (HttpError, GoogleAuthError, HttpLib2Error, OSError) as error:
+        logger.warning(f"Unable to read the revision of {spreadsheet_id}: {error}")
+        return None
+    return result.get('version') or result.get('modifiedTime')
+
 def get_age_gender(field):
     age_group_gender = field.split(' ')
     return age_group_gender[2], f"{age_group_gender[0]} {age_group_gender[1]}"
@@ -15,11 +31,8 @@ def get_age_gender(field):
 def process_row(row):
     gender, age_group = get_age_gender(row[0])
 
-    temp_date = None
-    try:
-        cr_date = datetime.strptime(row[2], "%m/%d/%y")
-        temp_date = cr_date.strftime("%m/%d/%Y")
-    except ValueError as error:
+    temp_date, error = parse_master_date(row[2])
+    if error is not None:
         logging.warning(f'Date Error: {error}, for line {row}')
 
     game_info = {
@@ -33,6 +46,75 @@ def process_row(row):
     return game_info
 
 
+def process_master_values(values, town_team):
+    """Column-wise equivalent of process_row over every game of town_team,
+    returns the se_games and referee_games lists."""
+    if not values:
+        return [], []
+
+    frame = pd.DataFrame(values, dtype=object).reindex(columns=range(7))
+
+    home = frame[3].fillna('').astype(str).str.lower()
+    away = frame[5].fillna('').astype(str).str.lower()
+    is_home = (home == town_team) & ~away.isin(['bye', 'no game'])
+    is_away = ~is_home & (away == town_team)
+    # Only the town's games are converted, usually a small part of the sheet.
+    games = frame[is_home | is_away].fillna('').astype(str)
+
+    # get_age_gender needs "<age> <group> <gender>", process_row raised
+    # IndexError on shorter divisions, here the row is reported and skipped.
+    short = games[0].str.split(' ').str.len() < 3
+    for index in games.index[short].tolist():
+        logging.error(f'Division Error: no age group and gender, for line {values[index]}')
+    games = games[~short]
+    if games.empty:
+        return [], []
+    is_home = is_home[games.index]
+
+    # A season has few distinct dates, each is parsed once.
+    dates, errors = parse_master_dates(games[2].tolist())
+    for index, error in zip(games.index.tolist(), errors):
+        if error is not None:
+            logging.warning(f'Date Error: {error}, for line {values[index]}')
+
+    division = games[0].str.split(' ', expand=True).reindex(columns=range(3))
+    columns = zip(
+        division[2].tolist(),
+        (division[0] + ' ' + division[1]).tolist(),
+        dates,
+        (games[3] + '-' + games[4]).tolist(),
+        (games[5] + '-' + games[6]).tolist(),
+        is_home.tolist()
+    )
+
+    # The dicts are built from plain lists, DataFrame.to_dict is several
+    # times slower than the column operations above.
+    se_games = []
+    referee_games = []
+    league = town_team.title()
+    for gender, age_group, game_date, home_team, away_team, home_game in columns:
+        se_games.append({
+            'gender': gender,
+            'age_group': age_group,
+            'date': game_date,
+            'home_team': home_team,
+            'away_team': away_team
+        })
+        if home_game:
+            referee_games.append({
+                'game_id': '',
+                'game_type': 'Coastal',
+                'gender': gender,
+                'age_group': age_group,
+                'date': game_date,
+                'league': league,
+                'home_team': home_team,
+                'away_team': away_team
+            })
+
+    return se_games, referee_games
+
+
 class MasterSchedule():
     def __init__(self, id, sheet_range) -> None:
         self.id = id
@@ -41,20 +123,71 @@ class MasterSchedule():
         self.referee_games = []
         self.se_games = []
 
-    def load_sheet(self) -> None:
+    def load_sheet(self, cache=None, offline=False) -> None:
+        # With a cache the download is skipped while the spreadsheet's Drive
+        # revision is unchanged. A copy cached without a revision is always
+        # downloaded again, but still serves offline runs, which only use
+        # the cached copy.
+        cached = cache.get(self.id, self.sheet_range) if cache else None
+        if offline:
+            if cached is None:
+                logger.error(f"No cached copy of {self.id} {self.sheet_range}")
+                return
+            self.values = cached['values']
+            logger.info(f"{len(self.values)} rows loaded from cache")
+            return
+
         credentials, _ = auth.default()
 
         try:
-            service = build('sheets', 'v4', credentials=credentials)
+            revision = None
+            if cache is not None:
+                revision = get_revision(credentials, self.id)
+                if cached is not None and revision is not None and \
+                   cached['revision'] == revision:
+                    self.values = cached['values']
+                    logger.info(f"{len(self.values)} rows loaded from cache, "
+                                f"revision {revision} unchanged")
+                    return
+
+            # The discovery document bundled with the client library is used,
+            # so building the service makes no request.
+            service = build('sheets', 'v4', credentials=credentials,
+                            static_discovery=True, cache_discovery=False)
             sheet = service.spreadsheets()
             result = sheet.values().get(
                 spreadsheetId=self.id, range=self.sheet_range).execute()
             self.values = result.get('values', [])
             logger.info(f"{len(self.values)} rows retrieved")
+            if cache is not None:
+                cache.set(self.id, self.sheet_range, revision, self.values)
         except HttpError as error:
             logger.error(f"An error occurred: {error}")
         
-    def process_master_schedule(self,town_team) -> None:
+    def group_by_town(self):
+        """Rows by lower case town in one pass, a game is listed under both
+        its home and away town."""
+        towns = {}
+        for row in self.values:
+            if len(row) < 6:
+                continue
+            home = str(row[3]).lower()
+            away = str(row[5]).lower()
+            towns.setdefault(home, []).append(row)
+            if away != home:
+                towns.setdefault(away, []).append(row)
+        return towns
+
+    def process_master_schedule(self, town_team, engine='pandas') -> None:
+        # engine 'python' is the original row by row loop, kept as the
+        # reference for the column-wise 'pandas' engine.
+        if engine == 'pandas':
+            se_games, referee_games = process_master_values(self.values,
+                                                            town_team)
+            self.se_games += se_games
+            self.referee_games += referee_games
+            return
+
         for row in self.values:
             # If the town matches and games are scheduled.
             if row[3].lower() == town_team and \
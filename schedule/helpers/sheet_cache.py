@@ -0,0 +1,55 @@
+"""Local cache of Google Sheets values, keyed by spreadsheet id and range"""
+from hashlib import sha256
+from os import (makedirs, replace)
+from os.path import (exists, expanduser, join)
+from time import time
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHEET_CACHE = '~/.cache/schedule/sheets'
+
+
+def get_sheet_key(spreadsheet_id, sheet_range):
+    return sha256(f"{spreadsheet_id}|{sheet_range}".encode()).hexdigest()
+
+
+class SheetCache():
+    def __init__(self, directory) -> None:
+        self.directory = expanduser(directory)
+
+    def get_file_name(self, spreadsheet_id, sheet_range):
+        return join(self.directory,
+                    f"{get_sheet_key(spreadsheet_id, sheet_range)}.json")
+
+    def get(self, spreadsheet_id, sheet_range):
+        """The cached entry, {'revision', 'fetched_at', 'values'}, or None."""
+        file_name = self.get_file_name(spreadsheet_id, sheet_range)
+        try:
+            with open(file_name, mode='r') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as error:
+            logger.warning(f"Ignoring unreadable sheet cache {file_name}: {error}")
+            return None
+
+    def set(self, spreadsheet_id, sheet_range, revision, values) -> None:
+        file_name = self.get_file_name(spreadsheet_id, sheet_range)
+        entry = {
+            'spreadsheet_id': spreadsheet_id,
+            'range': sheet_range,
+            'revision': revision,
+            'fetched_at': time(),
+            'values': values
+        }
+        try:
+            if not exists(self.directory):
+                makedirs(self.directory, mode=0o700)
+            # Renamed into place so a reader never sees a partial file.
+            with open(f"{file_name}.tmp", mode='w') as file:
+                json.dump(entry, file)
+            replace(f"{file_name}.tmp", file_name)
+        except OSError as error:
+            logger.warning(f"Unable to write sheet cache {file_name}: {error}")
@@ -0,0 +1,94 @@
+"""Normalized team names and an n-gram index for suggesting near matches"""
+from functools import lru_cache
+import re
+
+NGRAM_SIZE = 3
+
+# Dice coefficient of the two names' n-grams, and of their team parts,
+# below which no suggestion is made.
+SUGGESTION_THRESHOLD = 0.5
+
+
+@lru_cache(maxsize=4096)
+def normalize_team(name):
+    # Case, spacing and punctuation don't separate teams, "Boston - 2",
+    # "boston 2" and "Boston-2" are the same team.
+    return re.sub(r'[^0-9a-z]+', '', str(name).lower())
+
+
+def get_team_part(name):
+    # The last word, "2" of "Boston-2". Every team of a town shares the
+    # town's n-grams, so the whole names of Hanover-3 and Hanover-7 are
+    # close, only the team part tells them apart.
+    words = re.findall(r'[0-9a-z]+', str(name).lower())
+    return words[-1] if words else ''
+
+
+def get_ngrams(key, size=NGRAM_SIZE):
+    padded = f" {key} "
+    return {padded[start:start + size]
+            for start in range(max(len(padded) - size + 1, 1))}
+
+
+def get_dice(first, second):
+    return 2 * len(first & second) / (len(first) + len(second))
+
+
+class TeamIndex():
+    def __init__(self, names=(), aliases=None) -> None:
+        # aliases maps a name used in one schedule to the name used in the
+        # other, {"Boston Blue": "Boston-1"}.
+        self.aliases = {normalize_team(alias): normalize_team(name)
+                        for alias, name in (aliases or {}).items()}
+        self.alias_names = {normalize_team(alias): name
+                            for alias, name in (aliases or {}).items()}
+        self.names = {}
+        self.key_ngrams = {}
+        self.team_ngrams = {}
+        self.ngrams = {}
+        for name in names:
+            self.add(name)
+
+    def get_key(self, name):
+        key = normalize_team(name)
+        return self.aliases.get(key, key)
+
+    def get_team_ngrams(self, name):
+        # An alias is scored by the team part of the name it stands for.
+        name = self.alias_names.get(normalize_team(name), name)
+        return get_ngrams(get_team_part(name))
+
+    def add(self, name) -> None:
+        key = self.get_key(name)
+        if key in self.names:
+            return
+        self.names[key] = name
+        self.key_ngrams[key] = get_ngrams(key)
+        self.team_ngrams[key] = self.get_team_ngrams(name)
+        for ngram in self.key_ngrams[key]:
+            self.ngrams.setdefault(ngram, set()).add(key)
+
+    def suggest(self, name, limit=3, threshold=SUGGESTION_THRESHOLD):
+        """[(name, score)] best first. Only names sharing an n-gram with
+        name are scored, not every name in the index. The score is the
+        Dice coefficient of the whole names' n-grams, and the team parts
+        must reach the threshold on their own, so Hanover-3 is never
+        suggested for Hanover-7."""
+        key = self.get_key(name)
+        if key in self.names:
+            return [(self.names[key], 1.0)]
+
+        ngrams = get_ngrams(key)
+        team_ngrams = self.get_team_ngrams(name)
+        shared = {}
+        for ngram in ngrams:
+            for candidate in self.ngrams.get(ngram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+
+        scores = []
+        for candidate, count in shared.items():
+            score = 2 * count / (len(ngrams) + len(self.key_ngrams[candidate]))
+            if score >= threshold and \
+               get_dice(team_ngrams, self.team_ngrams[candidate]) >= threshold:
+                scores.append((self.names[candidate], round(score, 3)))
+        return sorted(scores, key=lambda item: (-item[1], item[0]))[:limit]
@@ -0,0 +1,124 @@
+"""Cache of parsed town schedules keyed on workbook content and translations"""
+from hashlib import sha256
+from os import (listdir, makedirs, remove, replace)
+from os.path import (exists, expanduser, join)
+from time import time
+import gzip
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOWN_CACHE = '~/.cache/schedule/towns'
+
+# Part of every key, bump it when get_town_games output changes so old
+# entries are no longer used.
+CACHE_VERSION = 1
+
+COLUMNS = ['date', 'time', 'venue', 'sub_venue', 'age_group', 'gender',
+           'home_team']
+
+SUFFIX = '.json.gz'
+
+
+def get_file_hash(file_name):
+    digest = sha256()
+    with open(file_name, mode='rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TownScheduleCache():
+    def __init__(self, directory) -> None:
+        self.directory = expanduser(directory)
+
+    def get_key(self, file_name, fields, age_groups, town_name):
+        """Workbook content hash plus the translations the parse depends on,
+        so editing the translation file invalidates the entry."""
+        translations = json.dumps(
+            {'fields': fields, 'age_groups': age_groups, 'town': town_name,
+             'version': CACHE_VERSION}, sort_keys=True)
+        return sha256(f"{get_file_hash(file_name)}|{translations}".encode()).hexdigest()
+
+    def get_file_name(self, key):
+        return join(self.directory, f"{key}{SUFFIX}")
+
+    def read(self, file_name):
+        try:
+            with gzip.open(file_name, mode='rt') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError) as error:
+            logger.warning(f"Ignoring unreadable town schedule cache {file_name}: {error}")
+            return None
+
+    def get(self, key):
+        """(game_times, errors) or None when not cached."""
+        entry = self.read(self.get_file_name(key))
+        if entry is None:
+            return None
+        columns = entry['columns']
+        game_times = [dict(zip(COLUMNS, values))
+                      for values in zip(*[columns[column] for column in COLUMNS])]
+        return game_times, entry['errors']
+
+    def set(self, key, town_file, game_times, errors) -> None:
+        # Stored column-wise, the repeated venue, age group and date values
+        # compress well.
+        entry = {
+            'town_file': town_file,
+            'created': time(),
+            'games': len(game_times),
+            'columns': {column: [game[column] for game in game_times]
+                        for column in COLUMNS},
+            'errors': errors
+        }
+        file_name = self.get_file_name(key)
+        try:
+            if not exists(self.directory):
+                makedirs(self.directory, mode=0o700)
+            with gzip.open(f"{file_name}.tmp", mode='wt') as file:
+                json.dump(entry, file)
+            replace(f"{file_name}.tmp", file_name)
+        except OSError as error:
+            logger.warning(f"Unable to write town schedule cache {file_name}: {error}")
+
+    def entries(self):
+        """{'key', 'town_file', 'created', 'games'} per cached schedule,
+        oldest first."""
+        if not exists(self.directory):
+            return []
+        entries = []
+        for name in listdir(self.directory):
+            if not name.endswith(SUFFIX):
+                continue
+            entry = self.read(join(self.directory, name))
+            if entry is None:
+                continue
+            entries.append({'key': name[:-len(SUFFIX)],
+                            'town_file': entry['town_file'],
+                            'created': entry['created'],
+                            'games': entry['games']})
+        return sorted(entries, key=lambda entry: entry['created'])
+
+    def purge(self, older_than=None):
+        """Removes entries created more than older_than seconds ago, or all
+        of them, unreadable ones included, returns the number removed."""
+        if older_than is None:
+            keys = [name[:-len(SUFFIX)] for name in
+                    (listdir(self.directory) if exists(self.directory) else [])
+                    if name.endswith(SUFFIX)]
+        else:
+            keys = [entry['key'] for entry in self.entries()
+                    if entry['created'] <= time() - older_than]
+
+        removed = 0
+        for key in keys:
+            try:
+                remove(self.get_file_name(key))
+                removed += 1
+            except OSError as error:
+                logger.warning(f"Unable to remove {key}: {error}")
+        return removed
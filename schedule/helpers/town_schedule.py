@@ -1,9 +1,149 @@
+from concurrent.futures import ProcessPoolExecutor
 from datetime import (date, time)
+from os import cpu_count
+from os.path import getsize
+from openpyxl import load_workbook
+from openpyxl.reader.excel import ExcelReader
+try:
+    from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+except ImportError:
+    ReadOnlyWorksheet = None
+import numpy as np
 import pandas as pd
 import logging
+from .dates import (format_date, format_time)
 
 logger = logging.getLogger(__name__)
 
+# Smaller workbooks parse in a second or two, less than starting the
+# workers and reading the shared strings in each costs.
+POOL_MIN_BYTES = 1024 * 1024
+
+
+def is_header(row):
+    return "Division" in row and "Field" in row and "Time" in row
+
+
+def update_lookup(lookup, row) -> None:
+    col_cnt = 0
+    for col in row:
+        if isinstance(col, str):
+            if 'field' in col.lower():
+                lookup['field'] = col_cnt
+            if 'time' in col.lower():
+                lookup['time'] = col_cnt
+        if isinstance(col, date):
+            lookup['dates'][format_date(col)] = col_cnt
+        col_cnt += 1
+
+
+def get_code(uniques, value):
+    # Code of value in a factorized sheet, -2 matches no cell.
+    for code, unique in enumerate(uniques):
+        if isinstance(unique, str) and unique == value:
+            return code
+    return -2
+
+
+def iter_sheet_rows(sheet):
+    """Streams a worksheet's rows after its first non-empty row, the rows
+    pandas' parse returns once it has taken that row as the header."""
+    width = sheet.max_column
+    header_found = False
+    for row in sheet.iter_rows(values_only=True):
+        if not header_found:
+            header_found = any(cell is not None for cell in row)
+            continue
+        if width and len(row) < width:
+            row = row + (None,) * (width - len(row))
+        yield row
+
+
+class SheetReader(ExcelReader):
+    # load_workbook(read_only=True) builds every worksheet, and a read-only
+    # worksheet scans its whole XML for its size when the file has no
+    # dimension element. Only the sheets select(title, state) accepts are
+    # built here. This leans on openpyxl internals, checked against the
+    # pinned 3.0.10 and 3.1.5; open_workbook falls back to load_workbook
+    # when they're missing.
+    def __init__(self, file_name, select) -> None:
+        super().__init__(file_name, read_only=True, data_only=True,
+                         keep_links=False)
+        self.select = select
+
+    def get_sheets(self):
+        for sheet, rel in self.parser.find_sheets():
+            if rel.target in self.valid_files and "chartsheet" not in rel.Type \
+                    and self.select(sheet.name, sheet.state):
+                yield sheet, rel
+
+    def read_worksheets(self) -> None:
+        for sheet, rel in self.get_sheets():
+            worksheet = ReadOnlyWorksheet(self.wb, sheet.name, rel.target,
+                                          self.shared_strings)
+            worksheet.sheet_state = sheet.state
+            self.wb._sheets.append(worksheet)
+
+
+def load_selected(file_name, select):
+    # The public, slower path, every sheet is built and the others dropped.
+    workbook = load_workbook(file_name, read_only=True, data_only=True,
+                             keep_links=False)
+    for sheet in list(workbook.worksheets):
+        if not select(sheet.title, sheet.sheet_state):
+            workbook.remove(sheet)
+    return workbook
+
+
+def open_workbook(file_name, select):
+    """Read-only workbook holding only the selected sheets."""
+    if ReadOnlyWorksheet is not None:
+        reader = None
+        try:
+            reader = SheetReader(file_name, select)
+            reader.read()
+            return reader.wb
+        except (AttributeError, TypeError) as error:
+            if reader is not None:
+                reader.archive.close()
+            logger.warning(f"Reading {file_name} with load_workbook: {error}")
+    return load_selected(file_name, select)
+
+
+def get_sheet_titles(file_name, select):
+    """Titles of the selected sheets, without reading any sheet."""
+    if ReadOnlyWorksheet is not None:
+        reader = None
+        try:
+            reader = SheetReader(file_name, select)
+            reader.read_manifest()
+            reader.read_workbook()
+            return [sheet.name for sheet, _ in reader.get_sheets()]
+        except (AttributeError, TypeError) as error:
+            logger.warning(f"Reading {file_name} with load_workbook: {error}")
+        finally:
+            if reader is not None:
+                reader.archive.close()
+    workbook = load_selected(file_name, select)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+
+def parse_town_sheet(file_name, title, fields, town_name, age_groups):
+    """Games and errors of one sheet, run in a worker process. Only that
+    sheet is read, so the workers split the workbook between them."""
+    town_schedule = TownSchedule(file_name, fields, town_name, age_groups)
+    errors = []
+    workbook = open_workbook(file_name, lambda name, state: name == title)
+    try:
+        game_times = town_schedule.get_town_games(
+            iter_sheet_rows(workbook[title]), age_groups[title.lower()], errors)
+    finally:
+        workbook.close()
+    return game_times, errors
+
 
 class TownSchedule():
     def __init__(self, file_name, fields, town_name, age_groups) -> None:
@@ -12,21 +152,109 @@ class TownSchedule():
         self.town_name = town_name
         self.age_groups = age_groups
         self.game_times = []
+        # Sheet title to the errors reported while parsing it.
+        self.errors = {}
+
+
+    def read_town_spreadsheet(self, streaming=True, workers=None,
+                              cache=None) -> None:
+        # A cached parse of the same workbook and translations is used
+        # without opening the workbook.
+        if cache is None:
+            self.parse_town_spreadsheet(streaming, workers)
+            return
+
+        key = cache.get_key(self.file_name, self.fields, self.age_groups,
+                            self.town_name)
+        cached = cache.get(key)
+        if cached is not None:
+            game_times, self.errors = cached
+            self.game_times += game_times
+            logger.info(f"{len(game_times)} games for {self.file_name} loaded from cache")
+            # Reported again, so a rerun shows the same problems as the parse.
+            for title, errors in self.errors.items():
+                if errors:
+                    logging.error(f"{len(errors)} errors in sheet {title} of "
+                                  f"{self.file_name}, from the cached parse")
+                for message in errors:
+                    logging.error(message)
+            return
+
+        self.parse_town_spreadsheet(streaming, workers)
+        cache.set(key, self.file_name, self.game_times, self.errors)
+
+    def parse_town_spreadsheet(self, streaming=True, workers=None) -> None:
+        # Streaming opens the workbook read-only and checks each sheet's
+        # title and visibility before reading any of its rows, which are
+        # fed to get_town_games one at a time. The sheets are parsed in a
+        # process pool only when get_sheet_workers allows more than one.
+        if not streaming:
+            self.read_town_spreadsheet_pandas()
+            return
+
+        titles = None
+        workers = self.get_sheet_workers(workers)
+        if workers > 1:
+            titles = get_sheet_titles(self.file_name, self.is_town_sheet)
+        if titles is None or len(titles) <= 1:
+            workbook = open_workbook(self.file_name, self.is_town_sheet)
+            try:
+                for sheet in workbook.worksheets:
+                    errors = self.errors.setdefault(sheet.title, [])
+                    age_group = self.age_groups[sheet.title.lower()]
+                    self.game_times += self.get_town_games(
+                        iter_sheet_rows(sheet), age_group, errors)
+            finally:
+                workbook.close()
+            return
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(titles))) as executor:
+            futures = [executor.submit(parse_town_sheet, self.file_name, title,
+                                       self.fields, self.town_name,
+                                       self.age_groups)
+                       for title in titles]
+            # Merged in sheet order, whichever finishes first.
+            for title, future in zip(titles, futures):
+                try:
+                    game_times, errors = future.result()
+                except Exception as error:
+                    logging.error(f"Sheet {title} could not be parsed: {error}")
+                    game_times, errors = [], [str(error)]
+                self.game_times += game_times
+                self.errors[title] = errors
 
+    def get_sheet_workers(self, workers):
+        """Processes for the sheets, 1 unless the pool can pay for itself:
+        never more than the CPUs, and only for a large workbook."""
+        if workers is None or workers <= 1:
+            return 1
+        workers = min(workers, cpu_count() or 1)
+        if workers > 1 and getsize(self.file_name) < POOL_MIN_BYTES:
+            return 1
+        return workers
 
-    def read_town_spreadsheet(self) -> None:
+    def is_town_sheet(self, title, state):
+        return title.lower() in self.age_groups and state == 'visible'
+
+    def read_town_spreadsheet_pandas(self) -> None:
         df = pd.ExcelFile(self.file_name)
 
         for sheet in df.book.worksheets:
-            if sheet.title.lower() in list(self.age_groups.keys()) and \
+            if sheet.title.lower() in self.age_groups and \
                 sheet.sheet_state == 'visible':
                 age_group = self.age_groups[sheet.title.lower()]
                 self.game_times += self.get_town_games(
-                    df.parse(sheet.title).values, age_group)
+                    df.parse(sheet.title).values, age_group,
+                    self.errors.setdefault(sheet.title, []))
+
+    def get_town_games(self, rows, age_group, errors=None, engine='pandas'):
+        # engine 'python' is the original row by row loop, kept as the
+        # reference for the column-wise 'pandas' engine.
+        if engine == 'pandas':
+            return self.get_town_games_frame(rows, age_group, errors)
 
-    def get_town_games(self, rows, age_group):
-    # lookup is used to map a field to a column number. This allows
-    # for the fields to be in different column in each sheet.
+        # lookup is used to map a field to a column number. This allows
+        # for the fields to be in different column in each sheet.
         lookup = {
             'field': 0,
             'time': 0,
@@ -36,42 +264,185 @@ class TownSchedule():
         found_games = False
 
         for row in rows:
-            if "Division" in row and "Field" in row and "Time" in row:
+            if is_header(row):
                 found_games = True
-                col_cnt = 0
-                for col in row:
-                    if isinstance(col, str):
-                        if 'field' in col.lower():
-                            lookup['field'] = col_cnt
-                        if 'time' in col.lower():
-                            lookup['time'] = col_cnt
-                    if isinstance(col, date):
-                        lookup['dates'][col.strftime("%m/%d/%Y")] = col_cnt
-                    col_cnt += 1
+                update_lookup(lookup, row)
 
-            try:
-                if found_games and isinstance(row[lookup['time']], time):
-                    for col in lookup['dates'].keys():
-                        if isinstance(row[lookup['dates'][col]], str) and \
-                            'NO GAME' not in row[lookup['dates'][col]] and \
-                            'BYE' not in row[lookup['dates'][col]]:
-                            gender_team = row[lookup['dates'][col]].split()
-                            if gender_team[0].strip() == "B":
-                                gender = "Boys"
-                            else:
-                                gender = "Girls"
-                            game_times.append({
-                                'date': col,
-                                'time': row[lookup['time']].strftime("%I:%M %p"),
-                                'venue': self.fields[row[lookup['field']]]['venue'],
-                                'sub_venue': self.fields[row[lookup['field']]]['sub-venue'],
-                                'age_group': age_group,
-                                'gender': gender,
-                                'home_team': f"{self.town_name.title()}-{gender_team[2].strip()}"
-                            })
-            except IndexError:
-                logging.error(f"IndexError reported for {row}")
-            except KeyError as ke:
-                logging.error(f"KeyError: {ke} for {row}. An IndexError was probably reported as well")
+            if found_games:
+                self.add_row_games(row, lookup, age_group, game_times, errors)
+
+        return game_times
+
+    def add_row_games(self, row, lookup, age_group, game_times, errors=None) -> None:
+        try:
+            if isinstance(row[lookup['time']], time):
+                for col in lookup['dates'].keys():
+                    if isinstance(row[lookup['dates'][col]], str) and \
+                        'NO GAME' not in row[lookup['dates'][col]] and \
+                        'BYE' not in row[lookup['dates'][col]]:
+                        gender_team = row[lookup['dates'][col]].split()
+                        if gender_team[0].strip() == "B":
+                            gender = "Boys"
+                        else:
+                            gender = "Girls"
+                        game_times.append({
+                            'date': col,
+                            'time': format_time(row[lookup['time']]),
+                            'venue': self.fields[row[lookup['field']]]['venue'],
+                            'sub_venue': self.fields[row[lookup['field']]]['sub-venue'],
+                            'age_group': age_group,
+                            'gender': gender,
+                            'home_team': f"{self.town_name.title()}-{gender_team[2].strip()}"
+                        })
+        except IndexError:
+            message = f"IndexError reported for {row}"
+            logging.error(message)
+            if errors is not None:
+                errors.append(message)
+        except KeyError as ke:
+            message = f"KeyError: {ke} for {row}. An IndexError was probably reported as well"
+            logging.error(message)
+            if errors is not None:
+                errors.append(message)
+
+    def get_town_games_frame(self, rows, age_group, errors=None):
+        """get_town_games with the header rows found once and the date
+        columns of each block of time rows melted into one long column.
+        The sheet is factorized so the string, field and time work is done
+        once per distinct cell value. Rows the column-wise path can't
+        reproduce exactly, an unknown field, a malformed team or a short
+        row, go through add_row_games so their games and errors match."""
+        rows = list(rows)
+        if not rows:
+            return []
+
+        lengths = np.fromiter((len(row) for row in rows), dtype=np.int64,
+                              count=len(rows))
+        cells = np.full((len(rows), lengths.max()), None, dtype=object)
+        for position, row in enumerate(rows):
+            cells[position, :len(row)] = list(row)
+        codes, uniques = pd.factorize(cells.ravel())
+        codes = codes.reshape(cells.shape)
+        # Empty cells are coded -1, the extra None makes them index the end.
+        uniques = list(uniques) + [None]
+
+        header = np.ones(len(rows), dtype=bool)
+        for name in ('Division', 'Field', 'Time'):
+            header &= (codes == get_code(uniques, name)).any(axis=1)
+        headers = np.flatnonzero(header)
+
+        lookup = {
+            'field': 0,
+            'time': 0,
+            'dates': {}
+        }
+        game_times = []
+        for number, position in enumerate(headers):
+            update_lookup(lookup, rows[position])
+            stop = headers[number + 1] if number + 1 < len(headers) else len(rows)
+            game_times += self.get_block_games(
+                rows, codes, uniques, lengths, position, stop, lookup,
+                age_group, errors)
+
+        return game_times
+
+    def get_block_games(self, rows, codes, uniques, lengths, start, stop,
+                        lookup, age_group, errors):
+        """Games from rows start to stop, a header row and the rows up to
+        the next one."""
+        time_col = lookup['time']
+        field_col = lookup['field']
+        dates = list(lookup['dates'].keys())
+        date_cols = [lookup['dates'][col] for col in dates]
+
+        # Short rows raise IndexError in add_row_games, which reports them.
+        widest = max([time_col, field_col] + date_cols)
+        positions = np.arange(start, stop)
+        short = lengths[start:stop] <= widest
+        fallback = set(positions[short].tolist())
+        is_time = np.array([isinstance(value, time) for value in uniques])
+        positions = positions[~short & is_time[codes[start:stop, time_col]]]
+        if not len(positions) or not dates:
+            return self.get_fallback_games(rows, sorted(fallback), lookup,
+                                           age_group, errors)
+
+        # Each distinct date cell is split once, a game is a string without
+        # NO GAME or BYE.
+        game = np.zeros(len(uniques), dtype=bool)
+        malformed = np.zeros(len(uniques), dtype=bool)
+        genders = [None] * len(uniques)
+        teams = [None] * len(uniques)
+        for code, value in enumerate(uniques):
+            if isinstance(value, str) and 'NO GAME' not in value and \
+                    'BYE' not in value:
+                game[code] = True
+                gender_team = value.split()
+                if len(gender_team) < 3:
+                    malformed[code] = True
+                    continue
+                genders[code] = "Boys" if gender_team[0] == "B" else "Girls"
+                teams[code] = f"{self.town_name.title()}-{gender_team[2]}"
 
+        # Long form, one entry per row and date in row then date order.
+        date_codes = codes[positions][:, date_cols].ravel()
+        game_cells = np.flatnonzero(game[date_codes])
+        cell_codes = date_codes[game_cells]
+        row_of_cell = game_cells // len(dates)
+
+        # A malformed team or an unknown field on any game sends the whole
+        # row to add_row_games.
+        field_codes = codes[positions, field_col]
+        known = np.array([self.is_known_field(value) for value in uniques])
+        bad_rows = np.union1d(row_of_cell[malformed[cell_codes]],
+                              row_of_cell[~known[field_codes[row_of_cell]]])
+        fallback |= set(positions[bad_rows].tolist())
+        keep = ~np.isin(row_of_cell, bad_rows)
+        game_cells = game_cells[keep]
+        cell_codes = cell_codes[keep]
+        row_of_cell = row_of_cell[keep]
+
+        # The sheet is already factorized, so each distinct time is
+        # formatted once and spread back over the games by its code.
+        time_codes = codes[positions, time_col][row_of_cell].tolist()
+        labels = {code: format_time(uniques[code]) for code in set(time_codes)}
+        time_strings = [labels[code] for code in time_codes]
+        venues = {code: self.fields[uniques[code]]
+                  for code in set(field_codes[row_of_cell].tolist())}
+        game_times = [{
+            'date': dates[cell % len(dates)],
+            'time': time_string,
+            'venue': venues[field_code]['venue'],
+            'sub_venue': venues[field_code]['sub-venue'],
+            'age_group': age_group,
+            'gender': genders[code],
+            'home_team': teams[code]
+        } for cell, code, time_string, field_code in zip(
+            game_cells.tolist(), cell_codes.tolist(), time_strings,
+            field_codes[row_of_cell].tolist())]
+
+        if not fallback:
+            return game_times
+
+        # The fallback rows' games go back in row order.
+        game_rows = positions[row_of_cell]
+        merged = []
+        done = 0
+        for position in sorted(fallback):
+            cut = int(np.searchsorted(game_rows, position))
+            merged += game_times[done:cut]
+            self.add_row_games(rows[position], lookup, age_group, merged, errors)
+            done = cut
+        return merged + game_times[done:]
+
+    def get_fallback_games(self, rows, positions, lookup, age_group, errors):
+        game_times = []
+        for position in positions:
+            self.add_row_games(rows[position], lookup, age_group, game_times,
+                               errors)
         return game_times
+
+    def is_known_field(self, field):
+        try:
+            return field in self.fields
+        except TypeError:
+            return False
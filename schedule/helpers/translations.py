@@ -0,0 +1,198 @@
+"""Translation file compiled once into validated, case-normalized lookups"""
+from os import (replace, stat)
+import logging
+import pickle
+from .utils import load_translation_file
+
+logger = logging.getLogger(__name__)
+
+# Part of every cache file, bump it when the compiled form changes.
+CACHE_VERSION = 1
+
+CACHE_SUFFIX = '.cache'
+
+FIELD_KEYS = ('venue', 'sub-venue')
+
+
+def normalize_key(value):
+    return value.strip().casefold() if isinstance(value, str) else value
+
+
+class LookupMap(dict):
+    # String keys are stored and looked up normalized, so "FFP1 ", "ffp1"
+    # and "FFP1" find the same field.
+    def __getitem__(self, key):
+        return super().__getitem__(normalize_key(key))
+
+    def __contains__(self, key):
+        try:
+            return super().__contains__(normalize_key(key))
+        except TypeError:
+            return False
+
+    def get(self, key, default=None):
+        return super().get(normalize_key(key), default)
+
+
+class Translations():
+    def __init__(self, contents=None) -> None:
+        # age_groups is None when the file has no age_groups section, fields
+        # and team_aliases are keyed by lower case town.
+        self.age_groups = None
+        self.fields = {}
+        self.team_aliases = {}
+        self.errors = []
+        self.warnings = []
+        if contents is not None:
+            self.compile(contents)
+
+    def compile(self, contents) -> None:
+        if not isinstance(contents, dict):
+            self.errors.append('The translation file must be a JSON object')
+            return
+
+        if 'age_groups' in contents:
+            self.age_groups = self.get_map('age_groups', contents['age_groups'])
+
+        towns = self.get_map('fields', contents.get('fields', {}))
+        for town, fields in towns.items():
+            self.fields[town] = self.get_map(f"fields {town}", fields)
+            for name, field in self.fields[town].items():
+                self.check_field(town, name, field)
+
+        aliases = self.get_map('team_aliases', contents.get('team_aliases', {}))
+        for town, town_aliases in aliases.items():
+            if town not in self.fields:
+                self.warnings.append(f"team_aliases {town} has no field translations")
+            if isinstance(town_aliases, dict):
+                self.team_aliases[town] = dict(town_aliases)
+            else:
+                self.errors.append(f"team_aliases {town} must map team names to team names")
+
+    def get_map(self, section, values):
+        """values as a LookupMap, names differing only in case or spacing
+        are an error unless they translate to the same value."""
+        lookup = LookupMap()
+        if not isinstance(values, dict):
+            self.errors.append(f"{section} must be a JSON object")
+            return lookup
+
+        names = {}
+        for name, value in values.items():
+            key = normalize_key(name)
+            if key in names and lookup[key] != value:
+                self.errors.append(f"{section} {names[key]} and {name} differ only "
+                                   "in case or spacing")
+                continue
+            names.setdefault(key, name)
+            dict.__setitem__(lookup, key, value)
+        return lookup
+
+    def check_field(self, town, name, field) -> None:
+        if not isinstance(field, dict):
+            self.errors.append(f"fields {town} {name} must have a venue and sub-venue")
+            return
+        for key in FIELD_KEYS:
+            if not field.get(key):
+                self.errors.append(f"fields {town} {name} is missing its {key}")
+        unknown = sorted(set(field) - set(FIELD_KEYS))
+        if unknown:
+            self.warnings.append(f"fields {town} {name} has unknown keys {', '.join(unknown)}")
+
+    def get_town(self, town):
+        """The town's field LookupMap or None."""
+        return self.fields.get(normalize_key(town))
+
+    def get_team_aliases(self, town):
+        return self.team_aliases.get(normalize_key(town))
+
+    def to_dict(self):
+        # Plain dicts, so the cache doesn't depend on this module's path.
+        return {
+            'age_groups': None if self.age_groups is None else dict(self.age_groups),
+            'fields': {town: dict(fields) for town, fields in self.fields.items()},
+            'team_aliases': self.team_aliases
+        }
+
+    @classmethod
+    def from_dict(cls, compiled):
+        translations = cls()
+        if compiled['age_groups'] is not None:
+            translations.age_groups = LookupMap(compiled['age_groups'])
+        translations.fields = {town: LookupMap(fields)
+                               for town, fields in compiled['fields'].items()}
+        translations.team_aliases = compiled['team_aliases']
+        return translations
+
+
+def get_translations(translations):
+    # Compiles a raw translation dict, a compiled one is returned as is.
+    if isinstance(translations, Translations):
+        return translations
+    return Translations(translations)
+
+
+def read_cache(cache_file, source):
+    try:
+        with open(cache_file, mode='rb') as file:
+            entry = pickle.load(file)
+        if entry['version'] == CACHE_VERSION and entry['source'] == source:
+            return Translations.from_dict(entry['translations'])
+    except FileNotFoundError:
+        pass
+    except (OSError, EOFError, pickle.PickleError, KeyError, TypeError,
+            AttributeError, ValueError) as error:
+        logger.warning(f"Ignoring unreadable translation cache {cache_file}: {error}")
+    return None
+
+
+def write_cache(cache_file, source, translations) -> None:
+    entry = {
+        'version': CACHE_VERSION,
+        'source': source,
+        'translations': translations.to_dict()
+    }
+    try:
+        with open(f"{cache_file}.tmp", mode='wb') as file:
+            pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+        replace(f"{cache_file}.tmp", cache_file)
+    except OSError as error:
+        logger.warning(f"Unable to write translation cache {cache_file}: {error}")
+
+
+def load_translations(file_name, use_cache=True):
+    """Compiled translations and the exit code. The compiled form is cached
+    next to the file and used while the file's size and modification time
+    are unchanged."""
+    try:
+        status = stat(file_name)
+    except FileNotFoundError as fe:
+        logging.error(f"{fe.strerror}: {fe.filename}")
+        return None, 66
+    source = (status.st_mtime_ns, status.st_size)
+    cache_file = f"{file_name}{CACHE_SUFFIX}"
+
+    if use_cache:
+        translations = read_cache(cache_file, source)
+        if translations is not None:
+            return translations, 0
+
+    try:
+        contents, rc = load_translation_file(file_name)
+    except ValueError as error:
+        logging.error(f"Translation file {file_name} is not valid JSON: {error}")
+        return None, 88
+    if rc:
+        return None, rc
+
+    translations = Translations(contents)
+    for warning in translations.warnings:
+        logging.warning(warning)
+    if translations.errors:
+        for error in translations.errors:
+            logging.error(error)
+        return None, 88
+
+    if use_cache:
+        write_cache(cache_file, source, translations)
+    return translations, 0
@@ -56,14 +56,18 @@ def get_environment():
 
 def get_arguments(args):
     arguments = {
-        'town_file': None, 'town': None
+        'town_file': None, 'town': None, 'offline': False, 'manifest': None,
+        'workers': None, 'cache_command': None
     }
 
-    USAGE='USAGE: schedule.py -s <town schedule file> -t <town>'
+    USAGE='USAGE: schedule.py -s <town schedule file> -t <town>' \
+    ' | -m <manifest file> [-w <workers>] [--offline]' \
+    ' | --list-cache | --purge-cache'
 
     try:
-        opts, args = getopt(args,"hs:t:",
-                            ["town-file=","town="])
+        opts, args = getopt(args,"hs:t:m:w:",
+                            ["town-file=","town=","offline","manifest=",
+                             "workers=","list-cache","purge-cache"])
     except GetoptError:
         logging.error(USAGE)
         return 77, arguments
@@ -76,6 +80,28 @@ def get_arguments(args):
             arguments['town_file'] = arg
         elif opt in ("-t", "--town"):
             arguments['town'] = arg.lower()
+        elif opt == "--offline":
+            arguments['offline'] = True
+        elif opt in ("-m", "--manifest"):
+            arguments['manifest'] = arg
+        elif opt in ("-w", "--workers"):
+            arguments['workers'] = arg
+        elif opt == "--list-cache":
+            arguments['cache_command'] = 'list'
+        elif opt == "--purge-cache":
+            arguments['cache_command'] = 'purge'
+
+    if arguments['workers'] is not None:
+        try:
+            arguments['workers'] = int(arguments['workers'])
+            if arguments['workers'] < 1:
+                raise ValueError
+        except ValueError:
+            logging.error(f"Workers value, {arguments['workers']} is invalid")
+            return 88, arguments
+    if arguments['manifest'] is not None or \
+       arguments['cache_command'] is not None:
+        return 0, arguments
     if arguments['town'] is None or arguments['town_file'] is None:
         logging.error(USAGE)
         return 99, arguments
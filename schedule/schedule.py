@@ -2,75 +2,99 @@ from os import environ
 from sys import (argv, exit, stdout)
 from dotenv import load_dotenv
 from datetime import datetime
-import pandas as pd
 import logging
-from helpers.utils import (get_arguments, get_environment,
-                           load_translation_file)
+from helpers.utils import (get_arguments, get_environment)
 from helpers.master_schedule import MasterSchedule
-from helpers.town_schedule import TownSchedule
+from helpers.sheet_cache import (SheetCache, DEFAULT_SHEET_CACHE)
+from helpers.town_cache import (TownScheduleCache, DEFAULT_TOWN_CACHE)
+from helpers.translations import load_translations
+from helpers.batch import (load_manifest, get_town_translations,
+                           process_town, run_batch)
 
 load_dotenv()
 
 logging.basicConfig(stream=stdout,
                     level=int(environ['LOG_LEVEL']))
 
+def get_sheet_cache():
+    # MASTER_SCHEDULE_CACHE set to an empty value turns caching off.
+    directory = environ.get('MASTER_SCHEDULE_CACHE', DEFAULT_SHEET_CACHE)
+    if not directory:
+        return None
+    return SheetCache(directory)
+
+def get_town_cache():
+    # TOWN_SCHEDULE_CACHE set to an empty value turns caching off.
+    directory = environ.get('TOWN_SCHEDULE_CACHE', DEFAULT_TOWN_CACHE)
+    if not directory:
+        return None
+    return TownScheduleCache(directory)
+
+def run_cache_command(command):
+    town_cache = get_town_cache()
+    if town_cache is None:
+        logging.error('TOWN_SCHEDULE_CACHE is disabled')
+        return 66
+
+    if command == 'list':
+        for entry in town_cache.entries():
+            created = datetime.fromtimestamp(entry['created']).isoformat(timespec='seconds')
+            print(f"{entry['key'][:12]} - {created} - {entry['games']} games - {entry['town_file']}")
+    else:
+        logging.info(f"{town_cache.purge()} cached town schedules removed")
+    return 0
+
 def main():
     rc, args = get_arguments(argv[1:])
     if rc:
         exit(rc)
 
+    if args['cache_command'] is not None:
+        exit(run_cache_command(args['cache_command']))
+
     rc, environment = get_environment()
     if rc:
         exit(rc)
 
-    translations, rc = load_translation_file(environment['translation_file'])
+    # TRANSLATION_CACHE set to an empty value turns the compiled cache off.
+    translations, rc = load_translations(environment['translation_file'],
+                                         use_cache=bool(environ.get('TRANSLATION_CACHE', '1')))
     if rc:
         exit(rc)
 
-    try:
-        fields = translations['fields'][args['town'].lower()]
-    except KeyError:
-        logging.error(f"No field translations found for {args['town']}")
-        exit(55)
+    if args['manifest'] is not None:
+        manifest, rc = load_manifest(args['manifest'])
+        if rc:
+            exit(rc)
+    else:
+        manifest = [{'town': args['town'], 'town_file': args['town_file']}]
 
-    try:
-        age_groups = translations['age_groups']
-    except KeyError:
-        logging.error(f"No Team mappings found for {args['town']}")
-        exit(55)
+    # Translations are checked before the master schedule is downloaded.
+    for entry in manifest:
+        _, _, rc = get_town_translations(translations, entry['town'])
+        if rc:
+            exit(rc)
 
     master_schedule = MasterSchedule(environment['spreadsheet_id'],
                                      environment['range_name'])
-    master_schedule.load_sheet()
-    master_schedule.process_master_schedule(args['town'].lower())
-
-    town_schedule = TownSchedule(args['town_file'], fields,
-                                 args['town'].lower(), age_groups)
-
-    town_schedule.read_town_spreadsheet()
-
-    assignor_header = [
-        'Game ID', 'Date', 'Start Time', 'Venue', 'Sub-Venue',
-        'Age Group', 'League', 'Gender', 'Game Type',
-        'Home Team', 'Away Team'
-    ]
-   
-    panda_referee_schedule = pd.DataFrame.from_dict(master_schedule.referee_games)
-    panda_town_schedule = pd.DataFrame.from_dict(town_schedule.game_times)
-
-    panda_referee_schedule = pd.merge(
-        panda_town_schedule, panda_referee_schedule, how='inner',
-        on=['age_group', 'date', 'gender', 'home_team'],
-        validate="1:1"
-    )
+    master_schedule.load_sheet(cache=get_sheet_cache(),
+                               offline=args['offline'])
+    if master_schedule.values is None:
+        exit(66)
 
     str_date = datetime.now().strftime('%Y%m%d%H%M')
-    panda_referee_schedule.to_csv(
-        f"{environment['output_file_prefix']}-{str_date}",
-        header=assignor_header, columns=['game_id',
-        'date', 'time', 'venue', 'sub_venue', 'age_group', 'league',
-        'gender', 'game_type', 'home_team', 'away_team'], index=False
-    )
+    if args['manifest'] is not None:
+        rc = run_batch(manifest, master_schedule, translations,
+                       environment['output_file_prefix'], str_date,
+                       workers=args['workers'], town_cache=get_town_cache())
+    else:
+        rc = process_town(args['town'], args['town_file'],
+                          master_schedule.values, translations,
+                          f"{environment['output_file_prefix']}-{str_date}",
+                          sheet_workers=args['workers'],
+                          town_cache=get_town_cache())
+    if rc:
+        exit(rc)
 
 if __name__ == "__main__":
     main()
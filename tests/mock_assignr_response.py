@@ -5,6 +5,7 @@ def mocked_requests_get(*args, **kwargs):
         def __init__(self, json_data, status_code):
             self.json_data = json_data
             self.status_code = status_code
+            self.headers = {}
 
         def json(self):
             return self.json_data
@@ -25,8 +26,26 @@ def mocked_requests_get(*args, **kwargs):
         }
     }
 
-    if args[0] == 'http://test.com/api/v2/users/test/availability':
+    if args[0] == 'http://test.com/api/v2/users/paged/availability':
+        page = kwargs['params'].get('page', 1)
+        return MockResponse({
+            'page': {'records': 5, 'pages': 3, 'current_page': page,
+                     'limit': kwargs['params'].get('limit', 2)},
+            '_embedded': {
+                'availability': [
+                    {'id': record, 'date': f'2023-01-0{record}', 'all_day': True}
+                    for record in range(page * 2 - 1, min(page * 2, 5) + 1)
+                ]
+            }
+        }, 200)
+    elif args[0] == 'http://test.com/api/v2/users/error/availability':
+        return MockResponse(None, 500)
+    elif args[0] == 'http://test.com/api/v2/users/test/availability':
         return MockResponse(valid_response, 200)
+    elif args[0] == 'http://test.com/api/v2/users/expired/availability':
+        if kwargs['headers']['authorization'] == 'Bearer validtoken':
+            return MockResponse(valid_response, 200)
+        return MockResponse({'error': 'invalid_token'}, 401)
     elif args[0] == 'http://fail.com/api/v2/users/test/availability':
         return MockResponse(invalid_response, 200)
     elif args[0] == 'http://test.com/api/v2/users/invaliduser/availability':
@@ -38,12 +57,13 @@ def mocked_requests_post(*args, **kwargs):
         def __init__(self, json_data, status_code):
             self.json_data = json_data
             self.status_code = status_code
+            self.headers = {}
 
         def json(self):
             return self.json_data
 
     if args[0] == 'http://test.com/oauth/valid':
-        return MockResponse({"access_token": "validtoken"}, 200)
+        return MockResponse({"access_token": "validtoken", "expires_in": 7200}, 200)
     elif args[0] == 'http://test.com/oauth/invalid':
         return MockResponse({"no_token": "no token"}, 200)
 
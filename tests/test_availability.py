@@ -3,20 +3,39 @@ import os
 from datetime import datetime
 from unittest import TestCase
 import pytest
-from unittest.mock import patch
+from unittest.mock import (patch, MagicMock)
 import pandas as pd
 from assignr.availability import (get_arguments, authenticate,
-                                  get_availability, get_referees, main)
+                                  get_availability, get_all_availability,
+                                  get_referees, iter_referees,
+                                  sync_availability,
+                                  get_shards, get_sharded_availability_records,
+                                  get_rate_limiter, get_requests,
+                                  PAGE_WORKERS, SHARD_WORKERS, main)
+from assignr.helpers.token_cache import (TokenCache, get_token_key)
+from assignr.helpers.availability_cache import AvailabilityCache
+from assignr.helpers.client import AssignrError
 from mock_assignr_response import (mocked_requests_post, mocked_requests_get)
 
 USAGE='USAGE: availability.py -s <start-date> -e <end-date>' \
-' FORMAT=MM/DD/YYYY'
+' [-w <workers>] [-p <page-size>] [--no-cache] [--refresh] [--sync]' \
+' [-f text|jsonl|csv|parquet] [-o <output-file>]' \
+' [--shard week|month|<days>] [-r <id>,<id>] [-n <name-pattern>]' \
+' [--metrics] [--metrics-file <file.json|file.prom>] FORMAT=MM/DD/YYYY'
+
+DEFAULT_ARGS = {
+    'start_date': None, 'end_date': None, 'workers': 1, 'page_size': None,
+    'cache': True, 'refresh': False, 'sync': False, 'output_format': 'text',
+    'output_file': None, 'shard': None, 'referee_ids': None,
+    'name_pattern': None, 'metrics': False, 'metrics_file': None
+}
 
 TEST_DATE='01/01/2023'
 
 @pytest.fixture(autouse=True)
-def mock_settings_env_vars():
+def mock_settings_env_vars(tmp_path):
     with patch.dict(os.environ, {
+        "TOKEN_CACHE": str(tmp_path / 'token.json'),
         "CLIENT_ID": "clientid",
         "CLIENT_SECRET": "clientsecret",
         "CLIENT_SCOPE": "read write",
@@ -28,9 +47,7 @@ def mock_settings_env_vars():
 
 class TestGetArguments(TestCase):
     def test_help(self):
-        expected_args = {
-            'start_date': None, 'end_date': None
-        }
+        expected_args = {**DEFAULT_ARGS}
         with self.assertLogs(level='INFO') as cm:
             rc, args = get_arguments(['-h'])
         self.assertEqual(cm.output, [f"ERROR:root:{USAGE}"])
@@ -38,9 +55,7 @@ class TestGetArguments(TestCase):
         self.assertEqual(args, expected_args)
 
     def test_invalid_options(self):
-        expected_args = {
-            'start_date': None, 'end_date': None
-        }
+        expected_args = {**DEFAULT_ARGS}
         with self.assertLogs(level='INFO') as cm:
             rc, args = get_arguments(['-n'])
         self.assertEqual(cm.output, [f"ERROR:root:{USAGE}"])
@@ -48,9 +63,7 @@ class TestGetArguments(TestCase):
         self.assertEqual(args, expected_args)
         
     def test_missing_start_date(self):
-        expected_args = {
-            'start_date': None, 'end_date': TEST_DATE
-        }
+        expected_args = {**DEFAULT_ARGS, 'end_date': TEST_DATE}
         with self.assertLogs(level='INFO') as cm:
             rc, args = get_arguments(['-e', TEST_DATE])
         self.assertEqual(cm.output, [f"ERROR:root:{USAGE}"])
@@ -58,9 +71,7 @@ class TestGetArguments(TestCase):
         self.assertEqual(args, expected_args)
 
     def test_missing_end_date(self):
-        expected_args = {
-            'start_date': TEST_DATE, 'end_date': None
-        }
+        expected_args = {**DEFAULT_ARGS, 'start_date': TEST_DATE}
         with self.assertLogs(level='INFO') as cm:
             rc, args = get_arguments(['-s', TEST_DATE])
         self.assertEqual(cm.output, [f"ERROR:root:{USAGE}"])
@@ -71,6 +82,7 @@ class TestGetArguments(TestCase):
         INVALID_DATE = '01/10/ee'
 
         expected_args = {
+            **DEFAULT_ARGS,
             'start_date': INVALID_DATE, 'end_date': INVALID_DATE
         }
         with self.assertLogs(level='INFO') as cm:
@@ -87,21 +99,100 @@ class TestGetArguments(TestCase):
             '-s', '01/10/2023', '-e', '01/11/2023'
         ]
         expected_args = {
+            **DEFAULT_ARGS,
             'start_date': '01/10/2023', 'end_date': '01/11/2023'
         }
         rc, args = get_arguments(send_args)
         self.assertEqual(rc, 0)
         self.assertEqual(args, expected_args)
 
+    def test_workers(self):
+        rc, args = get_arguments(['-s', TEST_DATE, '-e', TEST_DATE,
+                                  '--workers', '8'])
+        self.assertEqual(rc, 0)
+        self.assertEqual(args['workers'], 8)
+
+    def test_page_size(self):
+        rc, args = get_arguments(['-s', TEST_DATE, '-e', TEST_DATE,
+                                  '--page-size', '500'])
+        self.assertEqual(rc, 0)
+        self.assertEqual(args['page_size'], 500)
+
+    def test_invalid_page_size(self):
+        with self.assertLogs(level='INFO') as cm:
+            rc, args = get_arguments(['-s', TEST_DATE, '-e', TEST_DATE,
+                                      '-p', 'big'])
+        self.assertEqual(cm.output, ["ERROR:root:Page Size value, big is invalid"])
+        self.assertEqual(rc, 88)
+
+    def test_cache_options(self):
+        rc, args = get_arguments(['-s', TEST_DATE, '-e', TEST_DATE,
+                                  '--no-cache', '--refresh'])
+        self.assertEqual(rc, 0)
+        self.assertFalse(args['cache'])
+        self.assertTrue(args['refresh'])
+
+    def test_output_options(self):
+        rc, args = get_arguments(['-s', TEST_DATE, '-e', TEST_DATE,
+                                  '-f', 'JSONL', '--output', 'out.jsonl'])
+        self.assertEqual(rc, 0)
+        self.assertEqual(args['output_format'], 'jsonl')
+        self.assertEqual(args['output_file'], 'out.jsonl')
+
+    def test_invalid_format(self):
+        with self.assertLogs(level='INFO') as cm:
+            rc, args = get_arguments(['-s', TEST_DATE, '-e', TEST_DATE,
+                                      '-f', 'xml'])
+        self.assertEqual(cm.output, ["ERROR:root:Format value, xml is invalid"])
+        self.assertEqual(rc, 88)
+
+    def test_shard(self):
+        rc, args = get_arguments(['-s', TEST_DATE, '-e', TEST_DATE,
+                                  '--shard', 'Week'])
+        self.assertEqual(rc, 0)
+        self.assertEqual(args['shard'], 'week')
+        rc, args = get_arguments(['-s', TEST_DATE, '-e', TEST_DATE,
+                                  '--shard', '10'])
+        self.assertEqual(rc, 0)
+        self.assertEqual(args['shard'], 10)
+
+    def test_invalid_shard(self):
+        with self.assertLogs(level='INFO') as cm:
+            rc, args = get_arguments(['-s', TEST_DATE, '-e', TEST_DATE,
+                                      '--shard', 'year'])
+        self.assertEqual(cm.output, ["ERROR:root:Shard value, year is invalid"])
+        self.assertEqual(rc, 88)
+
+    def test_roster_filters(self):
+        rc, args = get_arguments(['-s', TEST_DATE, '-e', TEST_DATE,
+                                  '-r', '1, 2', '--name', '*Simpson'])
+        self.assertEqual(rc, 0)
+        self.assertEqual(args['referee_ids'], ['1', '2'])
+        self.assertEqual(args['name_pattern'], '*Simpson')
+
+    def test_metrics_options(self):
+        rc, args = get_arguments(['-s', TEST_DATE, '-e', TEST_DATE,
+                                  '--metrics-file', 'metrics.prom'])
+        self.assertEqual(rc, 0)
+        self.assertTrue(args['metrics'])
+        self.assertEqual(args['metrics_file'], 'metrics.prom')
+
+    def test_invalid_workers(self):
+        with self.assertLogs(level='INFO') as cm:
+            rc, args = get_arguments(['-s', TEST_DATE, '-e', TEST_DATE,
+                                      '-w', '0'])
+        self.assertEqual(cm.output, ["ERROR:root:Workers value, 0 is invalid"])
+        self.assertEqual(rc, 88)
+
     @patch.dict(os.environ, {"AUTH_URL": "http://test.com/oauth/valid"})
-    @patch('requests.post', side_effect=mocked_requests_post)
+    @patch('requests.Session.post', side_effect=mocked_requests_post)
     def test_valid_token(self, mock_post):
         token = authenticate()
         self.assertEqual(token, "validtoken")
 
 
     @patch.dict(os.environ, {"AUTH_URL": "http://test.com/oauth/invalid"})
-    @patch('requests.post', side_effect=mocked_requests_post)
+    @patch('requests.Session.post', side_effect=mocked_requests_post)
     def test_invalid_token(self, mock_post):
         with self.assertLogs(level='INFO') as cm:
             token = authenticate()
@@ -109,7 +200,66 @@ class TestGetArguments(TestCase):
         self.assertEqual(cm.output, [f"ERROR:root:Token not found"])
         self.assertEqual(token, None)
 
-    @patch('requests.get', side_effect=mocked_requests_get)
+    @patch.dict(os.environ, {"AUTH_URL": "http://test.com/oauth/valid"})
+    @patch('requests.Session.post', side_effect=mocked_requests_post)
+    def test_cached_token(self, mock_post):
+        self.assertEqual(authenticate(), "validtoken")
+        self.assertEqual(authenticate(), "validtoken")
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(os.stat(os.environ['TOKEN_CACHE']).st_mode & 0o777, 0o600)
+
+    @patch.dict(os.environ, {"AUTH_URL": "http://test.com/oauth/valid",
+                             "TOKEN_CACHE": ""})
+    @patch('requests.Session.post', side_effect=mocked_requests_post)
+    def test_token_cache_disabled(self, mock_post):
+        authenticate()
+        authenticate()
+        self.assertEqual(mock_post.call_count, 2)
+
+    @patch.dict(os.environ, {"AUTH_URL": "http://test.com/oauth/valid"})
+    @patch('requests.Session.post', side_effect=mocked_requests_post)
+    @patch('requests.Session.get', side_effect=mocked_requests_get)
+    def test_refresh_on_unauthorized(self, mock_get, mock_post):
+        TokenCache(os.environ['TOKEN_CACHE']).set(
+            get_token_key("http://test.com/oauth/valid", "clientid", "read write"),
+            "staletoken", 7200)
+        token = authenticate()
+        self.assertEqual(token, "staletoken")
+        with self.assertLogs(level='INFO'):
+            avail = get_availability(token, "expired", TEST_DATE, TEST_DATE)
+        self.assertEqual(len(avail), 2)
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(authenticate(), "validtoken")
+
+        # Later calls with the rejected token go straight to the new one.
+        get_availability(token, "expired", TEST_DATE, TEST_DATE)
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch.dict('assignr.availability._refreshed_tokens', clear=True)
+    @patch('assignr.availability.authenticate', side_effect=['tokenB', 'tokenC'])
+    def test_refresh_twice(self, mock_authenticate):
+        # The server only accepts the latest token.
+        current = {'token': 'tokenB'}
+        client = MagicMock()
+        client.get.side_effect = lambda url, headers, **kwargs: MagicMock(
+            status_code=200 if headers['authorization'] == f"Bearer {current['token']}"
+            else 401, json=MagicMock(return_value={}))
+
+        with self.assertLogs(level='INFO'):
+            self.assertEqual(get_requests('tokenA', 'users', client=client)[0], 200)
+        current['token'] = 'tokenC'
+        with self.assertLogs(level='INFO'):
+            self.assertEqual(get_requests('tokenA', 'users', client=client)[0], 200)
+        self.assertEqual(mock_authenticate.call_count, 2)
+
+        # A call still holding the first token goes straight to the latest.
+        client.get.reset_mock()
+        self.assertEqual(get_requests('tokenA', 'users', client=client)[0], 200)
+        self.assertEqual(client.get.call_count, 1)
+        self.assertEqual(client.get.call_args.kwargs['headers']['authorization'],
+                         'Bearer tokenC')
+
+    @patch('requests.Session.get', side_effect=mocked_requests_get)
     def test_valid_availability(self, mock_get):
         expected_results = [
             {'date': '2023-01-01', 'avail': 'ALL DAY'},
@@ -118,8 +268,29 @@ class TestGetArguments(TestCase):
         avail = get_availability("token", "test", TEST_DATE, TEST_DATE)
         self.assertEqual(avail, expected_results)
 
+    @patch('requests.Session.get', side_effect=mocked_requests_get)
+    def test_paged_availability(self, mock_get):
+        avail = get_availability("token", "paged", TEST_DATE, TEST_DATE,
+                                 page_size=2)
+        self.assertEqual([record['date'] for record in avail],
+                         ['2023-01-01', '2023-01-02', '2023-01-03',
+                          '2023-01-04', '2023-01-05'])
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(mock_get.call_args_list[0].kwargs['params']['limit'], 2)
+        self.assertEqual(sorted(call.kwargs['params'].get('page', 1)
+                                for call in mock_get.call_args_list), [1, 2, 3])
+
+    @patch('assignr.helpers.client.sleep')
+    @patch('requests.Session.get', side_effect=mocked_requests_get)
+    def test_error_availability(self, mock_get, mock_sleep):
+        with self.assertLogs(level='INFO'):
+            with self.assertRaises(AssignrError) as cm:
+                get_availability("token", "error", TEST_DATE, TEST_DATE)
+        self.assertEqual(str(cm.exception),
+                         'Failed return code: 500 for user: error')
+
     @patch.dict(os.environ, {"BASE_URL": "http://fail.com/api/v2/"})
-    @patch('requests.get', side_effect=mocked_requests_get)
+    @patch('requests.Session.get', side_effect=mocked_requests_get)
     def test_failed_availability(self, mock_get):
         with self.assertLogs(level='INFO') as cm:
             avail = get_availability("token", "test", TEST_DATE, TEST_DATE)
@@ -128,7 +299,7 @@ class TestGetArguments(TestCase):
         self.assertEqual(avail, [])
 
     @patch.dict(os.environ, {"BASE_URL": "http://nouser.com/api/v2/"})
-    @patch('requests.get', side_effect=mocked_requests_get)
+    @patch('requests.Session.get', side_effect=mocked_requests_get)
     def test_invalid_user_availability(self, mock_get):
         with self.assertLogs(level='INFO') as cm:
             avail = get_availability("token", "invaliduser", TEST_DATE, TEST_DATE)
@@ -158,6 +329,19 @@ class TestGetArguments(TestCase):
         temp = get_referees()
         self.assertEqual(temp, expected_response)
 
+    @patch.dict(os.environ, {"FILE_NAME": "./tests/files/referees.csv"})
+    def test_get_referees_filtered(self):
+        self.assertEqual(get_referees(ids=['2']),
+                         [{"referee": "Marge Simpson", "id": 2}])
+        self.assertEqual(get_referees(name_pattern='homer*'),
+                         [{"referee": "Homer Simpson", "id": 1}])
+        self.assertEqual(get_referees(ids=['1'], name_pattern='marge*'), [])
+
+    @patch.dict(os.environ, {"FILE_NAME": "./tests/files/referees.csv"})
+    def test_iter_referees(self):
+        referees = iter_referees()
+        self.assertEqual(next(referees), {"referee": "Homer Simpson", "id": 1})
+
 #    def test_main_no_log_level(self):
 #        with self.assertLogs(level='INFO') as cm:
 #            main()
@@ -175,7 +359,19 @@ class TestGetArguments(TestCase):
         mock_arguments.return_value = [0, 
             {
             "start_date": "01/01/2023",
-            "end_date": "01/10/2023"
+            "end_date": "01/10/2023",
+            "workers": 1,
+            "page_size": None,
+            "cache": True,
+            "refresh": False,
+            "sync": False,
+            "output_format": "text",
+            "output_file": None,
+            "shard": None,
+            "referee_ids": None,
+            "name_pattern": None,
+            "metrics": False,
+            "metrics_file": None
             }
         ]
         mock_authenticate.return_value = None
@@ -184,3 +380,207 @@ class TestGetArguments(TestCase):
             main()
         self.assertEqual(e.typename, 'SystemExit')
         self.assertEqual(e.value.code, 88)
+
+
+class TestCachedAvailability(TestCase):
+    @pytest.fixture(autouse=True)
+    def cache(self, tmp_path):
+        self.cache = AvailabilityCache(str(tmp_path / 'availability.db'))
+        yield
+        self.cache.close()
+
+    @patch('requests.Session.get', side_effect=mocked_requests_get)
+    def test_second_request_uses_cache(self, mock_get):
+        expected_results = [
+            {'date': '2023-01-01', 'avail': 'ALL DAY'},
+            {'date': '2023-01-08', 'avail': '08:00 AM - 3:00 PM'}
+        ]
+        first = get_availability("token", "test", TEST_DATE, '01/08/2023',
+                                 cache=self.cache)
+        second = get_availability("token", "test", TEST_DATE, '01/08/2023',
+                                  cache=self.cache)
+        self.assertEqual(first, expected_results)
+        self.assertEqual(second, expected_results)
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (8, 8))
+
+    @patch('requests.Session.get', side_effect=mocked_requests_get)
+    def test_only_missing_dates_fetched(self, mock_get):
+        get_availability("token", "test", '01/03/2023', '01/05/2023',
+                         cache=self.cache)
+        get_availability("token", "test", TEST_DATE, '01/08/2023',
+                         cache=self.cache)
+        params = [call.kwargs['params'] for call in mock_get.call_args_list]
+        self.assertEqual(
+            [(param['search[start_date]'], param['search[end_date]'])
+             for param in params],
+            [('01/03/2023', '01/05/2023'), ('01/01/2023', '01/02/2023'),
+             ('01/06/2023', '01/08/2023')])
+
+    @patch('requests.Session.get', side_effect=mocked_requests_get)
+    def test_refresh(self, mock_get):
+        get_availability("token", "test", TEST_DATE, TEST_DATE, cache=self.cache)
+        get_availability("token", "test", TEST_DATE, TEST_DATE, cache=self.cache,
+                         refresh=True)
+        self.assertEqual(mock_get.call_count, 2)
+
+
+class TestSyncAvailability(TestCase):
+    @pytest.fixture(autouse=True)
+    def capture(self, tmp_path, capsys):
+        self.capsys = capsys
+        with patch.dict(os.environ, {"SYNC_STORE": str(tmp_path / 'sync.db')}):
+            yield
+
+    @patch('assignr.availability.iter_referees')
+    @patch('requests.Session.get', side_effect=mocked_requests_get)
+    def test_sync(self, mock_get, mock_referees):
+        mock_referees.return_value = [{'referee': 'Homer Simpson', 'id': 'test'}]
+        args = {**DEFAULT_ARGS, 'start_date': TEST_DATE, 'end_date': '01/31/2023',
+                'sync': True}
+        with self.assertLogs(level='INFO') as cm:
+            sync_availability('token', args)
+        self.assertEqual(self.capsys.readouterr().out.splitlines(), [
+            'Homer Simpson - added - 2023-01-01 - ALL DAY',
+            'Homer Simpson - added - 2023-01-08 - 08:00 AM - 3:00 PM'
+        ])
+        self.assertEqual(cm.output, ['INFO:root:Sync: 2 added, 0 changed, 0 removed'])
+
+        with self.assertLogs(level='INFO') as cm:
+            sync_availability('token', args)
+        self.assertEqual(self.capsys.readouterr().out, '')
+        self.assertEqual(cm.output, ['INFO:root:Sync: 0 added, 0 changed, 0 removed'])
+
+
+class TestShardedAvailability(TestCase):
+    def test_week_shards(self):
+        shards = get_shards(datetime(2023, 1, 4).date(),
+                            datetime(2023, 1, 17).date(), 'week')
+        self.assertEqual([(start.isoformat(), end.isoformat())
+                          for start, end in shards],
+                         [('2023-01-04', '2023-01-08'),
+                          ('2023-01-09', '2023-01-15'),
+                          ('2023-01-16', '2023-01-17')])
+
+    def test_month_shards(self):
+        shards = get_shards(datetime(2023, 1, 15).date(),
+                            datetime(2023, 3, 1).date(), 'month')
+        self.assertEqual([(start.isoformat(), end.isoformat())
+                          for start, end in shards],
+                         [('2023-01-15', '2023-01-31'),
+                          ('2023-02-01', '2023-02-28'),
+                          ('2023-03-01', '2023-03-01')])
+
+    def test_day_shards(self):
+        shards = get_shards(datetime(2023, 1, 1).date(),
+                            datetime(2023, 1, 10).date(), 4)
+        self.assertEqual([(start.day, end.day) for start, end in shards],
+                         [(1, 4), (5, 8), (9, 10)])
+
+    @patch('requests.Session.get', side_effect=mocked_requests_get)
+    def test_sharded_matches_unsharded(self, mock_get):
+        unsharded = get_availability("token", "test", TEST_DATE, '01/31/2023')
+        sharded = get_availability("token", "test", TEST_DATE, '01/31/2023',
+                                   shard='week')
+        self.assertEqual(sharded, unsharded)
+        # The mock returns the same records for every shard, duplicates
+        # are dropped on id.
+        self.assertEqual(mock_get.call_count, 1 + 6)
+
+    @patch('assignr.availability.get_availability_records')
+    def test_failed_shard_retried(self, mock_records):
+        calls = []
+
+        def records(token, user_id, start_dt, end_dt, **options):
+            calls.append(start_dt)
+            if start_dt == '01/09/2023' and calls.count(start_dt) == 1:
+                raise AssignrError('Failed return code: 503 for user: 1')
+            return [{'id': start_dt, 'date': start_dt}]
+        mock_records.side_effect = records
+
+        with self.assertLogs(level='INFO') as cm:
+            results = get_sharded_availability_records(
+                'token', 1, TEST_DATE, '01/20/2023', 'week')
+        self.assertEqual([record['id'] for record in results],
+                         ['01/01/2023', '01/02/2023', '01/09/2023',
+                          '01/16/2023'])
+        self.assertEqual(calls.count('01/09/2023'), 2)
+        self.assertEqual(calls.count('01/02/2023'), 1)
+        self.assertEqual(len(cm.output), 1)
+
+    @patch('assignr.availability.get_availability_records')
+    def test_shard_gives_up(self, mock_records):
+        mock_records.side_effect = AssignrError('Failed return code: 500 for user: 1')
+        with self.assertLogs(level='INFO'):
+            with self.assertRaises(AssignrError):
+                get_sharded_availability_records(
+                    'token', 1, TEST_DATE, '01/20/2023', 'week')
+
+
+class TestGetAllAvailability(TestCase):
+    REFEREES = [
+        {'referee': f'Referee {count}', 'id': count} for count in range(20)
+    ]
+
+    @staticmethod
+    def lookup(token, user_id, start_dt, end_dt):
+        if user_id == 5:
+            raise ValueError('bad response')
+        return [{'date': '2023-01-01', 'avail': f'ALL DAY {user_id}'}]
+
+    @patch('assignr.availability.get_availability')
+    def test_parallel_matches_serial(self, mock_availability):
+        mock_availability.side_effect = self.lookup
+        with self.assertLogs(level='INFO'):
+            serial = list(get_all_availability(
+                'token', self.REFEREES, TEST_DATE, TEST_DATE))
+            parallel = list(get_all_availability(
+                'token', self.REFEREES, TEST_DATE, TEST_DATE, workers=4))
+        self.assertEqual(serial, parallel)
+        self.assertEqual([referee for referee, _ in parallel], self.REFEREES)
+
+    @patch('assignr.availability.get_availability')
+    def test_failure_does_not_stop_batch(self, mock_availability):
+        mock_availability.side_effect = self.lookup
+        with self.assertLogs(level='INFO') as cm:
+            results = list(get_all_availability(
+                'token', self.REFEREES, TEST_DATE, TEST_DATE, workers=4))
+        self.assertEqual(cm.output, [
+            "ERROR:root:Availability lookup failed for Referee 5: bad response"
+        ])
+        self.assertIsNone(results[5][1])
+        self.assertEqual(len(results), 20)
+        self.assertEqual(results[6][1],
+                         [{'date': '2023-01-01', 'avail': 'ALL DAY 6'}])
+
+
+class TestGetRateLimiter(TestCase):
+    ARGS = {'workers': 2, 'shard': None}
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_defaults(self):
+        rate_limiter, rc = get_rate_limiter(self.ARGS)
+        self.assertEqual(rc, 0)
+        self.assertEqual(rate_limiter.rate, 10.0)
+        self.assertEqual(rate_limiter.max_rate, 20.0)
+        # Two referee workers, each with a page pool.
+        self.assertEqual(rate_limiter.max_concurrency, 2 * PAGE_WORKERS)
+
+        rate_limiter, rc = get_rate_limiter({'workers': 2, 'shard': 'week'})
+        self.assertEqual(rate_limiter.max_concurrency,
+                         2 * SHARD_WORKERS * PAGE_WORKERS)
+
+    @patch.dict(os.environ, {'RATE_LIMIT': '5', 'MAX_RATE_LIMIT': '50',
+                             'MAX_CONCURRENCY': '3'}, clear=True)
+    def test_settings(self):
+        rate_limiter, rc = get_rate_limiter(self.ARGS)
+        self.assertEqual((rate_limiter.rate, rate_limiter.max_rate,
+                          rate_limiter.max_concurrency), (5.0, 50.0, 3))
+
+    @patch.dict(os.environ, {'MAX_CONCURRENCY': 'many'}, clear=True)
+    def test_invalid(self):
+        with self.assertLogs(level='INFO') as cm:
+            rate_limiter, rc = get_rate_limiter(self.ARGS)
+        self.assertEqual(rc, 88)
+        self.assertIsNone(rate_limiter)
+        self.assertEqual(cm.output, ["ERROR:root:MAX_CONCURRENCY value, many is invalid"])
@@ -0,0 +1,59 @@
+from unittest import TestCase
+from unittest.mock import patch
+from tempfile import TemporaryDirectory
+from os.path import join
+from assignr.helpers.availability_cache import AvailabilityCache
+
+RECORD = {'id': 123, 'date': '2023-01-01', 'all_day': True}
+
+
+class TestAvailabilityCache(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.file_name = join(self.directory.name, 'availability.db')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_hit_and_miss(self):
+        cache = AvailabilityCache(self.file_name)
+        cache.set(1, {'2023-01-01': [RECORD], '2023-01-02': []})
+        found = cache.get(1, ['2023-01-01', '2023-01-02', '2023-01-03'])
+        self.assertEqual(found, {'2023-01-01': [RECORD], '2023-01-02': []})
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        self.assertEqual(cache.get(2, ['2023-01-01']), {})
+        cache.close()
+
+    def test_persisted(self):
+        cache = AvailabilityCache(self.file_name)
+        cache.set(1, {'2023-01-01': [RECORD]})
+        cache.close()
+        cache = AvailabilityCache(self.file_name)
+        self.assertEqual(cache.get(1, ['2023-01-01']), {'2023-01-01': [RECORD]})
+        cache.close()
+
+    @patch('assignr.helpers.availability_cache.time')
+    def test_ttl(self, mock_time):
+        mock_time.return_value = 1000
+        cache = AvailabilityCache(self.file_name, ttl=60)
+        cache.set(1, {'2023-01-01': [RECORD]})
+        mock_time.return_value = 1059
+        self.assertEqual(len(cache.get(1, ['2023-01-01'])), 1)
+        mock_time.return_value = 1060
+        self.assertEqual(cache.get(1, ['2023-01-01']), {})
+        cache.close()
+
+    @patch('assignr.helpers.availability_cache.time')
+    def test_lru_eviction(self, mock_time):
+        cache = AvailabilityCache(self.file_name, max_entries=2)
+        mock_time.return_value = 1
+        cache.set(1, {'2023-01-01': []})
+        mock_time.return_value = 2
+        cache.set(1, {'2023-01-02': []})
+        mock_time.return_value = 3
+        cache.get(1, ['2023-01-01'])
+        mock_time.return_value = 4
+        cache.set(1, {'2023-01-03': []})
+        self.assertEqual(sorted(cache.get(1, ['2023-01-01', '2023-01-02', '2023-01-03'])),
+                         ['2023-01-01', '2023-01-03'])
+        cache.close()
@@ -0,0 +1,156 @@
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+from os.path import join
+from datetime import (datetime, time)
+import csv
+import json
+from openpyxl import Workbook
+from schedule.helpers.batch import (load_manifest, process_town, run_batch)
+from schedule.helpers.master_schedule import MasterSchedule
+
+
+def write_town_file(file_name):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = '7TH_8TH'
+    sheet.append(['SPRING 2023 BOSTON YOUTH SOCCER'])
+    sheet.append(['Division', 'Field', 'Time', datetime(2023, 4, 1),
+                  datetime(2023, 4, 8)])
+    sheet.append(['7/8', 'Field1', time(8, 0), 'G - 2', 'B - 1'])
+    sheet.append(['7/8', 'Field1', time(10, 0), 'B - 3', 'NO GAME'])
+    workbook.save(file_name)
+
+TRANSLATIONS = {
+    'age_groups': {
+        '3rd_4th': 'Grade 3/4',
+        '5th_6th': 'Grade 5/6',
+        '7th_8th': 'Grade 7/8'
+    },
+    'fields': {
+        'boston': {
+            'Field1': {'venue': 'Fenway Parking', 'sub-venue': 'Pool 1'}
+        }
+    }
+}
+
+VALUES = [
+    ['Grade', 'Division', 'Date', 'Home', 'Team', 'Away', 'Team'],
+    ['Grade 7/8 Girls', 'Ligue 3', '4/1/23', 'Boston', '2', 'Hull', '1'],
+    ['Grade 7/8 Boys', 'Ligue 3', '4/8/23', 'Boston', '1', 'London', '3'],
+    ['Grade 7/8 Boys', 'Ligue 3', '4/8/23', 'Hull', '2', 'London', '1'],
+    ['Grade 3/4 Boys', 'Ligue 1', '4/8/23', 'Hull', '4', 'Bye', '']
+]
+
+
+class TestLoadManifest(TestCase):
+    def test_manifest(self):
+        with TemporaryDirectory() as directory:
+            file_name = join(directory, 'towns.json')
+            with open(file_name, 'w') as file:
+                json.dump([{'town': 'Boston', 'town_file': 'boston.xlsx'}], file)
+            manifest, rc = load_manifest(file_name)
+        self.assertEqual(rc, 0)
+        self.assertEqual(manifest, [{'town': 'boston', 'town_file': 'boston.xlsx'}])
+
+    def test_missing_file(self):
+        with self.assertLogs(level='INFO') as cm:
+            manifest, rc = load_manifest('missing.json')
+        self.assertEqual(cm.output, ["ERROR:root:No such file or directory: missing.json"])
+        self.assertEqual(rc, 66)
+
+    def test_invalid_entry(self):
+        with TemporaryDirectory() as directory:
+            file_name = join(directory, 'towns.json')
+            with open(file_name, 'w') as file:
+                json.dump([{'town': 'Boston'}], file)
+            with self.assertLogs(level='INFO'):
+                manifest, rc = load_manifest(file_name)
+        self.assertEqual(rc, 88)
+        self.assertEqual(manifest, [])
+
+
+class TestGroupByTown(TestCase):
+    def test_group_by_town(self):
+        master_schedule = MasterSchedule(None, None)
+        master_schedule.values = VALUES
+        towns = master_schedule.group_by_town()
+        self.assertEqual(towns['boston'], VALUES[1:3])
+        self.assertEqual(towns['london'], VALUES[2:4])
+        self.assertEqual(towns['hull'], [VALUES[1], VALUES[3], VALUES[4]])
+
+
+class TestRunBatch(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.prefix = join(self.directory.name, 'schedule')
+        self.master_schedule = MasterSchedule(None, None)
+        self.master_schedule.values = VALUES
+        self.town_file = join(self.directory.name, 'boston.xlsx')
+        write_town_file(self.town_file)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read(self, file_name):
+        with open(file_name, newline='') as file:
+            return list(csv.reader(file))
+
+    def test_process_town(self):
+        file_name = f"{self.prefix}-single"
+        rc = process_town('boston', self.town_file, VALUES, TRANSLATIONS, file_name)
+        self.assertEqual(rc, 0)
+        rows = self.read(file_name)
+        self.assertEqual(rows[0][:3], ['Game ID', 'Date', 'Start Time'])
+        self.assertEqual(rows[1], ['', '04/01/2023', '08:00 AM', 'Fenway Parking',
+                                   'Pool 1', 'Grade 7/8', 'Boston', 'Girls',
+                                   'Coastal', 'Boston-2', 'Hull-1'])
+        self.assertEqual(len(rows), 3)
+
+    def test_batch_matches_single(self):
+        process_town('boston', self.town_file, VALUES, TRANSLATIONS,
+                     f"{self.prefix}-single")
+        manifest = [{'town': 'boston', 'town_file': self.town_file}]
+        for workers in (1, 2):
+            rc = run_batch(manifest, self.master_schedule, TRANSLATIONS,
+                           self.prefix, str(workers), workers=workers)
+            self.assertEqual(rc, 0)
+            self.assertEqual(self.read(f"{self.prefix}-boston-{workers}"),
+                             self.read(f"{self.prefix}-single"))
+
+    def test_failed_town(self):
+        manifest = [
+            {'town': 'hull', 'town_file': self.town_file},
+            {'town': 'boston', 'town_file': self.town_file}
+        ]
+        with self.assertLogs(level='INFO') as cm:
+            rc = run_batch(manifest, self.master_schedule, TRANSLATIONS,
+                           self.prefix, 'date', workers=1)
+        self.assertEqual(rc, 55)
+        self.assertIn("ERROR:root:No field translations found for hull", cm.output)
+        self.assertEqual(len(self.read(f"{self.prefix}-boston-date")), 3)
+
+    def test_unmatched_games_reported(self):
+        values = VALUES + [['Grade 7/8 Girls', 'Ligue 3', '4/8/23', 'Boston', '5',
+                            'Hull', '3']]
+        file_name = f"{self.prefix}-single"
+        with self.assertLogs(level='INFO') as cm:
+            rc = process_town('boston', self.town_file, values, TRANSLATIONS, file_name)
+        self.assertEqual(rc, 0)
+        self.assertIn("WARNING:root:boston: master schedule game not in the town "
+                      "schedule, 04/08/2023 Grade 7/8 Girls Boston-5 v Hull-3", cm.output)
+        self.assertIn("WARNING:root:boston: town schedule game not in the master "
+                      "schedule, 04/01/2023 10:00 AM Grade 7/8 Boys Boston-3", cm.output)
+        self.assertIn(f"INFO:root:boston: 2 games written to {file_name}, 1 master only, "
+                      "1 town only, 0 duplicate keys", cm.output)
+        self.assertEqual(len(self.read(file_name)), 3)
+
+    def test_team_aliases(self):
+        values = VALUES + [['Grade 7/8 Boys', 'Ligue 3', '4/1/23', 'Boston', 'Three',
+                            'Hull', '3']]
+        translations = {**TRANSLATIONS,
+                        'team_aliases': {'boston': {'Boston-Three': 'Boston-3'}}}
+        file_name = f"{self.prefix}-single"
+        process_town('boston', self.town_file, values, translations, file_name)
+        rows = self.read(file_name)
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[3][9:], ['Boston-Three', 'Hull-3'])
@@ -0,0 +1,102 @@
+from unittest import TestCase
+from unittest.mock import (patch, MagicMock)
+import requests
+from assignr.helpers.client import (AssignrClient, get_retry_after)
+from assignr.helpers.metrics import Metrics
+
+URL = 'http://test.com/api/v2/users/test/availability'
+
+
+def mock_response(status_code, headers=None, content=b''):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.content = content
+    return response
+
+
+class TestGetRetryAfter(TestCase):
+    def test_seconds(self):
+        self.assertEqual(get_retry_after(mock_response(429, {'Retry-After': '3'})), 3.0)
+
+    def test_missing(self):
+        self.assertIsNone(get_retry_after(mock_response(429)))
+
+    def test_past_http_date(self):
+        response = mock_response(503, {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'})
+        self.assertEqual(get_retry_after(response), 0.0)
+
+    def test_invalid(self):
+        self.assertIsNone(get_retry_after(mock_response(503, {'Retry-After': 'soon'})))
+
+
+@patch('assignr.helpers.client.sleep')
+class TestAssignrClient(TestCase):
+    def test_pool_size(self, mock_sleep):
+        client = AssignrClient(pool_size=25)
+        adapter = client.session.get_adapter('https://api.assignr.com')
+        self.assertEqual(adapter._pool_maxsize, 25)
+
+    @patch('requests.Session.get')
+    def test_success(self, mock_get, mock_sleep):
+        mock_get.return_value = mock_response(200)
+        response = AssignrClient().get(URL, params={'page': 1})
+        self.assertEqual(response.status_code, 200)
+        mock_get.assert_called_once_with(URL, params={'page': 1}, timeout=(5, 30))
+        mock_sleep.assert_not_called()
+
+    @patch('requests.Session.get')
+    def test_retry_honors_retry_after(self, mock_get, mock_sleep):
+        mock_get.side_effect = [
+            mock_response(429, {'Retry-After': '7'}),
+            mock_response(503),
+            mock_response(200)
+        ]
+        with self.assertLogs(level='WARNING'):
+            response = AssignrClient(backoff=0.5).get(URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([call.args[0] for call in mock_sleep.call_args_list],
+                         [7.0, 1.0])
+
+    @patch('requests.Session.get')
+    def test_retries_exhausted(self, mock_get, mock_sleep):
+        mock_get.return_value = mock_response(500)
+        with self.assertLogs(level='WARNING'):
+            response = AssignrClient(retries=2).get(URL)
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch('requests.Session.get')
+    def test_no_retry_on_client_error(self, mock_get, mock_sleep):
+        mock_get.return_value = mock_response(404)
+        self.assertEqual(AssignrClient().get(URL).status_code, 404)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('requests.Session.post')
+    def test_connection_error(self, mock_post, mock_sleep):
+        mock_post.side_effect = [requests.ConnectionError('reset'),
+                                 mock_response(200)]
+        with self.assertLogs(level='WARNING'):
+            response = AssignrClient().post(URL, data={})
+        self.assertEqual(response.status_code, 200)
+
+    @patch('requests.Session.post')
+    def test_connection_error_exhausted(self, mock_post, mock_sleep):
+        mock_post.side_effect = requests.Timeout('timed out')
+        with self.assertLogs(level='WARNING'):
+            with self.assertRaises(requests.Timeout):
+                AssignrClient(retries=1).post(URL)
+
+    @patch('requests.Session.get')
+    def test_metrics(self, mock_get, mock_sleep):
+        mock_get.side_effect = [mock_response(503),
+                                mock_response(200, content=b'{"ok": 1}')]
+        metrics = Metrics()
+        with self.assertLogs(level='WARNING'):
+            AssignrClient(metrics=metrics).get(URL, endpoint='availability')
+        result = metrics.to_dict()['availability']
+        self.assertEqual(result['count'], 2)
+        self.assertEqual(result['statuses'], {'200': 1, '503': 1})
+        self.assertEqual(result['bytes'], 9)
+        self.assertEqual(result['retries'], 1)
+        self.assertNotIn('endpoint', mock_get.call_args.kwargs)
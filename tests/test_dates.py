@@ -0,0 +1,36 @@
+from unittest import TestCase
+from datetime import (date, datetime, time)
+import pandas as pd
+from schedule.helpers.dates import (format_date, format_time, map_unique,
+                                    parse_master_date, parse_master_dates)
+
+
+class TestDates(TestCase):
+    def test_parse_master_date(self):
+        self.assertEqual(parse_master_date('4/1/23'), ('04/01/2023', None))
+        parse_master_date.cache_clear()
+        for _ in range(3):
+            game_date, error = parse_master_date('4/31/23')
+        self.assertIsNone(game_date)
+        self.assertEqual(error, 'day is out of range for month')
+        info = parse_master_date.cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 1))
+
+    def test_parse_master_dates(self):
+        dates, errors = parse_master_dates(['4/1/23', '', '4/1/23', '12/31/23'])
+        self.assertEqual(dates, ['04/01/2023', None, '04/01/2023', '12/31/2023'])
+        self.assertEqual([error is None for error in errors],
+                         [True, False, True, True])
+        self.assertEqual(parse_master_dates([]), ([], []))
+
+    def test_format(self):
+        self.assertEqual(format_date(datetime(2023, 4, 1)), '04/01/2023')
+        self.assertEqual(format_date(date(2023, 4, 8)), '04/08/2023')
+        self.assertEqual(format_date(pd.Timestamp(2023, 4, 15)), '04/15/2023')
+        self.assertEqual(format_time(time(13, 30)), '01:30 PM')
+
+    def test_bulk_matches_scalar(self):
+        times = [time(8 + number % 10, 15 * (number % 4)) for number in range(100)]
+        self.assertEqual(map_unique(format_time, times),
+                         [format_time(value) for value in times])
+        self.assertEqual(map_unique(format_time, []), [])
@@ -0,0 +1,78 @@
+from datetime import (date, time)
+from unittest import TestCase
+from assignr.helpers.interval_index import (build_interval_index, parse_interval,
+                                            to_date_key, IntervalIndex)
+
+RESULTS = [
+    ({'referee': 'Homer Simpson', 'id': 1}, [
+        {'date': '2023-01-01', 'avail': 'ALL DAY'},
+        {'date': '2023-01-08', 'avail': '08:00 AM - 3:00 PM'}
+    ]),
+    ({'referee': 'Marge Simpson', 'id': 2}, [
+        {'date': '2023-01-08', 'avail': '10:00 AM - 11:00 AM'},
+        {'date': '2023-01-08', 'avail': '11:00 AM - 5:30 PM'}
+    ]),
+    ({'referee': 'Bart Simpson', 'id': 3}, [
+        {'date': '2023-01-08', 'avail': '4:00 PM - 6:00 PM'}
+    ]),
+    ({'referee': 'Lisa Simpson', 'id': 4}, [])
+]
+
+
+class TestParsing(TestCase):
+    def test_parse_interval(self):
+        self.assertEqual(parse_interval('ALL DAY'), (0, 1440))
+        self.assertEqual(parse_interval('08:00 AM - 3:00 PM'), (480, 900))
+
+    def test_date_key(self):
+        self.assertEqual(to_date_key('01/08/2023'), '2023-01-08')
+        self.assertEqual(to_date_key(date(2023, 1, 8)), '2023-01-08')
+        self.assertEqual(to_date_key('2023-01-08'), '2023-01-08')
+
+
+class TestIntervalIndex(TestCase):
+    def setUp(self):
+        self.index = build_interval_index(RESULTS)
+
+    def test_available_at(self):
+        self.assertEqual(self.index.available_at('01/08/2023', '10:30 AM'),
+                         ['Homer Simpson', 'Marge Simpson'])
+        self.assertEqual(self.index.available_at('2023-01-08', time(16, 0)),
+                         ['Marge Simpson', 'Bart Simpson'])
+        self.assertEqual(self.index.available_at('2023-01-08', '7:00 AM'), [])
+        self.assertEqual(self.index.available_at('2023-01-08', '6:00 PM'), [])
+        self.assertEqual(self.index.available_at('2023-01-01', '11:59 PM'),
+                         ['Homer Simpson'])
+        self.assertEqual(self.index.available_at('2023-01-02', '10:00 AM'), [])
+
+    def test_available_between(self):
+        self.assertEqual(
+            self.index.available_between('2023-01-08', '11:00 AM', '12:00 PM'),
+            ['Homer Simpson', 'Marge Simpson'])
+        self.assertEqual(
+            self.index.available_between('2023-01-08', '10:30 AM', '11:30 AM'),
+            ['Homer Simpson'])
+
+    def test_overlapping(self):
+        self.assertEqual(self.index.overlapping('2023-01-08', '5:00 PM', '7:00 PM'),
+                         ['Marge Simpson', 'Bart Simpson'])
+        self.assertEqual(self.index.overlapping('2023-01-08', '6:00 AM', '8:30 AM'),
+                         ['Homer Simpson'])
+        self.assertEqual(self.index.overlapping('2023-01-08', '6:00 PM', '7:00 PM'), [])
+
+    def test_matches_linear_scan(self):
+        intervals = [(f'Referee {count}', '2023-01-08', (count * 37) % 600,
+                      (count * 37) % 600 + 30 + count % 240) for count in range(300)]
+        index = IntervalIndex(intervals)
+        for minute in range(0, 1440, 7):
+            expected = [referee for referee, _, start, end in intervals
+                        if start <= minute < end]
+            self.assertEqual(sorted(index.available_at('2023-01-08', minute)),
+                             sorted(expected))
+
+    def test_unparseable(self):
+        with self.assertLogs(level='WARNING'):
+            index = build_interval_index([
+                {'referee': 'Homer Simpson',
+                 'availability': [{'date': '2023-01-01', 'avail': 'soon'}]}])
+        self.assertEqual(index.dates, {})
@@ -0,0 +1,117 @@
+from unittest import TestCase
+import pandas as pd
+from schedule.helpers.join import (JOIN_KEYS, join_games)
+
+
+def town_game(date, gender, team, time='08:00 AM'):
+    return {'date': date, 'time': time, 'venue': 'Fenway', 'sub_venue': 'Pool 1',
+            'age_group': 'Grade 7/8', 'gender': gender, 'home_team': team}
+
+
+def master_game(date, gender, team, away='Hull-1'):
+    return {'game_id': '', 'game_type': 'Coastal', 'gender': gender,
+            'age_group': 'Grade 7/8', 'date': date, 'league': 'Boston',
+            'home_team': team, 'away_team': away}
+
+
+class TestJoinGames(TestCase):
+    def test_matches_merge(self):
+        town_games = [town_game('04/08/2023', 'Boys', 'Boston-1'),
+                      town_game('04/01/2023', 'Girls', 'Boston-2')]
+        master_games = [master_game('04/01/2023', 'Girls', 'Boston-2'),
+                        master_game('04/08/2023', 'Boys', 'Boston-1', 'London-3')]
+        result = join_games(town_games, master_games)
+        merged = pd.merge(pd.DataFrame(town_games), pd.DataFrame(master_games),
+                          how='inner', on=list(JOIN_KEYS), validate='1:1')
+        self.assertEqual(result.matched, merged.to_dict('records'))
+        self.assertEqual((result.master_only, result.town_only, result.duplicates),
+                         ([], [], {}))
+
+    def test_unmatched_and_duplicates(self):
+        town_games = [town_game('04/01/2023', 'Girls', 'Boston-2'),
+                      town_game('04/01/2023', 'Boys', 'Boston-3'),
+                      town_game('04/08/2023', 'Girls', 'Boston-1'),
+                      town_game('04/08/2023', 'Girls', 'Boston-1', '10:00 AM')]
+        master_games = [master_game('04/01/2023', 'Girls', 'Boston-2'),
+                        master_game('04/08/2023', 'Girls', 'Boston-1'),
+                        master_game('04/15/2023', 'Boys', 'Boston-1'),
+                        master_game('04/22/2023', 'Boys', 'Boston-1'),
+                        master_game('04/22/2023', 'Boys', 'Boston-1', 'London-3')]
+        result = join_games(town_games, master_games)
+
+        self.assertEqual([game['home_team'] for game in result.matched], ['Boston-2'])
+        self.assertEqual(result.matched[0]['away_team'], 'Hull-1')
+        self.assertEqual(result.town_only, [town_games[1]])
+        self.assertEqual(result.master_only, master_games[2:])
+        self.assertEqual(result.duplicates, {
+            ('Grade 7/8', '04/08/2023', 'Girls', 'Boston-1'): {'town': 2, 'master': 1},
+            ('Grade 7/8', '04/22/2023', 'Boys', 'Boston-1'): {'town': 0, 'master': 2}
+        })
+
+        with self.assertLogs(level='INFO') as cm:
+            result.report('boston')
+        self.assertEqual(cm.output[0],
+                         "WARNING:root:boston: master schedule game not in the town "
+                         "schedule, 04/15/2023 Grade 7/8 Boys Boston-1 v Hull-1")
+        self.assertEqual(cm.output[3],
+                         "WARNING:root:boston: town schedule game not in the master "
+                         "schedule, 04/01/2023 08:00 AM Grade 7/8 Boys Boston-3")
+        self.assertEqual(cm.output[4],
+                         "ERROR:root:boston: Grade 7/8 04/08/2023 Girls Boston-1 is in "
+                         "the town schedule 2 times and the master schedule 1 times, "
+                         "not written")
+
+    def test_team_names_normalized(self):
+        town_games = [town_game('04/01/2023', 'Girls', 'Boston - 2'),
+                      town_game('04/08/2023', 'Boys', 'Boston Blue')]
+        master_games = [master_game('04/01/2023', 'Girls', 'Boston-2'),
+                        master_game('04/08/2023', 'Boys', 'Boston-1')]
+        result = join_games(town_games, master_games,
+                            aliases={'Boston Blue': 'Boston-1'})
+        self.assertEqual([game['home_team'] for game in result.matched],
+                         ['Boston-2', 'Boston-1'])
+        self.assertEqual((result.town_only, result.master_only), ([], []))
+
+    def test_suggestions_not_applied(self):
+        town_games = [town_game('04/01/2023', 'Girls', 'Bostn-2'),
+                      town_game('04/08/2023', 'Girls', 'Bostn-2')]
+        master_games = [master_game('04/01/2023', 'Girls', 'Boston-2'),
+                        master_game('04/15/2023', 'Girls', 'Boston-2')]
+        result = join_games(town_games, master_games)
+        self.assertEqual(result.matched, [])
+        self.assertEqual(result.suggestions,
+                         [(town_games[0], master_games[0], 0.615)])
+
+        with self.assertLogs(level='INFO') as cm:
+            result.report('boston')
+        self.assertEqual(cm.output[-1],
+                         "WARNING:root:boston: town schedule team Bostn-2 may be "
+                         "master schedule team Boston-2, 04/01/2023 Grade 7/8 Girls, "
+                         "score 0.61, not applied")
+
+    def test_unparsable_duplicate_dates(self):
+        # process_row keeps date None for dates like "TBD".
+        master_games = [master_game(None, 'Girls', 'Boston-2'),
+                        master_game(None, 'Girls', 'Boston-2', 'London-3')]
+        result = join_games([town_game('04/01/2023', 'Girls', 'Boston-2')],
+                            master_games)
+        with self.assertLogs(level='INFO') as cm:
+            result.report('boston')
+        self.assertIn("ERROR:root:boston: Grade 7/8 None Girls Boston-2 is in the "
+                      "town schedule 0 times and the master schedule 2 times, "
+                      "not written", cm.output)
+
+    def test_no_suggestion_for_other_teams(self):
+        # Every team is a Hanover team, only the misspelled one is suggested,
+        # and only against the teams playing that date.
+        town_games = [town_game('04/01/2023', 'Boys', 'Hanover-3'),
+                      town_game('04/01/2023', 'Boys', 'Hanvoer-7'),
+                      town_game('04/08/2023', 'Boys', 'Hanover-7')]
+        master_games = [master_game('04/01/2023', 'Boys', f'Hanover-{number}')
+                        for number in (1, 2, 4, 5, 6, 7)]
+        master_games.append(master_game('04/15/2023', 'Boys', 'Hanover-3'))
+        result = join_games(town_games, master_games)
+        self.assertEqual(result.matched, [])
+        self.assertEqual([(town['home_team'], master['home_team'], master['date'])
+                          for town, master, _ in result.suggestions],
+                         [('Hanvoer-7', 'Hanover-7', '04/01/2023')])
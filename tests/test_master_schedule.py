@@ -1,7 +1,12 @@
 from unittest import TestCase
 from unittest.mock import patch
-from schedule.helpers.master_schedule import (get_age_gender, process_row,
-                                              MasterSchedule)
+from tempfile import TemporaryDirectory
+from google.auth.exceptions import TransportError
+from schedule.helpers.master_schedule import (get_age_gender, get_revision,
+                                              process_row, MasterSchedule)
+from schedule.helpers.sheet_cache import SheetCache
+
+VALUES = [['Grade 3/4 Boys', 'League', '4/1/23', 'London', '1', 'Kingston', '4']]
 
 
 class TestGetAgeGender(TestCase):
@@ -76,6 +81,102 @@ class TestReadMasterSchedule(TestCase):
 #        self.assertEqual(results['rc'], 22)
 
 
+@patch('schedule.helpers.master_schedule.auth.default',
+       return_value=(None, None))
+@patch('schedule.helpers.master_schedule.build')
+@patch('schedule.helpers.master_schedule.get_revision')
+class TestLoadSheet(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.cache = SheetCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def get_values(self, mock_build):
+        return mock_build.return_value.spreadsheets.return_value.values.return_value.get
+
+    def test_download_cached(self, mock_revision, mock_build, mock_auth):
+        mock_revision.return_value = '7'
+        self.get_values(mock_build).return_value.execute.return_value = {'values': VALUES}
+        master_schedule = MasterSchedule('sheetid', 'Master!A:G')
+        master_schedule.load_sheet(cache=self.cache)
+        self.assertEqual(master_schedule.values, VALUES)
+        self.assertEqual(self.cache.get('sheetid', 'Master!A:G')['revision'], '7')
+
+    def test_unchanged_revision(self, mock_revision, mock_build, mock_auth):
+        mock_revision.return_value = '7'
+        self.cache.set('sheetid', 'Master!A:G', '7', VALUES)
+        master_schedule = MasterSchedule('sheetid', 'Master!A:G')
+        master_schedule.load_sheet(cache=self.cache)
+        self.assertEqual(master_schedule.values, VALUES)
+        self.get_values(mock_build).assert_not_called()
+
+    def test_changed_revision(self, mock_revision, mock_build, mock_auth):
+        mock_revision.return_value = '8'
+        self.cache.set('sheetid', 'Master!A:G', '7', [])
+        self.get_values(mock_build).return_value.execute.return_value = {'values': VALUES}
+        master_schedule = MasterSchedule('sheetid', 'Master!A:G')
+        master_schedule.load_sheet(cache=self.cache)
+        self.assertEqual(master_schedule.values, VALUES)
+        self.assertEqual(self.cache.get('sheetid', 'Master!A:G')['revision'], '8')
+
+    def test_no_revision_cached(self, mock_revision, mock_build, mock_auth):
+        mock_revision.return_value = None
+        self.get_values(mock_build).return_value.execute.return_value = {'values': VALUES}
+        master_schedule = MasterSchedule('sheetid', 'Master!A:G')
+        master_schedule.load_sheet(cache=self.cache)
+        self.assertIsNone(self.cache.get('sheetid', 'Master!A:G')['revision'])
+
+        offline = MasterSchedule('sheetid', 'Master!A:G')
+        offline.load_sheet(cache=self.cache, offline=True)
+        self.assertEqual(offline.values, VALUES)
+
+    def test_no_revision_revalidated(self, mock_revision, mock_build, mock_auth):
+        mock_revision.return_value = None
+        self.cache.set('sheetid', 'Master!A:G', None, [])
+        self.get_values(mock_build).return_value.execute.return_value = {'values': VALUES}
+        master_schedule = MasterSchedule('sheetid', 'Master!A:G')
+        master_schedule.load_sheet(cache=self.cache)
+        self.assertEqual(master_schedule.values, VALUES)
+        self.assertEqual(self.cache.get('sheetid', 'Master!A:G')['values'], VALUES)
+
+    def test_offline(self, mock_revision, mock_build, mock_auth):
+        self.cache.set('sheetid', 'Master!A:G', '7', VALUES)
+        master_schedule = MasterSchedule('sheetid', 'Master!A:G')
+        master_schedule.load_sheet(cache=self.cache, offline=True)
+        self.assertEqual(master_schedule.values, VALUES)
+        mock_auth.assert_not_called()
+        mock_revision.assert_not_called()
+
+    def test_offline_not_cached(self, mock_revision, mock_build, mock_auth):
+        master_schedule = MasterSchedule('sheetid', 'Master!A:G')
+        with self.assertLogs(level='ERROR'):
+            master_schedule.load_sheet(cache=self.cache, offline=True)
+        self.assertIsNone(master_schedule.values)
+        mock_auth.assert_not_called()
+
+
+@patch('schedule.helpers.master_schedule.build')
+class TestGetRevision(TestCase):
+    def get_files(self, mock_build):
+        return mock_build.return_value.files.return_value.get
+
+    def test_revision(self, mock_build):
+        self.get_files(mock_build).return_value.execute.return_value = {
+            'version': '7', 'modifiedTime': '2023-04-01T00:00:00Z'}
+        self.assertEqual(get_revision(None, 'sheetid'), '7')
+
+    def test_auth_error(self, mock_build):
+        self.get_files(mock_build).return_value.execute.side_effect = \
+            TransportError('connection refused')
+        with self.assertLogs(level='WARNING') as cm:
+            self.assertIsNone(get_revision(None, 'sheetid'))
+        self.assertEqual(cm.output, [
+            'WARNING:schedule.helpers.master_schedule:Unable to read the '
+            'revision of sheetid: connection refused'])
+
+
 class TestProcessRow(TestCase):
     def test_process_row(self):
         test_input = [
@@ -104,3 +205,64 @@ class TestProcessRow(TestCase):
             cm.output, ["WARNING:root:Date Error: time data 'bad_date' does not match format '%m/%d/%y', for line ['Grade 3/4 Boys', 'Test League', 'bad_date', 'Boston', 1, 'New York', 2]"]
         )
         self.assertDictEqual(excepted_result, result)
+
+
+class TestProcessMasterSchedule(TestCase):
+    VALUES = [
+        ['Grade', 'Division', 'Date', 'Home', 'Team', 'Away', 'Team'],
+        ['Grade 3/4 Boys', 'Ligue 1', '4/1/23', 'Hull', '1', 'London', '2'],
+        ['Grade 3/4 Boys', 'Ligue 1', '4/1/23', 'London', '1', 'Kingston', '4'],
+        ['Grade 3/4 Girls', 'Ligue 1', '4/8/23', 'LONDON', '2', 'Bye', ''],
+        ['Grade 5/6 Girls', 'Ligue 2', '4/8/23', 'London', '3', 'No Game', ''],
+        ['Grade 5/6 Boys', 'Ligue 2', '04/15/23', 'Toronto', '1', 'london', '1'],
+        ['Grade 7/8 Boys', 'Ligue 3', 'TBD', 'London', '1', 'Hull', '3'],
+        ['Grade 7/8 Girls', 'Ligue 3', '4/22/23', 'Hull', '2', 'Toronto', '2']
+    ]
+
+    def process(self, engine):
+        master_schedule = MasterSchedule('sheetid', 'Master!A:G')
+        master_schedule.values = self.VALUES
+        with self.assertLogs(level='WARNING') as cm:
+            master_schedule.process_master_schedule('london', engine=engine)
+        return master_schedule, cm.output
+
+    def test_engines_match(self):
+        python, python_logs = self.process('python')
+        pandas, pandas_logs = self.process('pandas')
+        self.assertEqual(pandas.se_games, python.se_games)
+        self.assertEqual(pandas.referee_games, python.referee_games)
+        self.assertEqual(pandas_logs, python_logs)
+        self.assertEqual(len(python.se_games), 4)
+        self.assertEqual(len(python.referee_games), 2)
+        self.assertIsNone(pandas.referee_games[1]['date'])
+
+    def test_no_values(self):
+        master_schedule = MasterSchedule('sheetid', 'Master!A:G')
+        master_schedule.values = []
+        master_schedule.process_master_schedule('london')
+        self.assertEqual(master_schedule.referee_games, [])
+        self.assertEqual(master_schedule.se_games, [])
+
+    def test_no_town_games(self):
+        for values in ([['Grade 7/8 Boys', 'x', '4/1/23', 'Quincy', '1', 'Milton', '2']],
+                       [['Grade 7/8 Boys', 'x', '4/1/23', 'Boston', '1', 'Bye', '']]):
+            for engine in ('python', 'pandas'):
+                master_schedule = MasterSchedule('sheetid', 'Master!A:G')
+                master_schedule.values = values
+                master_schedule.process_master_schedule('boston', engine=engine)
+                self.assertEqual(master_schedule.se_games, [])
+                self.assertEqual(master_schedule.referee_games, [])
+
+    def test_short_division(self):
+        master_schedule = MasterSchedule('sheetid', 'Master!A:G')
+        master_schedule.values = [
+            ['Grade7/8 Boys', 'x', '4/1/23', 'Boston', '1', 'Hull', '2'],
+            ['Grade 7/8 Boys', 'x', '4/8/23', 'Boston', '1', 'Hull', '3']
+        ]
+        with self.assertLogs(level='INFO') as cm:
+            master_schedule.process_master_schedule('boston')
+        self.assertEqual(cm.output, [
+            "ERROR:root:Division Error: no age group and gender, for line "
+            "['Grade7/8 Boys', 'x', '4/1/23', 'Boston', '1', 'Hull', '2']"])
+        self.assertEqual([game['away_team'] for game in master_schedule.se_games],
+                         ['Hull-3'])
@@ -0,0 +1,85 @@
+from datetime import time
+from unittest import TestCase
+from assignr.helpers.matrix import (build_availability_matrix, to_minutes)
+
+RESULTS = [
+    ({'referee': 'Homer Simpson', 'id': 1}, [
+        {'date': '2023-01-01', 'avail': 'ALL DAY'},
+        {'date': '2023-01-08', 'avail': '08:00 AM - 3:00 PM'}
+    ]),
+    ({'referee': 'Marge Simpson', 'id': 2}, [
+        {'date': '2023-01-08', 'avail': '10:00 AM - 11:00 AM'},
+        {'date': '2023-01-08', 'avail': '1:00 PM - 5:30 PM'}
+    ]),
+    ({'referee': 'Bart Simpson', 'id': 3}, []),
+    ({'referee': 'Lisa Simpson', 'id': 4}, None)
+]
+
+
+class TestToMinutes(TestCase):
+    def test_values(self):
+        self.assertEqual(to_minutes('10:30 AM'), 630)
+        self.assertEqual(to_minutes('12:15 AM'), 15)
+        self.assertEqual(to_minutes('3:00 PM'), 900)
+        self.assertEqual(to_minutes(time(9, 45)), 585)
+        self.assertEqual(to_minutes(90), 90)
+
+
+class TestAvailabilityMatrix(TestCase):
+    def setUp(self):
+        self.matrix = build_availability_matrix(RESULTS, slot_minutes=60)
+
+    def test_shape(self):
+        self.assertEqual(list(self.matrix.referees), [
+            'Homer Simpson', 'Marge Simpson', 'Bart Simpson', 'Lisa Simpson'])
+        self.assertEqual([str(day.date()) for day in self.matrix.dates],
+                         ['2023-01-01', '2023-01-08'])
+        self.assertEqual(self.matrix.available.values.tolist(), [
+            [True, True], [False, True], [False, False], [False, False]])
+
+    def test_intervals(self):
+        self.assertEqual(self.matrix.intervals[['start', 'end']].values.tolist(),
+                         [[0, 1440], [480, 900], [600, 660], [780, 1050]])
+
+    def test_available_between(self):
+        self.assertEqual(
+            self.matrix.available_between('2023-01-08', '10:30 AM', '11:00 AM'),
+            ['Homer Simpson', 'Marge Simpson'])
+        self.assertEqual(
+            self.matrix.available_between('2023-01-08', '2:00 PM', '4:00 PM'),
+            ['Marge Simpson'])
+        self.assertEqual(
+            self.matrix.available_between('2023-01-08', '10:30 AM', '2:00 PM'),
+            ['Homer Simpson'])
+        self.assertEqual(
+            self.matrix.available_between('2023-01-02', '10:30 AM', '2:00 PM'), [])
+
+    def test_available_on(self):
+        self.assertEqual(self.matrix.available_on('2023-01-01'), ['Homer Simpson'])
+
+    def test_count_per_day(self):
+        self.assertEqual(self.matrix.available_count_per_day().tolist(), [1, 2])
+
+    def test_slot_counts(self):
+        counts = self.matrix.slot_counts()
+        self.assertEqual(counts.loc['2023-01-08', [420, 480, 600, 660, 840, 1020]].tolist(),
+                         [0, 1, 2, 1, 2, 0])
+        self.assertEqual(counts.loc['2023-01-01'].sum(), 24)
+
+    def test_no_slots(self):
+        with self.assertRaises(ValueError):
+            build_availability_matrix(RESULTS).slot_counts()
+
+    def test_dict_results(self):
+        matrix = build_availability_matrix([
+            {'referee': name['referee'], 'availability': availability}
+            for name, availability in RESULTS
+        ])
+        self.assertTrue(matrix.available.equals(self.matrix.available))
+
+    def test_unparseable(self):
+        with self.assertLogs(level='WARNING'):
+            matrix = build_availability_matrix([
+                ({'referee': 'Homer Simpson'}, [{'date': '2023-01-01', 'avail': 'soon'}])
+            ])
+        self.assertEqual(matrix.available.shape, (1, 0))
@@ -0,0 +1,74 @@
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+from os.path import join
+import json
+from assignr.helpers.metrics import (Metrics, NullMetrics, get_metrics,
+                                     set_metrics, timed)
+
+
+class TestMetrics(TestCase):
+    def setUp(self):
+        self.metrics = Metrics()
+        self.metrics.observe('users/{id}/availability', 0.02, status=200, size=100)
+        self.metrics.observe('users/{id}/availability', 0.3, status=200, size=50)
+        self.metrics.observe('users/{id}/availability', 12.0, status=503)
+        self.metrics.retry('users/{id}/availability')
+
+    def test_to_dict(self):
+        result = self.metrics.to_dict()['users/{id}/availability']
+        self.assertEqual(result['count'], 3)
+        self.assertEqual(result['statuses'], {'200': 2, '503': 1})
+        self.assertEqual(result['bytes'], 150)
+        self.assertEqual(result['retries'], 1)
+        self.assertEqual(result['max_seconds'], 12.0)
+        self.assertEqual(result['buckets']['0.025'], 1)
+        self.assertEqual(result['buckets']['0.5'], 1)
+        self.assertEqual(result['buckets']['+Inf'], 1)
+
+    def test_quantile(self):
+        endpoint = self.metrics.endpoints['users/{id}/availability']
+        self.assertEqual(endpoint.quantile(0.5), 0.5)
+        self.assertEqual(endpoint.quantile(0.95), 12.0)
+
+    def test_summary(self):
+        self.assertEqual(self.metrics.summary(), [
+            'users/{id}/availability: 3 calls, mean 4.107s, p95 <= 12.000s, '
+            'max 12.000s, statuses 200: 2, 503: 1, 150 bytes, 1 retries'
+        ])
+
+    def test_prometheus(self):
+        lines = self.metrics.to_prometheus().splitlines()
+        self.assertIn('assignr_request_seconds_bucket{endpoint="users/{id}/availability",'
+                      'le="+Inf"} 3', lines)
+        self.assertIn('assignr_responses_total{endpoint="users/{id}/availability",'
+                      'status="200"} 2', lines)
+        self.assertIn('assignr_retries_total{endpoint="users/{id}/availability"} 1',
+                      lines)
+
+    def test_write(self):
+        with TemporaryDirectory() as directory:
+            self.metrics.write(join(directory, 'metrics.json'))
+            with open(join(directory, 'metrics.json')) as metrics_file:
+                self.assertEqual(json.load(metrics_file), self.metrics.to_dict())
+            self.metrics.write(join(directory, 'metrics.prom'))
+            with open(join(directory, 'metrics.prom')) as metrics_file:
+                self.assertEqual(metrics_file.read(), self.metrics.to_prometheus())
+
+
+class TestTimed(TestCase):
+    def tearDown(self):
+        set_metrics(None)
+
+    def test_timed(self):
+        @timed('lookup')
+        def lookup():
+            return 'result'
+
+        self.assertIsInstance(get_metrics(), NullMetrics)
+        self.assertEqual(lookup(), 'result')
+
+        metrics = Metrics()
+        set_metrics(metrics)
+        lookup()
+        self.assertEqual(metrics.to_dict()['lookup']['count'], 1)
+        self.assertEqual(metrics.to_dict()['lookup']['statuses'], {})
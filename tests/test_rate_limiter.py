@@ -0,0 +1,119 @@
+from unittest import TestCase
+from unittest.mock import (patch, MagicMock)
+from threading import Thread
+from time import (monotonic, sleep)
+from assignr.helpers.rate_limiter import RateLimiter
+from assignr.helpers.client import AssignrClient
+
+
+class TestRateLimiter(TestCase):
+    def test_throttle_and_recover(self):
+        limiter = RateLimiter(rate=8, concurrency=4, increase=2)
+        limiter.acquire()
+        with self.assertLogs(level='WARNING') as cm:
+            limiter.release(429)
+        self.assertEqual(cm.output, [
+            'WARNING:assignr.helpers.rate_limiter:Assignr returned 429, '
+            'rate limit reduced to 4.00 req/s, concurrency 2'
+        ])
+        self.assertEqual((limiter.rate, limiter.concurrency), (4, 2))
+
+        for _ in range(5):
+            limiter.tokens = 1
+            limiter.acquire()
+            limiter.release(200)
+        self.assertEqual(limiter.rate, 8)
+        self.assertEqual(limiter.concurrency, 4)
+        self.assertEqual(str(limiter), '8.00 req/s, concurrency 4')
+
+    def test_minimum_rate(self):
+        limiter = RateLimiter(rate=1, min_rate=0.5, concurrency=1)
+        with self.assertLogs(level='WARNING'):
+            for _ in range(3):
+                limiter.in_flight += 1
+                limiter.release(503)
+        self.assertEqual((limiter.rate, limiter.concurrency), (0.5, 1))
+
+    def test_cooldown(self):
+        limiter = RateLimiter(rate=16, concurrency=8, cooldown=60)
+        with self.assertLogs(level='WARNING') as cm:
+            for _ in range(3):
+                limiter.in_flight += 1
+                limiter.release(429)
+        self.assertEqual(len(cm.output), 1)
+        self.assertEqual((limiter.rate, limiter.concurrency), (8, 4))
+
+    @patch('assignr.helpers.rate_limiter.monotonic')
+    def test_cooldown_expires(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        limiter = RateLimiter(rate=16, concurrency=8, cooldown=1)
+        with self.assertLogs(level='WARNING') as cm:
+            limiter.in_flight += 2
+            limiter.release(503)
+            mock_monotonic.return_value = 100.5
+            limiter.release(503)
+            mock_monotonic.return_value = 101.5
+            limiter.in_flight += 1
+            limiter.release(503)
+        self.assertEqual(len(cm.output), 2)
+        self.assertEqual((limiter.rate, limiter.concurrency), (4, 2))
+
+    def test_proportional_ramp(self):
+        # 5% of 40 req/s beats the 0.1 step, 5% of 1 req/s doesn't.
+        limiter = RateLimiter(rate=40, max_rate=100)
+        limiter.in_flight += 1
+        limiter.release(200)
+        self.assertAlmostEqual(limiter.rate, 42)
+        limiter = RateLimiter(rate=1, max_rate=100)
+        limiter.in_flight += 1
+        limiter.release(200)
+        self.assertAlmostEqual(limiter.rate, 1.1)
+        limiter = RateLimiter(rate=40, max_rate=100, ramp=0)
+        limiter.in_flight += 1
+        limiter.release(200)
+        self.assertAlmostEqual(limiter.rate, 40.1)
+
+    def test_server_error_does_not_ramp(self):
+        limiter = RateLimiter(rate=4, max_rate=8)
+        limiter.acquire()
+        limiter.release(500)
+        self.assertEqual(limiter.rate, 4)
+
+    def test_pacing(self):
+        limiter = RateLimiter(rate=20, concurrency=5)
+        start = monotonic()
+        for _ in range(6):
+            limiter.acquire()
+            limiter.release(200)
+        self.assertGreaterEqual(monotonic() - start, 0.2)
+
+    def test_concurrency_limit(self):
+        limiter = RateLimiter(rate=1000, concurrency=2)
+        peak = []
+
+        def call():
+            limiter.acquire()
+            peak.append(limiter.in_flight)
+            sleep(0.01)
+            limiter.release(None)
+
+        threads = [Thread(target=call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLessEqual(max(peak), 2)
+        self.assertEqual(limiter.in_flight, 0)
+
+    @patch('assignr.helpers.client.sleep')
+    @patch('requests.Session.get')
+    def test_client_uses_limiter(self, mock_get, mock_sleep):
+        throttled = MagicMock(status_code=429, headers={'Retry-After': '1'})
+        ok = MagicMock(status_code=200, headers={})
+        mock_get.side_effect = [throttled, ok]
+        limiter = RateLimiter(rate=100, concurrency=4)
+        with self.assertLogs(level='WARNING'):
+            response = AssignrClient(rate_limiter=limiter).get('http://test.com')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(limiter.concurrency, 2)
+        self.assertEqual(limiter.in_flight, 0)
@@ -0,0 +1,37 @@
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+from os.path import join
+from assignr.helpers.roster import read_roster
+
+
+class TestReadRoster(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.file_name = join(self.directory.name, 'referees.csv')
+        with open(self.file_name, 'w') as roster:
+            roster.write('"First Name","Last Name", "Id", "Email"\n'
+                         '"Homer","Simpson",1,homer@test.com\n'
+                         '\n'
+                         '"Ned", "Flanders", abc\n'
+                         '"Bart","Simpson",3\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_read_roster(self):
+        self.assertEqual(list(read_roster(self.file_name)), [
+            {'referee': 'Homer Simpson', 'id': 1},
+            {'referee': 'Ned Flanders', 'id': 'abc'},
+            {'referee': 'Bart Simpson', 'id': 3}
+        ])
+
+    def test_ids(self):
+        self.assertEqual(list(read_roster(self.file_name, ids=[3, 'abc'])), [
+            {'referee': 'Ned Flanders', 'id': 'abc'},
+            {'referee': 'Bart Simpson', 'id': 3}
+        ])
+
+    def test_name_pattern(self):
+        self.assertEqual(
+            [referee['id'] for referee in
+             read_roster(self.file_name, name_pattern='*SIMPSON')], [1, 3])
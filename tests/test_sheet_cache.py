@@ -0,0 +1,32 @@
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+from os.path import join
+from schedule.helpers.sheet_cache import SheetCache
+
+VALUES = [['Grade 3/4 Boys', 'League', '4/1/23', 'London', '1', 'Kingston', '4']]
+
+
+class TestSheetCache(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.cache = SheetCache(join(self.directory.name, 'sheets'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_missing(self):
+        self.assertIsNone(self.cache.get('sheetid', 'Master!A:G'))
+
+    def test_set_and_get(self):
+        self.cache.set('sheetid', 'Master!A:G', '42', VALUES)
+        entry = self.cache.get('sheetid', 'Master!A:G')
+        self.assertEqual(entry['revision'], '42')
+        self.assertEqual(entry['values'], VALUES)
+        self.assertIsNone(self.cache.get('sheetid', 'Other!A:G'))
+
+    def test_unreadable(self):
+        self.cache.set('sheetid', 'Master!A:G', '42', VALUES)
+        with open(self.cache.get_file_name('sheetid', 'Master!A:G'), 'w') as file:
+            file.write('{')
+        with self.assertLogs(level='WARNING'):
+            self.assertIsNone(self.cache.get('sheetid', 'Master!A:G'))
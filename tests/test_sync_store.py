@@ -0,0 +1,58 @@
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+from os.path import join
+from assignr.helpers.sync_store import SyncStore
+
+START = '2023-01-01'
+END = '2023-01-31'
+
+
+def record(id, date, updated='2023-10-05T21:24:22.000-04:00', all_day=True):
+    return {'id': id, 'date': date, 'all_day': all_day, 'updated': updated}
+
+
+class TestSyncStore(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.store = SyncStore(join(self.directory.name, 'sync.db'))
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_first_sync_adds_everything(self):
+        records = [record(1, '2023-01-01'), record(2, '2023-01-08')]
+        changes = self.store.apply(1, records, START, END)
+        self.assertEqual(changes, {'added': records, 'changed': [], 'removed': []})
+
+    def test_no_changes(self):
+        records = [record(1, '2023-01-01')]
+        self.store.apply(1, records, START, END)
+        changes = self.store.apply(1, records, START, END)
+        self.assertEqual(changes, {'added': [], 'changed': [], 'removed': []})
+
+    def test_added_changed_removed(self):
+        self.store.apply(1, [record(1, '2023-01-01'), record(2, '2023-01-08')],
+                         START, END)
+        updated = record(1, '2023-01-01', updated='2023-10-06T08:00:00.000-04:00',
+                         all_day=False)
+        changes = self.store.apply(1, [updated, record(3, '2023-01-15')],
+                                   START, END)
+        self.assertEqual(changes, {
+            'added': [record(3, '2023-01-15')],
+            'changed': [updated],
+            'removed': [record(2, '2023-01-08')]
+        })
+
+    def test_removed_limited_to_window(self):
+        self.store.apply(1, [record(1, '2023-01-01'), record(2, '2023-02-08')],
+                         START, '2023-02-28')
+        changes = self.store.apply(1, [], START, END)
+        self.assertEqual(changes['removed'], [record(1, '2023-01-01')])
+        changes = self.store.apply(1, [], '2023-02-01', '2023-02-28')
+        self.assertEqual(changes['removed'], [record(2, '2023-02-08')])
+
+    def test_referees_are_separate(self):
+        self.store.apply(1, [record(1, '2023-01-01')], START, END)
+        changes = self.store.apply(2, [], START, END)
+        self.assertEqual(changes['removed'], [])
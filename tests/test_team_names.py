@@ -0,0 +1,34 @@
+from unittest import TestCase
+from schedule.helpers.team_names import (TeamIndex, normalize_team)
+
+
+class TestTeamNames(TestCase):
+    def test_normalize_team(self):
+        for name in ('Boston-2', 'boston - 2', ' BOSTON 2', 'Boston_2'):
+            self.assertEqual(normalize_team(name), 'boston2')
+
+    def test_aliases(self):
+        teams = TeamIndex(['Boston-1'], aliases={'Boston Blue': 'Boston-1'})
+        self.assertEqual(teams.get_key('boston blue'), 'boston1')
+        self.assertEqual(teams.suggest('Boston Blue'), [('Boston-1', 1.0)])
+
+    def test_suggest(self):
+        teams = TeamIndex(['South Boston-2', 'Boston-2', 'Hull-1', 'London-3'])
+        self.assertEqual(teams.suggest('Bostn-2'), [('Boston-2', 0.615)])
+        self.assertEqual(teams.suggest('South Bostn 2', limit=1),
+                         [('South Boston-2', 0.783)])
+        self.assertEqual(teams.suggest('Hanover-4'), [])
+        # The whole names are close, the team numbers aren't.
+        self.assertEqual(teams.suggest('Boston-3'), [])
+
+    def test_suggest_same_town(self):
+        teams = TeamIndex([f'Hanover-{number}' for number in range(1, 48)],
+                          aliases={'Hanover Blue': 'Hanover-7'})
+        self.assertEqual(teams.suggest('Hanover-70'), [])
+        self.assertEqual(teams.suggest('Hanvoer-7', limit=1), [('Hanover-7', 0.5)])
+        self.assertEqual(teams.suggest('Hanover Blue'), [('Hanover-7', 1.0)])
+
+    def test_suggest_scores_only_shared_ngrams(self):
+        teams = TeamIndex([f'Town{number}-{number % 7}' for number in range(1000)])
+        teams.add('Hanover-4')
+        self.assertEqual(teams.suggest('Hannover-4'), [('Hanover-4', 0.824)])
@@ -0,0 +1,75 @@
+import json
+import os
+from unittest import TestCase
+from unittest.mock import patch
+from tempfile import TemporaryDirectory
+from assignr.helpers.token_cache import (TokenCache, get_token_key)
+
+
+class TestTokenCache(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, 'cache', 'token.json')
+        self.cache = TokenCache(self.file_name, margin=60)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_key(self):
+        self.assertNotEqual(get_token_key('url', 'id', 'read'),
+                            get_token_key('url', 'id', 'read write'))
+
+    def test_missing_file(self):
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_set_get(self):
+        self.cache.set('key', 'token', 3600)
+        self.assertEqual(self.cache.get('key'), 'token')
+        self.assertEqual(os.stat(self.file_name).st_mode & 0o777, 0o600)
+        self.assertEqual(os.stat(os.path.dirname(self.file_name)).st_mode & 0o777, 0o700)
+
+    @patch('assignr.helpers.token_cache.time')
+    def test_expiry_margin(self, mock_time):
+        mock_time.return_value = 1000
+        self.cache.set('key', 'token', 100)
+        mock_time.return_value = 1039
+        self.assertEqual(self.cache.get('key'), 'token')
+        mock_time.return_value = 1040
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_invalidate(self):
+        self.cache.set('key', 'token', 3600)
+        self.cache.set('other', 'other token', 3600)
+        self.cache.invalidate('key')
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(self.cache.get('other'), 'other token')
+
+    def test_corrupt_file(self):
+        os.makedirs(os.path.dirname(self.file_name))
+        with open(self.file_name, mode='w') as file:
+            file.write('not json')
+        with self.assertLogs(level='WARNING'):
+            self.assertIsNone(self.cache.get('key'))
+
+    def test_malformed_entry(self):
+        os.makedirs(os.path.dirname(self.file_name))
+        with open(self.file_name, mode='w') as file:
+            json.dump({'key': {'access_token': 'token'},
+                       'old': 'token',
+                       'other': {'access_token': 'other token', 'expires_at': 'soon'}},
+                      file)
+        with self.assertLogs(level='WARNING'):
+            self.assertIsNone(self.cache.get('key'))
+            self.assertIsNone(self.cache.get('old'))
+            self.assertIsNone(self.cache.get('other'))
+        # A fresh token replaces the malformed entries.
+        self.cache.set('key', 'new token', 3600)
+        self.assertEqual(self.cache.get('key'), 'new token')
+        self.assertEqual(list(self.cache.read()), ['key'])
+
+    def test_not_an_object(self):
+        os.makedirs(os.path.dirname(self.file_name))
+        with open(self.file_name, mode='w') as file:
+            json.dump(['token'], file)
+        with self.assertLogs(level='WARNING'):
+            self.assertIsNone(self.cache.get('key'))
@@ -0,0 +1,76 @@
+from unittest import TestCase
+from unittest.mock import patch
+from tempfile import TemporaryDirectory
+from os.path import (join, dirname)
+from shutil import copyfile
+from schedule.helpers.town_cache import TownScheduleCache
+from schedule.helpers.town_schedule import TownSchedule
+
+TOWN_FILE = join(dirname(__file__), 'files', 'town_file.xlsx')
+AGE_GROUPS = {"7th_8th": "Grade 7/8"}
+FIELDS = {'Field1': {"venue": "Fenway Parking", "sub-venue": "Pool 1"}}
+
+
+class TestTownScheduleCache(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.cache = TownScheduleCache(join(self.directory.name, 'towns'))
+        self.town_file = join(self.directory.name, 'town.xlsx')
+        copyfile(TOWN_FILE, self.town_file)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read(self, fields=FIELDS, age_groups=AGE_GROUPS):
+        town_schedule = TownSchedule(self.town_file, fields, 'boston', age_groups)
+        town_schedule.read_town_spreadsheet(cache=self.cache)
+        return town_schedule
+
+    def test_cached_parse(self):
+        first = self.read()
+        with patch('schedule.helpers.town_schedule.open_workbook') as mock_load:
+            second = self.read()
+        mock_load.assert_not_called()
+        self.assertEqual(second.game_times, first.game_times)
+        self.assertEqual(second.errors, first.errors)
+        self.assertEqual(len(first.game_times), 17)
+
+    def test_cached_errors_logged(self):
+        with self.assertLogs(level='ERROR') as first_logs:
+            first = self.read(fields={})
+        with self.assertLogs(level='ERROR') as cached_logs:
+            second = self.read(fields={})
+        self.assertEqual(second.errors, first.errors)
+        self.assertEqual(cached_logs.output[0],
+                         f"ERROR:root:2 errors in sheet 7TH_8TH of {self.town_file}, "
+                         "from the cached parse")
+        self.assertEqual(cached_logs.output[1:], first_logs.output)
+
+    def test_translation_change_invalidates(self):
+        first = self.read()
+        fields = {'Field1': {"venue": "Fenway Park", "sub-venue": "Pool 1"}}
+        second = self.read(fields=fields)
+        self.assertEqual({game['venue'] for game in second.game_times},
+                         {'Fenway Park'})
+        self.assertEqual(len(self.cache.entries()), 2)
+        self.assertEqual(len(second.game_times), len(first.game_times))
+
+    def test_workbook_change_invalidates(self):
+        key = self.cache.get_key(self.town_file, FIELDS, AGE_GROUPS, 'boston')
+        with open(self.town_file, 'ab') as file:
+            file.write(b'\0')
+        self.assertNotEqual(
+            self.cache.get_key(self.town_file, FIELDS, AGE_GROUPS, 'boston'), key)
+
+    def test_list_and_purge(self):
+        self.read()
+        entries = self.cache.entries()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]['town_file'], self.town_file)
+        self.assertEqual(entries[0]['games'], 17)
+        self.assertEqual(self.cache.purge(older_than=3600), 0)
+        self.assertEqual(self.cache.purge(), 1)
+        self.assertEqual(self.cache.entries(), [])
+
+    def test_purge_empty(self):
+        self.assertEqual(self.cache.purge(), 0)
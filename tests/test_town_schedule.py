@@ -1,6 +1,13 @@
 from unittest import TestCase
+from unittest.mock import patch
+from tempfile import TemporaryDirectory
 from os.path import (join, dirname)
-from schedule.helpers.town_schedule import TownSchedule
+from datetime import (datetime, time)
+from functools import partial
+import logging
+from openpyxl import Workbook
+from schedule.helpers.town_schedule import (TownSchedule, get_sheet_titles,
+                                             open_workbook)
 
 
 class TestTownSchedule(TestCase):
@@ -99,3 +106,202 @@ class TestTownSchedule(TestCase):
             fields, 'boston', age_groups)
         town_schedule.read_town_spreadsheet()
         self.assertEqual(town_schedule.game_times, expected_results)
+
+    def test_streaming_matches_pandas(self):
+        age_groups = {"5th_6th": "Grade 5/6", "7th_8th": "Grade 7/8"}
+        fields = {
+            'Field1': {"venue": "Fenway Parking", "sub-venue": "Pool 1"},
+            'FFP1': {"venue": "Forge Pond Park", "sub-venue": "Field One"}
+        }
+        results = []
+        for streaming in (True, False):
+            town_schedule = TownSchedule(
+                join(dirname(__file__), 'files' ,'town_file.xlsx'),
+                fields, 'boston', age_groups)
+            with self.assertLogs(level='INFO') as cm:
+                logging.info('reading')
+                town_schedule.read_town_spreadsheet(streaming=streaming)
+            results.append((town_schedule.game_times,
+                            [line.split(' for ')[0] for line in cm.output]))
+        self.assertEqual(results[0], results[1])
+        self.assertGreater(len(results[0][0]), 0)
+
+    def test_hidden_sheet_skipped(self):
+        workbook = Workbook()
+        visible = workbook.active
+        visible.title = '7TH_8TH'
+        hidden = workbook.create_sheet('5TH_6TH')
+        hidden.sheet_state = 'hidden'
+        for sheet in (visible, hidden):
+            sheet.append(['SPRING 2023'])
+            sheet.append(['Division', 'Field', 'Time', datetime(2023, 4, 1)])
+            sheet.append(['7/8', 'Field1', time(8, 0), 'G - 2'])
+
+        with TemporaryDirectory() as directory:
+            file_name = join(directory, 'town.xlsx')
+            workbook.save(file_name)
+            town_schedule = TownSchedule(
+                file_name, {'Field1': {"venue": "Fenway", "sub-venue": "Pool 1"}},
+                'boston', {"5th_6th": "Grade 5/6", "7th_8th": "Grade 7/8"})
+            town_schedule.read_town_spreadsheet()
+        self.assertEqual(town_schedule.game_times, [{
+            'date': '04/01/2023', 'time': '08:00 AM', 'venue': 'Fenway',
+            'sub_venue': 'Pool 1', 'age_group': 'Grade 7/8',
+            'gender': 'Girls', 'home_team': 'Boston-2'
+        }])
+
+    @patch('schedule.helpers.town_schedule.POOL_MIN_BYTES', 0)
+    @patch('schedule.helpers.town_schedule.cpu_count', return_value=4)
+    def test_parallel_matches_serial(self, mock_cpu_count):
+        workbook = Workbook()
+        workbook.remove(workbook.active)
+        age_groups = {}
+        for number in range(4):
+            sheet = workbook.create_sheet(f'DIV_{number}')
+            age_groups[f'div_{number}'] = f'Division {number}'
+            sheet.append(['SPRING 2023'])
+            sheet.append(['Division', 'Field', 'Time', datetime(2023, 4, 1),
+                          datetime(2023, 4, 8)])
+            sheet.append([number, 'Field1', time(8, 0), f'G - {number}',
+                          f'B - {number}'])
+            # An unknown field is reported against its sheet.
+            sheet.append([number, 'Field9', time(9, 0), f'G - {number}', 'BYE'])
+
+        with TemporaryDirectory() as directory:
+            file_name = join(directory, 'town.xlsx')
+            workbook.save(file_name)
+            fields = {'Field1': {"venue": "Fenway", "sub-venue": "Pool 1"}}
+            serial = TownSchedule(file_name, fields, 'boston', age_groups)
+            with self.assertLogs(level='ERROR'):
+                serial.read_town_spreadsheet()
+            # Workers log in their own process, the errors come back with
+            # the results.
+            parallel = TownSchedule(file_name, fields, 'boston', age_groups)
+            with patch('schedule.helpers.town_schedule.get_sheet_titles',
+                       wraps=get_sheet_titles) as mock_titles:
+                parallel.read_town_spreadsheet(workers=2)
+            mock_titles.assert_called_once()
+            results = [(serial.game_times, serial.errors),
+                       (parallel.game_times, parallel.errors)]
+
+        self.assertEqual(results[0], results[1])
+        game_times, errors = results[1]
+        self.assertEqual([game['age_group'] for game in game_times],
+                         ['Division 0', 'Division 0', 'Division 1', 'Division 1',
+                          'Division 2', 'Division 2', 'Division 3', 'Division 3'])
+        self.assertEqual(list(errors), ['DIV_0', 'DIV_1', 'DIV_2', 'DIV_3'])
+        self.assertEqual(len(errors['DIV_2']), 1)
+        self.assertTrue(errors['DIV_2'][0].startswith("KeyError: 'Field9'"))
+
+    def test_frame_engine_matches_python(self):
+        fields = {
+            'Field1': {"venue": "Fenway", "sub-venue": "Pool 1"},
+            'Field2': {"venue": "Fenway", "sub-venue": "Pool 2"}
+        }
+        rows = [
+            ('SPRING 2023', None, None, None, None),
+            ('7/8', 'Field1', time(7, 0), 'G - 9', None),
+            ('Division', 'Field', 'Time', datetime(2023, 4, 1), datetime(2023, 4, 8)),
+            ('7/8', 'Field1', time(8, 0), 'G - 2', 'B - 1'),
+            ('7/8', 'Field2', time(9, 0), 'NO GAME', 'BYE'),
+            ('7/8', 'Field9', time(10, 0), 'G - 3', None),
+            ('7/8', 'Field2', time(11, 0), 'B - 4', 'G-5'),
+            ('7/8', 'Field1', time(12, 0)),
+            ('7/8', 'Field1', 'TBD', 'G - 6', 'B - 6'),
+            (None, None, None, None, None),
+            # A second block moves the columns and adds a date.
+            ('Time', 'Division', 'Field', datetime(2023, 4, 15), None),
+            (time(8, 0), '7/8', 'Field2', 'B - 7', 'G - 8'),
+            (time(9, 0), '7/8', 'Field1', 'G - 1', None),
+        ]
+        results = []
+        for engine in ('python', 'pandas'):
+            town_schedule = TownSchedule('town.xlsx', fields, 'boston', {})
+            errors = []
+            with self.assertLogs(level='ERROR') as cm:
+                game_times = town_schedule.get_town_games(
+                    iter(rows), 'Grade 7/8', errors, engine=engine)
+            results.append((game_times, errors, cm.output))
+
+        self.assertEqual(results[0], results[1])
+        game_times, errors, _ = results[1]
+        self.assertEqual([(game['date'], game['time'], game['home_team'])
+                          for game in game_times], [
+            ('04/01/2023', '08:00 AM', 'Boston-2'),
+            ('04/08/2023', '08:00 AM', 'Boston-1'),
+            ('04/01/2023', '11:00 AM', 'Boston-4'),
+            # Dates from the first block still read their old columns.
+            ('04/01/2023', '08:00 AM', 'Boston-7'),
+            ('04/08/2023', '08:00 AM', 'Boston-8'),
+            ('04/15/2023', '08:00 AM', 'Boston-7'),
+            ('04/01/2023', '09:00 AM', 'Boston-1'),
+            ('04/15/2023', '09:00 AM', 'Boston-1'),
+        ])
+        self.assertEqual([error.split(' ')[0] for error in errors],
+                         ['KeyError:', 'IndexError', 'IndexError'])
+
+    def test_frame_engine_matches_python_workbook(self):
+        age_groups = {"5th_6th": "Grade 5/6", "7th_8th": "Grade 7/8"}
+        fields = {'Field1': {"venue": "Fenway Parking", "sub-venue": "Pool 1"}}
+        results = []
+        for engine in ('python', 'pandas'):
+            town_schedule = TownSchedule(
+                join(dirname(__file__), 'files' ,'town_file.xlsx'),
+                fields, 'boston', age_groups)
+            town_schedule.get_town_games = partial(
+                TownSchedule.get_town_games, town_schedule, engine=engine)
+            with self.assertLogs(level='INFO'):
+                logging.info('reading')
+                town_schedule.read_town_spreadsheet()
+            results.append((town_schedule.game_times, town_schedule.errors))
+        self.assertEqual(results[0], results[1])
+        self.assertGreater(len(results[0][0]), 0)
+
+    @patch('schedule.helpers.town_schedule.cpu_count', return_value=4)
+    def test_sheet_workers(self, mock_cpu_count):
+        town_file = join(dirname(__file__), 'files', 'town_file.xlsx')
+        town_schedule = TownSchedule(town_file, {}, 'boston', {})
+        # A small workbook, or a single CPU, parses serially.
+        self.assertEqual(town_schedule.get_sheet_workers(None), 1)
+        self.assertEqual(town_schedule.get_sheet_workers(8), 1)
+        with patch('schedule.helpers.town_schedule.POOL_MIN_BYTES', 0):
+            self.assertEqual(town_schedule.get_sheet_workers(8), 4)
+            self.assertEqual(town_schedule.get_sheet_workers(2), 2)
+            mock_cpu_count.return_value = 1
+            self.assertEqual(town_schedule.get_sheet_workers(8), 1)
+
+    def check_selected_sheets(self):
+        workbook = Workbook()
+        workbook.active.title = '7TH_8TH'
+        workbook.create_sheet('5TH_6TH').sheet_state = 'hidden'
+        workbook.create_sheet('NOTES')
+        with TemporaryDirectory() as directory:
+            file_name = join(directory, 'town.xlsx')
+            workbook.save(file_name)
+            town_schedule = TownSchedule(file_name, {}, 'boston',
+                                         {"5th_6th": "Grade 5/6", "7th_8th": "Grade 7/8"})
+            self.assertEqual(get_sheet_titles(file_name, town_schedule.is_town_sheet),
+                             ['7TH_8TH'])
+            opened = open_workbook(file_name, town_schedule.is_town_sheet)
+            self.assertEqual(opened.sheetnames, ['7TH_8TH'])
+            opened.close()
+
+    def test_open_workbook_selected_sheets(self):
+        self.check_selected_sheets()
+
+    @patch('schedule.helpers.town_schedule.ReadOnlyWorksheet', None)
+    def test_open_workbook_without_internals(self):
+        # The public load_workbook path selects the same sheets and games.
+        self.check_selected_sheets()
+        fields = {'Field1': {"venue": "Fenway Parking", "sub-venue": "Pool 1"}}
+        town_schedule = TownSchedule(join(dirname(__file__), 'files', 'town_file.xlsx'),
+                                     fields, 'boston', {"7th_8th": "Grade 7/8"})
+        town_schedule.read_town_spreadsheet()
+        self.assertEqual(len(town_schedule.game_times), 17)
+
+    @patch('schedule.helpers.town_schedule.SheetReader.get_sheets',
+           side_effect=AttributeError('find_sheets'))
+    def test_open_workbook_internals_changed(self, mock_get_sheets):
+        with self.assertLogs('schedule.helpers.town_schedule', level='WARNING') as cm:
+            self.check_selected_sheets()
+        self.assertEqual(len(cm.output), 2)
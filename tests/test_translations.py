@@ -0,0 +1,114 @@
+from unittest import TestCase
+from unittest.mock import patch
+from tempfile import TemporaryDirectory
+from os import utime
+from os.path import (dirname, exists, join)
+import json
+from schedule.helpers.translations import (Translations, load_translations)
+
+TRANSLATIONS = {
+    'age_groups': {'7th_8th': 'Grade 7/8'},
+    'fields': {
+        'Boston': {
+            'Field1': {'venue': 'Fenway Parking', 'sub-venue': 'Pool 1'}
+        }
+    },
+    'team_aliases': {'boston': {'Boston Blue': 'Boston-1'}}
+}
+
+
+class TestTranslations(TestCase):
+    def test_lookups(self):
+        translations = Translations(TRANSLATIONS)
+        self.assertEqual(translations.errors, [])
+        fields = translations.get_town('BOSTON')
+        self.assertEqual(fields[' field1'], {'venue': 'Fenway Parking',
+                                             'sub-venue': 'Pool 1'})
+        self.assertIn('FIELD1', fields)
+        self.assertNotIn('Field2', fields)
+        self.assertNotIn(['unhashable'], fields)
+        self.assertEqual(translations.age_groups['7TH_8TH'], 'Grade 7/8')
+        self.assertEqual(translations.get_team_aliases('Boston'),
+                         {'Boston Blue': 'Boston-1'})
+        self.assertIsNone(translations.get_town('hull'))
+
+    def test_validation(self):
+        translations = Translations({
+            'age_groups': {'7th_8th': 'Grade 7/8', '7TH_8TH': 'Grade 8'},
+            'fields': {
+                'boston': {
+                    'Field1': {'venue': 'Fenway Parking'},
+                    'FIELD1': {'venue': 'Fenway Parking'},
+                    'Field2': {'venue': 'Fenway', 'sub-venue': 'Pool 2',
+                               'surface': 'turf'}
+                }
+            },
+            'team_aliases': {'hull': {'Hull Red': 'Hull-1'}}
+        })
+        self.assertEqual(translations.errors, [
+            'age_groups 7th_8th and 7TH_8TH differ only in case or spacing',
+            'fields boston field1 is missing its sub-venue'
+        ])
+        self.assertEqual(translations.warnings, [
+            'fields boston field2 has unknown keys surface',
+            'team_aliases hull has no field translations'
+        ])
+
+    def test_sample_file(self):
+        translations, rc = load_translations(
+            join(dirname(__file__), 'files', 'translations.json'), use_cache=False)
+        self.assertEqual(rc, 0)
+        # The file's town is "Boston", the command line town is lower case.
+        self.assertEqual(translations.get_town('boston')['field2']['venue'], 'HS')
+
+
+class TestLoadTranslations(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.file_name = join(self.directory.name, 'translations.json')
+        with open(self.file_name, 'w') as file:
+            json.dump(TRANSLATIONS, file)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_cache(self):
+        translations, rc = load_translations(self.file_name)
+        self.assertEqual(rc, 0)
+        self.assertTrue(exists(f"{self.file_name}.cache"))
+
+        with patch('schedule.helpers.translations.load_translation_file') as mock_load:
+            cached, rc = load_translations(self.file_name)
+        mock_load.assert_not_called()
+        self.assertEqual(rc, 0)
+        self.assertEqual(cached.to_dict(), translations.to_dict())
+        self.assertEqual(cached.get_town('boston')['FIELD1']['sub-venue'], 'Pool 1')
+
+    def test_cache_invalidated(self):
+        load_translations(self.file_name)
+        with open(self.file_name, 'w') as file:
+            json.dump({**TRANSLATIONS, 'age_groups': {'5th_6th': 'Grade 5/6'}}, file)
+        utime(self.file_name, ns=(1, 1))
+        translations, rc = load_translations(self.file_name)
+        self.assertEqual(rc, 0)
+        self.assertEqual(dict(translations.age_groups), {'5th_6th': 'Grade 5/6'})
+
+    def test_invalid(self):
+        with open(self.file_name, 'w') as file:
+            json.dump({'fields': {'boston': {'Field1': {}}}}, file)
+        with self.assertLogs(level='INFO') as cm:
+            translations, rc = load_translations(self.file_name)
+        self.assertEqual(rc, 88)
+        self.assertIsNone(translations)
+        self.assertEqual(cm.output, [
+            'ERROR:root:fields boston field1 is missing its venue',
+            'ERROR:root:fields boston field1 is missing its sub-venue'
+        ])
+        self.assertFalse(exists(f"{self.file_name}.cache"))
+
+    def test_missing_file(self):
+        with self.assertLogs(level='INFO') as cm:
+            translations, rc = load_translations('file_does_not_exist.json')
+        self.assertEqual(rc, 66)
+        self.assertEqual(cm.output,
+                         ["ERROR:root:No such file or directory: file_does_not_exist.json"])
@@ -4,14 +4,17 @@ from os.path import (join, dirname)
 from schedule.helpers.utils import (get_arguments, load_translation_file,
                                     get_environment)
 
-USAGE='USAGE: schedule.py -s <town schedule file> -t <town>' 
+USAGE='USAGE: schedule.py -s <town schedule file> -t <town>' \
+' | -m <manifest file> [-w <workers>] [--offline]' \
+' | --list-cache | --purge-cache'
 
 TOWN_NAME = 'town name'
 
 class TestGetArguments(TestCase):
     def test_help(self):
         expected_args = {
-            'town_file': None, 'town': None
+            'town_file': None, 'town': None, 'offline': False,
+            'manifest': None, 'workers': None, 'cache_command': None
         }
         with self.assertLogs(level='INFO') as cm:
             rc, args = get_arguments(['-h'])
@@ -20,13 +23,41 @@ class TestGetArguments(TestCase):
         self.assertEqual(args, expected_args)
 
     def test_valid_options(self):
-        expected_args = {'town_file': 'test_file', 'town': 'test'}
+        expected_args = {'town_file': 'test_file', 'town': 'test',
+                         'offline': False, 'manifest': None,
+                         'workers': None, 'cache_command': None}
         rc, args = get_arguments(['-t', 'test', '-s', 'test_file'])
         self.assertEqual(rc, 0)
         self.assertEqual(args, expected_args)
 
+    def test_manifest(self):
+        rc, args = get_arguments(['-m', 'towns.json', '--workers', '4'])
+        self.assertEqual(rc, 0)
+        self.assertEqual(args['manifest'], 'towns.json')
+        self.assertEqual(args['workers'], 4)
+
+    def test_invalid_workers(self):
+        with self.assertLogs(level='INFO') as cm:
+            rc, args = get_arguments(['-m', 'towns.json', '-w', 'all'])
+        self.assertEqual(cm.output, ["ERROR:root:Workers value, all is invalid"])
+        self.assertEqual(rc, 88)
+
+    def test_cache_commands(self):
+        rc, args = get_arguments(['--list-cache'])
+        self.assertEqual(rc, 0)
+        self.assertEqual(args['cache_command'], 'list')
+        rc, args = get_arguments(['--purge-cache'])
+        self.assertEqual(rc, 0)
+        self.assertEqual(args['cache_command'], 'purge')
+
+    def test_offline(self):
+        rc, args = get_arguments(['-t', 'test', '-s', 'test_file', '--offline'])
+        self.assertEqual(rc, 0)
+        self.assertTrue(args['offline'])
+
     def test_invalid_options(self):
-        expected_args = {'town_file': None, 'town': None}
+        expected_args = {'town_file': None, 'town': None, 'offline': False,
+                         'manifest': None, 'workers': None, 'cache_command': None}
         with self.assertLogs(level='INFO') as cm:
             rc, args = get_arguments(['-n'])
         self.assertEqual(cm.output, [f"ERROR:root:{USAGE}"])
@@ -34,7 +65,9 @@ class TestGetArguments(TestCase):
         self.assertEqual(args, expected_args)
         
     def test_missing_town_name(self):
-        expected_args = {'town_file': 'town_file', 'town': None}
+        expected_args = {'town_file': 'town_file', 'town': None,
+                         'offline': False, 'manifest': None,
+                         'workers': None, 'cache_command': None}
         with self.assertLogs(level='INFO') as cm:
             rc, args = get_arguments(['-s', 'town_file'])
         self.assertEqual(cm.output, [f"ERROR:root:{USAGE}"])
@@ -42,7 +75,9 @@ class TestGetArguments(TestCase):
         self.assertEqual(args, expected_args)
 
     def test_missing_town_file(self):
-        expected_args = {'town_file': None, 'town': 'town'}
+        expected_args = {'town_file': None, 'town': 'town',
+                         'offline': False, 'manifest': None,
+                         'workers': None, 'cache_command': None}
         with self.assertLogs(level='INFO') as cm:
             rc, args = get_arguments(['-t', 'town'])
         self.assertEqual(cm.output, [f"ERROR:root:{USAGE}"])
@@ -0,0 +1,127 @@
+import csv
+import json
+from io import StringIO
+from unittest import (TestCase, skipUnless)
+from unittest.mock import patch
+from tempfile import TemporaryDirectory
+from os.path import join
+from assignr.helpers.writers import (get_writer, AvailabilityWriter,
+                                     TextWriter, JsonLinesWriter, CsvWriter)
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+HOMER = {'referee': 'Homer Simpson', 'id': 1}
+MARGE = {'referee': 'Marge Simpson', 'id': 2}
+BART = {'referee': 'Bart Simpson', 'id': 3}
+AVAILABILITY = [
+    {'date': '2023-01-01', 'avail': 'ALL DAY'},
+    {'date': '2023-01-08', 'avail': '08:00 AM - 3:00 PM'}
+]
+
+
+def write_all(writer):
+    with writer:
+        writer.write(HOMER, AVAILABILITY)
+        writer.write(MARGE, [])
+        writer.write(BART, None)
+
+
+class TestWriters(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @patch('assignr.helpers.writers.stdout', new_callable=StringIO)
+    def test_text(self, mock_stdout):
+        write_all(TextWriter())
+        self.assertEqual(mock_stdout.getvalue().splitlines(), [
+            'Homer Simpson - 2023-01-01 - ALL DAY',
+            'Homer Simpson - 2023-01-08 - 08:00 AM - 3:00 PM',
+            "Marge Simpson isn't Available",
+            'Bart Simpson availability could not be retrieved'
+        ])
+
+    def test_jsonl(self):
+        file_name = join(self.directory.name, 'out.jsonl')
+        write_all(get_writer('jsonl', file_name))
+        with open(file_name) as file:
+            lines = [json.loads(line) for line in file]
+        self.assertEqual(lines, [
+            {'referee': 'Homer Simpson', 'id': '1', 'availability': AVAILABILITY},
+            {'referee': 'Marge Simpson', 'id': '2', 'availability': []},
+            {'referee': 'Bart Simpson', 'id': '3', 'availability': None}
+        ])
+
+    def test_csv(self):
+        file_name = join(self.directory.name, 'out.csv')
+        write_all(get_writer('csv', file_name))
+        with open(file_name) as file:
+            self.assertEqual(file.read().splitlines(), [
+                'referee,id,date,avail,status',
+                'Homer Simpson,1,2023-01-01,ALL DAY,available',
+                'Homer Simpson,1,2023-01-08,08:00 AM - 3:00 PM,available',
+                'Marge Simpson,2,,,unavailable',
+                'Bart Simpson,3,,,failed'
+            ])
+
+    def test_jsonl_round_trip(self):
+        file_name = join(self.directory.name, 'out.jsonl')
+        write_all(JsonLinesWriter(file_name))
+        with open(file_name) as file:
+            availability = {line['referee']: line['availability']
+                            for line in map(json.loads, file)}
+        self.assertEqual(availability, {
+            'Homer Simpson': AVAILABILITY, 'Marge Simpson': [], 'Bart Simpson': None})
+
+    def test_csv_round_trip(self):
+        # Every referee is in the csv, the status says which had availability.
+        file_name = join(self.directory.name, 'out.csv')
+        write_all(CsvWriter(file_name))
+        availability = {}
+        with open(file_name, newline='') as file:
+            for row in csv.DictReader(file):
+                entries = availability.setdefault(row['referee'], [])
+                if row['status'] == 'failed':
+                    availability[row['referee']] = None
+                elif row['status'] == 'available':
+                    entries.append({'date': row['date'], 'avail': row['avail']})
+        self.assertEqual(availability, {
+            'Homer Simpson': AVAILABILITY, 'Marge Simpson': [], 'Bart Simpson': None})
+
+    def test_writer_is_abstract(self):
+        with self.assertRaises(TypeError):
+            AvailabilityWriter()
+
+    @skipUnless(pq, 'pyarrow is not installed')
+    def test_parquet(self):
+        file_name = join(self.directory.name, 'out.parquet')
+        write_all(get_writer('parquet', file_name))
+        self.assertEqual(pq.read_table(file_name).to_pydict(), {
+            'referee': ['Homer Simpson', 'Homer Simpson', 'Marge Simpson',
+                        'Bart Simpson'],
+            'id': ['1', '1', '2', '3'],
+            'date': ['2023-01-01', '2023-01-08', None, None],
+            'avail': ['ALL DAY', '08:00 AM - 3:00 PM', None, None],
+            'status': ['available', 'available', 'unavailable', 'failed']
+        })
+
+    @skipUnless(pq, 'pyarrow is not installed')
+    def test_parquet_row_groups(self):
+        file_name = join(self.directory.name, 'out.parquet')
+        with get_writer('parquet', file_name) as writer:
+            writer.row_group_size = 2
+            writer.write(HOMER, AVAILABILITY)
+            writer.write(MARGE, AVAILABILITY[:1])
+        parquet = pq.ParquetFile(file_name)
+        self.assertEqual(parquet.metadata.num_row_groups, 2)
+        self.assertEqual(parquet.metadata.num_rows, 3)
+
+    @skipUnless(pq, 'pyarrow is not installed')
+    def test_parquet_needs_file(self):
+        with self.assertRaises(ValueError):
+            get_writer('parquet')